@@ -1,8 +1,27 @@
 
+from startup import StartupProfile  # first, so the profile clock covers imports
 import tkinter as tk
 from tkinter import font as tkFont
-import math
-import requests
+import queue
+import threading
+
+from calccore import (
+    CURRENCIES,
+    ExpressionBuffer,
+    KeyInput,
+    LivePreview,
+    RateStore,
+    RateUnavailable,
+    compound_interest,
+    emi,
+    simple_interest,
+)
+from calccore.tracing import follow, handoff, traced
+from event_trace import TraceRecorder
+from leak_check import LeakMonitor
+from sampling_profiler import ProfilerToggle
+from tk_modes import EXTRA_MODES, ModeKit
+from tk_monitor import TkMonitor
 
 # ------------ ENHANCED VINTAGE COLOR PALETTE --------------------------------
 HANDWRITTEN = "Comic Sans MS"
@@ -16,11 +35,40 @@ ENTRY_BG = "#FFF8DC"  # Cornsilk
 ERROR_COLOR = "#B22222"  # Fire brick red
 SUCCESS_COLOR = "#228B22"  # Forest green
 
+SHARED_POLL_MS = 2000  # how often to look for rates published by another instance
+FETCH_POLL_MS = 50  # how often to check for a finished background download
+PREVIEW_DELAY_MS = 60  # typing pause before the live result is refreshed
+
+# Keyboard keys (Tk keysyms) that map to calculator presses
+EDIT_KEYS = {
+    "Return": "=",
+    "KP_Enter": "=",
+    "BackSpace": "Backspace",
+    "Delete": "Delete",
+    "Escape": "Clear",
+    "Left": "Left",
+    "Right": "Right",
+    "Home": "Home",
+    "End": "End",
+}
+CONTROL_KEYS = {"z": "Undo", "y": "Redo", "Z": "Redo"}  # with Ctrl held
+
+PROFILE = StartupProfile()  # enabled by --profile-startup
+PROFILE.mark("imports")
+
 
 class FinancialApp(tk.Tk):
     def __init__(self):
         super().__init__()
+        # --monitor: time every callback registered from here on
+        self.monitor = TkMonitor.from_argv(self)
+        # --record-trace=FILE: log handler calls for event_trace.py replay
+        self.recorder = TraceRecorder.from_argv(self)
+        # --leak-check: log widget / Tcl variable / object counts per screen
+        self.leak_monitor = LeakMonitor.from_argv(self)
         self.title("Python Multi-Tool - Vintage Edition")
+        # Ctrl+Shift+P: start/stop the sampling profiler (writes .folded stacks)
+        self.profiler = ProfilerToggle.install_tk(self)
         self.geometry("1000x600")
         self.configure(bg=CREAM_BG)
 
@@ -28,37 +76,10 @@ class FinancialApp(tk.Tk):
         self.vintage_font = tkFont.Font(family=HANDWRITTEN, size=20, weight="bold")
         self.small_font = tkFont.Font(family=HANDWRITTEN, size=14, weight="bold")
 
-        # Enhanced button style with stable colors for macOS
-        self.button_style = {
-            "bg": BUTTON_BG,
-            "fg": BUTTON_TEXT,
-            "activebackground": BUTTON_BG,  # Same as normal bg
-            "activeforeground": BUTTON_TEXT,  # Same as normal fg
-            "font": self.vintage_font,
-            "bd": 3,  # Slightly thicker border
-            "relief": tk.RAISED,
-            "cursor": "hand2",
-            "highlightthickness": 0,  # Remove focus highlight
-            "borderwidth": 3,
-            "padx": 5,
-            "pady": 3,
-        }
-
-        # Menubutton style (for dropdowns)
-        self.menubutton_style = {
-            "bg": BUTTON_BG,
-            "fg": BUTTON_TEXT,
-            "activebackground": BUTTON_BG,
-            "activeforeground": BUTTON_TEXT,
-            "font": self.vintage_font,
-            "bd": 3,
-            "relief": tk.RAISED,
-            "cursor": "hand2",
-            "highlightthickness": 0,
-            "borderwidth": 3,
-            "padx": 5,
-            "pady": 3,
-        }
+        # Button, menubutton and menu looks live in Tk's option database and
+        # their hover/press behaviour in class bindings, both set up once here
+        # instead of being passed to and bound on every widget.
+        self.setup_theme()
 
         # Entry style
         self.entry_style = {
@@ -75,60 +96,83 @@ class FinancialApp(tk.Tk):
         # Label style
         self.label_style = {"bg": PAPER_BG, "fg": INK_DARK, "font": self.vintage_font}
 
+        PROFILE.mark("window")
         self.setup_layout()
 
+    def setup_theme(self):
+        """Register the vintage widget styles and behaviours for the whole app"""
+        # Stable colors for macOS: the active colors match the normal ones
+        button = {
+            "background": BUTTON_BG,
+            "foreground": BUTTON_TEXT,
+            "activeBackground": BUTTON_BG,
+            "activeForeground": BUTTON_TEXT,
+            "font": self.vintage_font,
+            "borderWidth": 3,  # Slightly thicker border
+            "relief": tk.RAISED,
+            "cursor": "hand2",
+            "highlightThickness": 0,  # Remove focus highlight
+            "padX": 5,
+            "padY": 3,
+        }
+        menu = {
+            "background": BUTTON_BG,
+            "foreground": BUTTON_TEXT,
+            "activeBackground": BUTTON_HOVER,
+            "activeForeground": BUTTON_TEXT,
+            "font": self.vintage_font,
+            "borderWidth": 2,
+        }
+        for widget_class, options in (
+            ("Button", button),
+            ("Menubutton", button),
+            ("Menu", menu),
+        ):
+            for name, value in options.items():
+                self.option_add(f"*{widget_class}.{name}", value)
+
+        for tag in ("VintageButton", "VintageMenubutton"):
+            self.bind_class(tag, "<Enter>", self.on_button_enter)
+            self.bind_class(tag, "<Leave>", self.on_button_leave)
+        self.bind_class("VintageButton", "<Button-1>", self.on_button_press)
+        self.bind_class("VintageButton", "<ButtonRelease-1>", self.on_button_release)
+
+    @staticmethod
+    def on_button_enter(event):
+        event.widget.config(bg=BUTTON_HOVER, activebackground=BUTTON_HOVER)
+
+    @staticmethod
+    def on_button_leave(event):
+        # rest_bg follows later restyling (e.g. the active financial tab)
+        rest = event.widget.rest_bg
+        event.widget.config(bg=rest, activebackground=rest)
+
+    @staticmethod
+    def on_button_press(event):
+        event.widget.config(relief=tk.SUNKEN)
+
+    @staticmethod
+    def on_button_release(event):
+        event.widget.config(relief=tk.RAISED)
+
+    @staticmethod
+    def add_behaviour(widget, tag, rest_bg):
+        widget.rest_bg = rest_bg
+        tags = widget.bindtags()
+        widget.bindtags(tags[:1] + (tag,) + tags[1:])
+        return widget
+
     def create_stable_button(self, parent, text, command=None, **kwargs):
         """Create a button with stable colors that don't change on interaction"""
-        # Merge with default button style
-        button_config = {**self.button_style, **kwargs}
-
-        btn = tk.Button(parent, text=text, command=command, **button_config)
-
-        # Bind hover effects manually for better control
-        def on_enter(e):
-            btn.config(bg=BUTTON_HOVER, activebackground=BUTTON_HOVER)
-
-        def on_leave(e):
-            btn.config(
-                bg=button_config.get("bg", BUTTON_BG),
-                activebackground=button_config.get("bg", BUTTON_BG),
-            )
-
-        def on_press(e):
-            btn.config(relief=tk.SUNKEN)
-
-        def on_release(e):
-            btn.config(relief=tk.RAISED)
-
-        # Bind events for consistent behavior
-        btn.bind("<Enter>", on_enter)
-        btn.bind("<Leave>", on_leave)
-        btn.bind("<Button-1>", on_press)
-        btn.bind("<ButtonRelease-1>", on_release)
-
-        return btn
+        btn = tk.Button(parent, text=text, command=command, **kwargs)
+        return self.add_behaviour(btn, "VintageButton", kwargs.get("bg", BUTTON_BG))
 
     def create_stable_menubutton(self, parent, text, **kwargs):
         """Create a menubutton with stable colors"""
-        # Merge with default menubutton style
-        menubutton_config = {**self.menubutton_style, **kwargs}
-
-        btn = tk.Menubutton(parent, text=text, **menubutton_config)
-
-        # Bind hover effects
-        def on_enter(e):
-            btn.config(bg=BUTTON_HOVER, activebackground=BUTTON_HOVER)
-
-        def on_leave(e):
-            btn.config(
-                bg=menubutton_config.get("bg", BUTTON_BG),
-                activebackground=menubutton_config.get("bg", BUTTON_BG),
-            )
-
-        btn.bind("<Enter>", on_enter)
-        btn.bind("<Leave>", on_leave)
-
-        return btn
+        btn = tk.Menubutton(parent, text=text, **kwargs)
+        return self.add_behaviour(
+            btn, "VintageMenubutton", kwargs.get("bg", BUTTON_BG)
+        )
 
     def setup_layout(self):
         # Main layout
@@ -146,17 +190,59 @@ class FinancialApp(tk.Tk):
         # Add components
         self.calculator = CalculatorFrame(left_frame, self)
         self.calculator.pack(expand=True, fill="both", padx=10, pady=10)
+        PROFILE.mark("calculator")
 
-        self.converter = CurrencyConverterFrame(right_frame, self)
+        # The converter (rate files, numpy, network) loads once the window
+        # has been drawn; after_idle runs behind Tk's own redraw handlers.
+        self.converter = None
+        self.converter_placeholder = tk.Label(
+            right_frame, text="Loading converter...", **self.label_style
+        )
+        self.converter_placeholder.pack(expand=True)
+        self.after_idle(self.after, 0, lambda: self.load_converter(right_frame))
+
+    def load_converter(self, parent):
+        PROFILE.mark("first paint")
+        self.converter_placeholder.destroy()
+        self.converter = CurrencyConverterFrame(parent, self)
         self.converter.pack(expand=True, fill="both", padx=10, pady=10)
+        PROFILE.mark("converter")
+        PROFILE.report()
+
+
+class TabPanel(tk.Frame):
+    """One financial tab with its own input fields and result label"""
+
+    def __init__(self, parent):
+        super().__init__(parent, bg=PAPER_BG)
+        self.entries = {}
+        self.result_label = None
 
 
 class CalculatorFrame(tk.Frame):
     def __init__(self, parent, app):
         super().__init__(parent, bg=PAPER_BG)
         self.app = app
-        self.expression = ""
+        self.buffer = None
         self.current_frame = None
+        self.current_mode = None
+        # Each mode's widget tree is built on first use and kept, along with
+        # whatever expression was on its display.
+        self.frames = {}
+        self.buffers = {}
+        self.display_vars = {}
+        self.preview_vars = {}
+
+        # Keyboard input with a debounced live result under the display
+        self.keys = KeyInput()
+        self.preview = LivePreview()
+        self.preview_job = None
+        self.app.bind("<Key>", self.key_press, add="+")
+
+        # Look of the modes shared with CCPFinal.py (Matrix, ...)
+        self.mode_kit = ModeKit(
+            app.label_style, app.entry_style, app.create_stable_button, app.small_font
+        )
 
         self.create_header()
         self.container = tk.Frame(self, bg=PAPER_BG)
@@ -177,40 +263,46 @@ class CalculatorFrame(tk.Frame):
         self.mode_button = self.app.create_stable_menubutton(header, "Basic")
         self.mode_button.pack(side="left", padx=15)
 
-        mode_menu = tk.Menu(
-            self.mode_button,
-            tearoff=0,
-            bg=BUTTON_BG,
-            fg=BUTTON_TEXT,
-            activebackground=BUTTON_HOVER,
-            activeforeground=BUTTON_TEXT,
-            font=self.app.vintage_font,
-            bd=2,
-        )
+        mode_menu = tk.Menu(self.mode_button, tearoff=0)
 
-        for mode in ["Basic", "Scientific", "Financial"]:
+        for mode in ["Basic", "Scientific", "Financial", *EXTRA_MODES]:
             mode_menu.add_command(
                 label=mode, command=lambda m=mode: self.change_mode(m)
             )
 
         self.mode_button.config(menu=mode_menu)  # Now this works!
 
+    @traced("ui.mode", "new_mode")
     def change_mode(self, new_mode):
         self.mode.set(new_mode)
         self.mode_button.config(text=new_mode)
         self.build_ui()
 
     def build_ui(self):
-        if self.current_frame:
-            self.current_frame.destroy()
-
         mode = self.mode.get()
-        self.expression = ""
+        if mode == self.current_mode:
+            return
 
-        if mode == "Financial":
-            self.current_frame = self.create_financial_ui()
-        else:
-            self.current_frame = self.create_standard_ui(mode)
+        if self.current_frame:
+            self.current_frame.pack_forget()
+
+        frame = self.frames.get(mode)
+        if frame is None:
+            if mode == "Financial":
+                frame = self.create_financial_ui()
+            elif mode in EXTRA_MODES:
+                frame = EXTRA_MODES[mode](self.container, self.mode_kit)
+            else:
+                frame = self.create_standard_ui(mode)
+            self.frames[mode] = frame
+
+        self.current_mode = mode
+        self.current_frame = frame
+        self.buffer = self.buffers.setdefault(mode, ExpressionBuffer())
+        if mode in self.display_vars:
+            self.display_var = self.display_vars[mode]
+            self.preview_var = self.preview_vars[mode]
+            self.schedule_preview()
 
         self.current_frame.pack(expand=True, fill="both")
 
@@ -218,7 +310,7 @@ class CalculatorFrame(tk.Frame):
         frame = tk.Frame(self.container, bg=PAPER_BG)
 
         # Display with better contrast
-        self.display_var = tk.StringVar()
+        self.display_var = self.display_vars[mode] = tk.StringVar()
         display = tk.Entry(
             frame,
             textvariable=self.display_var,
@@ -275,6 +367,12 @@ class CalculatorFrame(tk.Frame):
                     ipady=5,
                 )
 
+        # Live result of what has been typed so far
+        self.preview_var = self.preview_vars[mode] = tk.StringVar()
+        tk.Label(
+            frame, textvariable=self.preview_var, anchor="e", **self.app.label_style
+        ).grid(row=len(layout) + 1, column=0, columnspan=5, sticky="ew")
+
         # Configure grid
         cols = 5 if mode == "Scientific" else 4
         for i in range(cols):
@@ -284,32 +382,40 @@ class CalculatorFrame(tk.Frame):
 
         return frame
 
+    @traced("ui.press", "char")
     def button_press(self, char):
-        if char in ("Clear", "C"):
-            self.expression = ""
-        elif char == "=":
-            try:
-                exp = self.expression.replace("^", "**").replace("π", str(math.pi))
-                for old, new in {
-                    "sqrt": "math.sqrt",
-                    "sin": "math.sin",
-                    "cos": "math.cos",
-                    "tan": "math.tan",
-                    "log": "math.log10",
-                    "ln": "math.log",
-                }.items():
-                    exp = exp.replace(f"{old}(", f"{new}(")
-                self.expression = str(eval(exp, {"__builtins__": None}, {"math": math}))
-            except:
-                self.expression = "Error"
-        elif char in ("sin", "cos", "tan", "log", "ln", "sqrt"):
-            self.expression += f"{char}("
+        if self.buffer.press(char):
+            self.display_var.set(self.buffer.render())
+            self.schedule_preview()
+
+    def key_press(self, event):
+        # Only Basic and Scientific take keys; other modes' fields are left alone
+        widget = event.widget
+        editable = isinstance(widget, tk.Entry) and str(widget["state"]) == "normal"
+        if self.current_mode not in ("Basic", "Scientific") or editable:
+            return None
+        if event.state & 0x4:  # Ctrl
+            key = CONTROL_KEYS.get(event.keysym)
+            presses = [key] if key else []
+        elif event.keysym in EDIT_KEYS:
+            presses = [EDIT_KEYS[event.keysym]]
         else:
-            if self.expression == "Error":
-                self.expression = ""
-            self.expression += char
-
-        self.display_var.set(self.expression)
+            presses = self.keys.feed(event.char)
+        if not presses:
+            return None
+        for char in presses:
+            self.button_press(char)
+        return "break"
+
+    def schedule_preview(self):
+        """Refresh the live result once typing pauses, not on every key."""
+        if self.preview_job is not None:
+            self.after_cancel(self.preview_job)
+        self.preview_job = self.after(PREVIEW_DELAY_MS, self.update_preview)
+
+    def update_preview(self):
+        self.preview_job = None
+        self.preview_var.set(self.preview.update(self.buffer.text))
 
     def create_financial_ui(self):
         frame = tk.Frame(self.container, bg=PAPER_BG)
@@ -338,19 +444,23 @@ class CalculatorFrame(tk.Frame):
             btn.pack(side="left", padx=2, fill="x", expand=True)
             self.tab_buttons.append((btn, tab))
 
-        # Content area
+        # Content area: one cached panel per tab, created on first visit
         self.content_frame = tk.Frame(frame, bg=PAPER_BG)
         self.content_frame.pack(expand=True, fill="both")
+        self.tab_panels = {}
+        self.shown_panel = None
 
         self.load_tab_content()
         return frame
 
+    @traced("ui.tab", "tab")
     def switch_tab(self, tab):
         self.current_tab.set(tab)
 
         # Update tab button styles
         for btn, tab_name in self.tab_buttons:
             is_active = tab_name == tab
+            btn.rest_bg = BUTTON_BG if is_active else PAPER_BG
             btn.config(
                 bg=BUTTON_BG if is_active else PAPER_BG,
                 fg=BUTTON_TEXT if is_active else INK_DARK,
@@ -358,124 +468,122 @@ class CalculatorFrame(tk.Frame):
                 activeforeground=BUTTON_TEXT if is_active else INK_DARK,
             )
 
-        # Clear and reload content
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+        # Show the tab's panel (typed values are kept while hidden)
         self.load_tab_content()
 
     def load_tab_content(self):
         tab = self.current_tab.get()
+        if self.shown_panel is not None:
+            self.shown_panel.pack_forget()
+
+        panel = self.tab_panels.get(tab)
+        if panel is None:
+            panel = TabPanel(self.content_frame)
+            if tab in ["Simple Interest", "Compound Interest"]:
+                self.create_interest_tab(panel, tab)
+            else:
+                self.create_loan_tab(panel)
+            self.tab_panels[tab] = panel
 
-        if tab in ["Simple Interest", "Compound Interest"]:
-            self.create_interest_tab(tab)
-        else:
-            self.create_loan_tab()
+        self.shown_panel = panel
+        panel.pack(expand=True, fill="both")
 
-    def create_interest_tab(self, tab_type):
+    def create_interest_tab(self, panel, tab_type):
         fields = ["Principal", "Rate % per year", "Time years"]
-        self.entries = {}
 
         for i, field in enumerate(fields):
-            tk.Label(self.content_frame, text=f"{field}:", **self.app.label_style).grid(
+            tk.Label(panel, text=f"{field}:", **self.app.label_style).grid(
                 row=i, column=0, sticky="e", padx=10, pady=5
             )
-            entry = tk.Entry(self.content_frame, **self.app.entry_style, width=15)
+            entry = tk.Entry(panel, **self.app.entry_style, width=15)
             entry.grid(row=i, column=1, sticky="w", padx=10, pady=5)
-            self.entries[field] = entry
+            panel.entries[field] = entry
 
         if tab_type == "Compound Interest":
-            tk.Label(
-                self.content_frame, text="Compounds/year:", **self.app.label_style
-            ).grid(row=3, column=0, sticky="e", padx=10, pady=5)
-            entry = tk.Entry(self.content_frame, **self.app.entry_style, width=15)
+            tk.Label(panel, text="Compounds/year:", **self.app.label_style).grid(
+                row=3, column=0, sticky="e", padx=10, pady=5
+            )
+            entry = tk.Entry(panel, **self.app.entry_style, width=15)
             entry.grid(row=3, column=1, sticky="w", padx=10, pady=5)
-            self.entries["Compounds"] = entry
+            panel.entries["Compounds"] = entry
 
-        self.result_label = tk.Label(
-            self.content_frame, text="", **self.app.label_style, wraplength=400
+        panel.result_label = tk.Label(
+            panel, text="", **self.app.label_style, wraplength=400
         )
-        self.result_label.grid(row=5, column=0, columnspan=2, pady=20)
+        panel.result_label.grid(row=5, column=0, columnspan=2, pady=20)
 
         # Use stable button
         calc_btn = self.app.create_stable_button(
-            self.content_frame,
+            panel,
             "Calculate",
             command=lambda: self.calculate_interest(tab_type),
         )
         calc_btn.grid(row=4, column=0, columnspan=2, pady=10, sticky="ew")
 
         for i in range(2):
-            self.content_frame.grid_columnconfigure(i, weight=1)
+            panel.grid_columnconfigure(i, weight=1)
 
+    @traced("ui.interest", "calc_type")
     def calculate_interest(self, calc_type):
+        panel = self.tab_panels[calc_type]
         try:
-            P = float(self.entries["Principal"].get())
-            R = float(self.entries["Rate % per year"].get()) / 100
-            T = float(self.entries["Time years"].get())
+            P = panel.entries["Principal"].get()
+            R = panel.entries["Rate % per year"].get()
+            T = panel.entries["Time years"].get()
 
             if calc_type == "Simple Interest":
-                si = P * R * T
-                total = P + si
-                self.result_label.config(
-                    text=f"Simple Interest: ${si:.2f}\nTotal Amount: ${total:.2f}",
+                si, total = simple_interest(P, R, T)
+                panel.result_label.config(
+                    text=f"Simple Interest: ${si}\nTotal Amount: ${total}",
                     fg=SUCCESS_COLOR,
                 )
             else:
-                n = int(self.entries["Compounds"].get())
-                amount = P * (1 + R / n) ** (n * T)
-                ci = amount - P
-                self.result_label.config(
-                    text=f"Compound Interest: ${ci:.2f}\nTotal Amount: ${amount:.2f}",
+                n = int(panel.entries["Compounds"].get())
+                ci, amount = compound_interest(P, R, T, n)
+                panel.result_label.config(
+                    text=f"Compound Interest: ${ci}\nTotal Amount: ${amount}",
                     fg=SUCCESS_COLOR,
                 )
         except:
-            self.result_label.config(
+            panel.result_label.config(
                 text="Error: Please enter valid numbers", fg=ERROR_COLOR
             )
 
-    def create_loan_tab(self):
+    def create_loan_tab(self, panel):
         fields = ["Loan Amount", "Rate % per year", "Term years"]
-        self.entries = {}
 
         for i, field in enumerate(fields):
-            tk.Label(self.content_frame, text=f"{field}:", **self.app.label_style).grid(
+            tk.Label(panel, text=f"{field}:", **self.app.label_style).grid(
                 row=i, column=0, sticky="e", padx=10, pady=5
             )
-            entry = tk.Entry(self.content_frame, **self.app.entry_style, width=15)
+            entry = tk.Entry(panel, **self.app.entry_style, width=15)
             entry.grid(row=i, column=1, sticky="w", padx=10, pady=5)
-            self.entries[field] = entry
+            panel.entries[field] = entry
 
-        self.result_label = tk.Label(
-            self.content_frame, text="", **self.app.label_style
-        )
-        self.result_label.grid(row=4, column=0, columnspan=2, pady=20)
+        panel.result_label = tk.Label(panel, text="", **self.app.label_style)
+        panel.result_label.grid(row=4, column=0, columnspan=2, pady=20)
 
         # Use stable button
         calc_btn = self.app.create_stable_button(
-            self.content_frame, "Calculate EMI", command=self.calculate_loan
+            panel, "Calculate EMI", command=self.calculate_loan
         )
         calc_btn.grid(row=3, column=0, columnspan=2, pady=10, sticky="ew")
 
         for i in range(2):
-            self.content_frame.grid_columnconfigure(i, weight=1)
+            panel.grid_columnconfigure(i, weight=1)
 
+    @traced("ui.loan")
     def calculate_loan(self):
+        panel = self.tab_panels["Loan Calculator"]
         try:
-            P = float(self.entries["Loan Amount"].get())
-            annual_rate = float(self.entries["Rate % per year"].get())
-            term_years = int(self.entries["Term years"].get())
-
-            r = (annual_rate / 100) / 12
-            n = term_years * 12
-
-            if r == 0:
-                emi = P / n
-            else:
-                emi = P * (r * (1 + r) ** n) / ((1 + r) ** n - 1)
+            P = panel.entries["Loan Amount"].get()
+            annual_rate = panel.entries["Rate % per year"].get()
+            term_years = int(panel.entries["Term years"].get())
 
-            self.result_label.config(text=f"Monthly EMI: ${emi:.2f}", fg=SUCCESS_COLOR)
+            monthly = emi(P, annual_rate, term_years)
+            panel.result_label.config(text=f"Monthly EMI: ${monthly}", fg=SUCCESS_COLOR)
         except:
-            self.result_label.config(
+            panel.result_label.config(
                 text="Error: Please enter valid numbers", fg=ERROR_COLOR
             )
 
@@ -484,47 +592,15 @@ class CurrencyConverterFrame(tk.Frame):
     def __init__(self, parent, app):
         super().__init__(parent, bg=PAPER_BG)
         self.app = app
-        self.api_url = "https://api.exchangerate-api.com/v4/latest/"
-        self.rates = {}
-        self.currencies = sorted(
-            [
-                "USD",
-                "EUR",
-                "JPY",
-                "GBP",
-                "AUD",
-                "CAD",
-                "CHF",
-                "CNY",
-                "INR",
-                "BRL",
-                "RUB",
-                "ZAR",
-                "SGD",
-                "NZD",
-                "MXN",
-                "KRW",
-                "NOK",
-                "SEK",
-                "DKK",
-                "PLN",
-                "HUF",
-                "CZK",
-                "ILS",
-                "PHP",
-                "THB",
-                "MYR",
-                "IDR",
-                "HKD",
-                "ISK",
-                "HRK",
-                "BGN",
-                "RON",
-                "TRY",
-            ]
-        )
+        self.store = RateStore()
+        self.fetched = queue.Queue()  # finished downloads from worker threads
+        self.pending_fetches = 0
+        self.currencies = list(CURRENCIES)
         self.create_widgets()
+        self.load_offline_rates()
         self.update_rates()
+        if self.store.shared is not None:
+            self.after(SHARED_POLL_MS, self.watch_shared_rates)
 
     def create_widgets(self):
         # Title
@@ -546,16 +622,7 @@ class CurrencyConverterFrame(tk.Frame):
         self.from_button = self.app.create_stable_menubutton(from_frame, "USD")
         self.from_button.pack(side="left", padx=10)
 
-        from_menu = tk.Menu(
-            self.from_button,
-            tearoff=0,
-            bg=BUTTON_BG,
-            fg=BUTTON_TEXT,
-            activebackground=BUTTON_HOVER,
-            activeforeground=BUTTON_TEXT,
-            font=self.app.vintage_font,
-            bd=2,
-        )
+        from_menu = tk.Menu(self.from_button, tearoff=0)
 
         for currency in self.currencies:
             from_menu.add_command(
@@ -573,16 +640,7 @@ class CurrencyConverterFrame(tk.Frame):
         self.to_button = self.app.create_stable_menubutton(to_frame, "INR")
         self.to_button.pack(side="left", padx=10)
 
-        to_menu = tk.Menu(
-            self.to_button,
-            tearoff=0,
-            bg=BUTTON_BG,
-            fg=BUTTON_TEXT,
-            activebackground=BUTTON_HOVER,
-            activeforeground=BUTTON_TEXT,
-            font=self.app.vintage_font,
-            bd=2,
-        )
+        to_menu = tk.Menu(self.to_button, tearoff=0)
 
         for currency in self.currencies:
             to_menu.add_command(
@@ -637,6 +695,7 @@ class CurrencyConverterFrame(tk.Frame):
         self.to_var.set(currency)
         self.to_button.config(text=currency)
 
+    @traced("ui.update_rates", "show_message")
     def update_rates(self, show_message=False):
         base = self.from_var.get()
         self.status_label.config(text=f"Updating rates for {base}...")
@@ -646,25 +705,67 @@ class CurrencyConverterFrame(tk.Frame):
 
         self.update_idletasks()
 
+        # Another instance on this host fetches for us; one shared table
+        # covers every base, so only a manual refresh forces a download.
+        if self.store.prefers_shared(manual=show_message):
+            if self.load_shared_rates() and show_message:
+                self.update_message.config(
+                    text=f"✓ Using rates shared by another window for {base}!",
+                    fg=SUCCESS_COLOR,
+                )
+                self.after(5000, lambda: self.update_message.config(text=""))
+            return
+
+        # Download on a worker thread so the window stays responsive;
+        # poll_fetches hands the result back to the Tk thread.
+        self.pending_fetches += 1
+        threading.Thread(
+            target=self.fetch_rates, args=(base, show_message, handoff()), daemon=True
+        ).start()
+        if self.pending_fetches == 1:
+            self.after(FETCH_POLL_MS, self.poll_fetches)
+
+    @traced("worker.fetch", "base")
+    def fetch_rates(self, base, show_message, flow=None):
+        """Worker thread: download and decode only, never touch Tk."""
+        follow(flow)
+        try:
+            rates = self.store.fetch(base)
+            self.fetched.put((base, show_message, rates, None, handoff()))
+        except Exception as exc:
+            self.fetched.put((base, show_message, None, exc, handoff()))
+
+    def poll_fetches(self):
+        while True:
+            try:
+                result = self.fetched.get_nowait()
+            except queue.Empty:
+                break
+            self.pending_fetches -= 1
+            self.finish_update(*result)
+        if self.pending_fetches:
+            self.after(FETCH_POLL_MS, self.poll_fetches)
+
+    @traced("ui.finish_update", "base")
+    def finish_update(self, base, show_message, rates, error, flow=None):
+        follow(flow)
         try:
-            response = requests.get(f"{self.api_url}{base}")
-            response.raise_for_status()
-            data = response.json()
-            self.rates = data.get("rates", {})
+            if error is not None:
+                raise error
+            self.store.store(base, rates)
+            date = rates.date
 
-            self.status_label.config(
-                text=f"Rates updated: {data.get('date', 'Unknown date')}"
-            )
+            self.status_label.config(text=f"Rates updated: {date or 'Unknown date'}")
 
             if show_message:
-                rate_count = len(self.rates)
+                rate_count = len(rates)
                 self.update_message.config(
                     text=f"✓ Successfully updated {rate_count} exchange rates for {base}!",
                     fg=SUCCESS_COLOR,
                 )
                 self.after(5000, lambda: self.update_message.config(text=""))
 
-        except requests.exceptions.RequestException:
+        except OSError:  # requests' exceptions are OSErrors
             self.status_label.config(
                 text="Error: Network issue - Could not fetch rates"
             )
@@ -681,32 +782,54 @@ class CurrencyConverterFrame(tk.Frame):
                     fg=ERROR_COLOR,
                 )
 
+    def load_offline_rates(self):
+        """Show the newest saved snapshot until fresh rates arrive."""
+        snapshot = self.store.load_offline(self.from_var.get())
+        if snapshot is None:
+            return
+        self.status_label.config(text=f"Offline rates from {snapshot.date}")
+
+    def load_shared_rates(self):
+        base = self.from_var.get()
+        date = self.store.load_shared(base)
+        if date is None:
+            self.status_label.config(text="Waiting for shared rates...")
+            return False
+        self.status_label.config(text=f"Rates updated: {date} (shared)")
+        return True
+
+    def watch_shared_rates(self):
+        if self.store.shared_changed():
+            self.load_shared_rates()
+        elif self.store.due_for_refresh():
+            self.update_rates()
+        self.after(SHARED_POLL_MS, self.watch_shared_rates)
+
     def manual_update_rates(self):
         self.update_rates(show_message=True)
 
+    @traced("ui.convert")
     def convert(self):
         try:
-            amount = float(self.amount_entry.get())
             from_curr = self.from_var.get()
             to_curr = self.to_var.get()
 
-            if not self.rates:
+            if not self.store.rates and not self.store.graph.tables:
                 self.result_label.config(
                     text="Error: No rates available", fg=ERROR_COLOR
                 )
                 return
 
-            rate = self.rates.get(to_curr)
-            if rate is None:
-                self.result_label.config(text="Error: Rate not found", fg=ERROR_COLOR)
-                return
-
-            converted = amount * rate
+            amount, converted = self.store.convert(
+                self.amount_entry.get(), from_curr, to_curr
+            )
             self.result_label.config(
-                text=f"{amount:.2f} {from_curr} = {converted:.2f} {to_curr}",
+                text=f"{amount} {from_curr} = {converted} {to_curr}",
                 fg=SUCCESS_COLOR,
             )
 
+        except RateUnavailable:
+            self.result_label.config(text="Error: Rate not found", fg=ERROR_COLOR)
         except ValueError:
             self.result_label.config(
                 text="Error: Please enter a valid amount", fg=ERROR_COLOR
@@ -1,7 +1,25 @@
+from startup import StartupProfile  # first, so the profile clock covers imports
 import tkinter as tk
 from tkinter import ttk, font as tkFont
-import math
-import requests
+import queue
+import threading
+
+from calccore import (
+    CURRENCIES,
+    ExpressionBuffer,
+    KeyInput,
+    LivePreview,
+    RateStore,
+    compound_interest,
+    emi,
+    simple_interest,
+)
+from calccore.tracing import follow, handoff, traced
+from event_trace import TraceRecorder
+from leak_check import LeakMonitor
+from sampling_profiler import ProfilerToggle
+from tk_modes import EXTRA_MODES, ModeKit
+from tk_monitor import TkMonitor
 
 # ------------ GLOBAL VINTAGE SETTINGS ---------------------------------------
 HANDWRITTEN = "Comic Sans MS"
@@ -9,6 +27,27 @@ CREAM_BG = "#FAF3E0"
 PAPER_BG = "#F5E6C4"
 INK_DARK = "#5B4636"
 
+SHARED_POLL_MS = 2000  # how often to look for rates published by another instance
+FETCH_POLL_MS = 50  # how often to check for a finished background download
+PREVIEW_DELAY_MS = 60  # typing pause before the live result is refreshed
+
+# Keyboard keys (Tk keysyms) that map to calculator presses
+EDIT_KEYS = {
+    "Return": "=",
+    "KP_Enter": "=",
+    "BackSpace": "Backspace",
+    "Delete": "Delete",
+    "Escape": "Clear",
+    "Left": "Left",
+    "Right": "Right",
+    "Home": "Home",
+    "End": "End",
+}
+CONTROL_KEYS = {"z": "Undo", "y": "Redo", "Z": "Redo"}  # with Ctrl held
+
+PROFILE = StartupProfile()  # enabled by --profile-startup
+PROFILE.mark("imports")
+
 
 # --------------------------------------------------------------------------- #
 #  PRIMARY WINDOW                                                             #
@@ -16,7 +55,15 @@ INK_DARK = "#5B4636"
 class FinancialApp(tk.Tk):
     def __init__(self):
         super().__init__()
+        # --monitor: time every callback registered from here on
+        self.monitor = TkMonitor.from_argv(self)
+        # --record-trace=FILE: log handler calls for event_trace.py replay
+        self.recorder = TraceRecorder.from_argv(self)
+        # --leak-check: log widget / Tcl variable / object counts per screen
+        self.leak_monitor = LeakMonitor.from_argv(self)
         self.title("Python Multi-Tool – Vintage Edition")
+        # Ctrl+Shift+P: start/stop the sampling profiler (writes .folded stacks)
+        self.profiler = ProfilerToggle.install_tk(self)
         self.geometry("1000x600")
         self.configure(bg=CREAM_BG)
 
@@ -63,8 +110,12 @@ class FinancialApp(tk.Tk):
             "font": self.vintage_font,
         }
 
+        PROFILE.mark("window")
         self._layout()
 
+    def vintage_button(self, parent, text, command=None):
+        return ttk.Button(parent, text=text, style="Vintage.TButton", command=command)
+
     # ----------------------------------------------------------------------- #
     def _layout(self):
         self.grid_columnconfigure((0, 1), weight=1)
@@ -75,22 +126,60 @@ class FinancialApp(tk.Tk):
         left.grid(row=0, column=0, sticky="nsew", padx=15, pady=15)
         right.grid(row=0, column=1, sticky="nsew", padx=15, pady=15)
 
-        CalculatorFrame(left, self).pack(expand=True, fill="both", padx=10, pady=10)
-        CurrencyConverterFrame(right, self).pack(
-            expand=True, fill="both", padx=10, pady=10
-        )
+        self.calculator = CalculatorFrame(left, self)
+        self.calculator.pack(expand=True, fill="both", padx=10, pady=10)
+        PROFILE.mark("calculator")
+
+        # The converter loads once the window has been drawn
+        self.converter = None
+        placeholder = tk.Label(right, text="Loading converter…", **self.label_opts)
+        placeholder.pack(expand=True)
+        self.after_idle(self.after, 0, lambda: self._load_converter(right, placeholder))
+
+    def _load_converter(self, parent, placeholder):
+        PROFILE.mark("first paint")
+        placeholder.destroy()
+        self.converter = CurrencyConverterFrame(parent, self)
+        self.converter.pack(expand=True, fill="both", padx=10, pady=10)
+        PROFILE.mark("converter")
+        PROFILE.report()
 
 
 # --------------------------------------------------------------------------- #
 #  CALCULATOR                                                                 #
 # --------------------------------------------------------------------------- #
+class TabPanel(tk.Frame):
+    """One financial tab with its own inputs and result label."""
+
+    def __init__(self, parent):
+        super().__init__(parent, bg=PAPER_BG)
+        self.entries = {}
+        self.result_lbl = None
+
+
 class CalculatorFrame(tk.Frame):
     def __init__(self, parent, app: FinancialApp):
         super().__init__(parent, bg=PAPER_BG)
         self.app = app
-        self.expression = ""
+        self.buffer = None
         self.current_tab = tk.StringVar(value="Simple Interest")
         self.mode = tk.StringVar(value="Basic")
+        # Mode widget trees are built once, then shown/hidden with their
+        # display contents intact.
+        self._frames = {}
+        self._buffers = {}
+        self._display_vars = {}
+        self._preview_vars = {}
+        self._shown = None
+        # Keyboard input with a debounced live result under the display
+        self._keys = KeyInput()
+        self._preview = LivePreview()
+        self._preview_job = None
+        self.app.bind("<Key>", self._key, add="+")
+        # Look of the modes shared with CCP.py (Matrix, ...)
+        self.mode_kit = ModeKit(
+            app.label_opts, app.entry_opts, app.vintage_button, app.small_font
+        )
         self._header()
         self.container = tk.Frame(self, bg=PAPER_BG)
         self.container.pack(expand=True, fill="both", padx=10, pady=10)
@@ -120,30 +209,43 @@ class CalculatorFrame(tk.Frame):
             activeforeground="white",
             font=self.app.vintage_font,
         )
-        for m in ("Basic", "Scientific", "Financial"):
+        for m in ("Basic", "Scientific", "Financial", *EXTRA_MODES):
             menu.add_command(label=m, command=lambda v=m: self._switch_mode(v))
         menu_btn["menu"] = menu
 
+    @traced("ui.mode", "new_mode")
     def _switch_mode(self, new_mode):
         self.mode.set(new_mode)
         self._build_ui()
 
     # ----------------------------------------------------------------------- #
     def _build_ui(self):
-        for widget in self.container.winfo_children():
-            widget.destroy()
+        mode = self.mode.get()
+        if mode == self._shown:
+            return
+        if self._shown is not None:
+            self._frames[self._shown].pack_forget()
+
+        if mode not in self._frames:
+            if mode == "Financial":
+                self._frames[mode] = self._financial_ui()
+            elif mode in EXTRA_MODES:
+                self._frames[mode] = EXTRA_MODES[mode](self.container, self.mode_kit)
+            else:
+                self._frames[mode] = self._standard_ui(mode)
 
-        self.expression = ""
-        if self.mode.get() == "Financial":
-            frame = self._financial_ui()
-        else:
-            frame = self._standard_ui(self.mode.get())
-        frame.pack(expand=True, fill="both")
+        self._shown = mode
+        self.buffer = self._buffers.setdefault(mode, ExpressionBuffer())
+        if mode in self._display_vars:
+            self.display_var = self._display_vars[mode]
+            self.preview_var = self._preview_vars[mode]
+            self._schedule_preview()
+        self._frames[mode].pack(expand=True, fill="both")
 
     # ----------  BASIC / SCIENTIFIC ---------------------------------------- #
     def _standard_ui(self, mode):
         frame = tk.Frame(self.container, bg=PAPER_BG)
-        self.display_var = tk.StringVar()
+        self.display_var = self._display_vars[mode] = tk.StringVar()
         tk.Entry(
             frame,
             textvariable=self.display_var,
@@ -185,6 +287,11 @@ class CalculatorFrame(tk.Frame):
                     command=lambda ch=char: self._press(ch),
                 ).grid(row=r, column=c, columnspan=span, sticky="nsew", padx=2, pady=2)
 
+        self.preview_var = self._preview_vars[mode] = tk.StringVar()
+        tk.Label(
+            frame, textvariable=self.preview_var, anchor="e", **self.app.label_opts
+        ).grid(row=len(grid) + 1, column=0, columnspan=5, sticky="ew")
+
         cols = 5 if mode == "Scientific" else 4
         for i in range(cols):
             frame.grid_columnconfigure(i, weight=1)
@@ -192,31 +299,40 @@ class CalculatorFrame(tk.Frame):
             frame.grid_rowconfigure(i, weight=1)
         return frame
 
+    @traced("ui.press", "char")
     def _press(self, char):
-        if char in ("Clear", "C"):
-            self.expression = ""
-        elif char == "=":
-            try:
-                exp = self.expression.replace("^", "**").replace("π", str(math.pi))
-                for old, new in {
-                    "sqrt": "math.sqrt",
-                    "sin": "math.sin",
-                    "cos": "math.cos",
-                    "tan": "math.tan",
-                    "log": "math.log10",
-                    "ln": "math.log",
-                }.items():
-                    exp = exp.replace(f"{old}(", f"{new}(")
-                self.expression = str(eval(exp, {"__builtins__": None, "math": math}))
-            except Exception:
-                self.expression = "Error"
-        elif char in ("sin", "cos", "tan", "log", "ln", "sqrt"):
-            self.expression += f"{char}("
+        if self.buffer.press(char):
+            self.display_var.set(self.buffer.render())
+            self._schedule_preview()
+
+    def _key(self, event):
+        # Only Basic and Scientific take keys; other modes' fields are left alone
+        widget = event.widget
+        editable = isinstance(widget, tk.Entry) and str(widget["state"]) == "normal"
+        if self._shown not in ("Basic", "Scientific") or editable:
+            return None
+        if event.state & 0x4:  # Ctrl
+            key = CONTROL_KEYS.get(event.keysym)
+            presses = [key] if key else []
+        elif event.keysym in EDIT_KEYS:
+            presses = [EDIT_KEYS[event.keysym]]
         else:
-            if self.expression == "Error":
-                self.expression = ""
-            self.expression += char
-        self.display_var.set(self.expression)
+            presses = self._keys.feed(event.char)
+        if not presses:
+            return None
+        for char in presses:
+            self._press(char)
+        return "break"
+
+    def _schedule_preview(self):
+        """Refresh the live result once typing pauses, not on every key."""
+        if self._preview_job is not None:
+            self.after_cancel(self._preview_job)
+        self._preview_job = self.after(PREVIEW_DELAY_MS, self._update_preview)
+
+    def _update_preview(self):
+        self._preview_job = None
+        self.preview_var.set(self._preview.update(self.buffer.text))
 
     # ----------  FINANCIAL -------------------------------------------------- #
     def _financial_ui(self):
@@ -237,114 +353,125 @@ class CalculatorFrame(tk.Frame):
                 command=lambda t=tab: self._switch_tab(t),
             ).pack(side="left", expand=True, fill="x", padx=2)
 
+        # One panel per tab, created on first visit and then only re-packed
         self.content = tk.Frame(frame, bg=PAPER_BG)
         self.content.pack(expand=True, fill="both")
+        self._panels = {}
+        self._shown_panel = None
         self._load_financial_tab()
         return frame
 
+    @traced("ui.tab", "tab")
     def _switch_tab(self, tab):
         self.current_tab.set(tab)
-        self._build_ui()
+        self._load_financial_tab()
 
     def _load_financial_tab(self):
         tab = self.current_tab.get()
-        if tab in ("Simple Interest", "Compound Interest"):
-            self._interest_ui(tab)
-        else:
-            self._loan_ui()
+        if self._shown_panel is not None:
+            self._shown_panel.pack_forget()
+        if tab not in self._panels:
+            panel = TabPanel(self.content)
+            if tab in ("Simple Interest", "Compound Interest"):
+                self._interest_ui(panel, tab)
+            else:
+                self._loan_ui(panel)
+            self._panels[tab] = panel
+        self._shown_panel = self._panels[tab]
+        self._shown_panel.pack(expand=True, fill="both")
 
     # ----------  Simple / Compound ----------------------------------------- #
-    def _interest_ui(self, calc_type):
+    def _interest_ui(self, panel, calc_type):
         fields = ("Principal", "Rate % per year", "Time years")
-        self.entries = {}
         for row, field in enumerate(fields):
-            tk.Label(self.content, text=f"{field}:", **self.app.label_opts).grid(
+            tk.Label(panel, text=f"{field}:", **self.app.label_opts).grid(
                 row=row, column=0, sticky="e", padx=10, pady=5
             )
-            e = tk.Entry(self.content, **self.app.entry_opts, width=15)
+            e = tk.Entry(panel, **self.app.entry_opts, width=15)
             e.grid(row=row, column=1, sticky="w", padx=10, pady=5)
-            self.entries[field] = e
+            panel.entries[field] = e
 
         if calc_type == "Compound Interest":
-            tk.Label(self.content, text="Compounds/year:", **self.app.label_opts).grid(
+            tk.Label(panel, text="Compounds/year:", **self.app.label_opts).grid(
                 row=3, column=0, sticky="e", padx=10, pady=5
             )
-            e = tk.Entry(self.content, **self.app.entry_opts, width=15)
+            e = tk.Entry(panel, **self.app.entry_opts, width=15)
             e.grid(row=3, column=1, sticky="w", padx=10, pady=5)
-            self.entries["Compounds"] = e
+            panel.entries["Compounds"] = e
 
         ttk.Button(
-            self.content,
+            panel,
             text="Calculate",
             style="Vintage.TButton",
             command=lambda: self._calc_interest(calc_type),
         ).grid(row=4, column=0, columnspan=2, sticky="ew", pady=10, padx=20)
 
-        self.result_lbl = tk.Label(
-            self.content, text="", **self.app.label_opts, wraplength=400
+        panel.result_lbl = tk.Label(
+            panel, text="", **self.app.label_opts, wraplength=400
         )
-        self.result_lbl.grid(row=5, column=0, columnspan=2, pady=20)
+        panel.result_lbl.grid(row=5, column=0, columnspan=2, pady=20)
 
         for i in range(2):
-            self.content.grid_columnconfigure(i, weight=1)
+            panel.grid_columnconfigure(i, weight=1)
 
+    @traced("ui.interest", "calc_type")
     def _calc_interest(self, calc_type):
+        panel = self._panels[calc_type]
         try:
-            P = float(self.entries["Principal"].get())
-            R = float(self.entries["Rate % per year"].get()) / 100
-            T = float(self.entries["Time years"].get())
+            P = panel.entries["Principal"].get()
+            R = panel.entries["Rate % per year"].get()
+            T = panel.entries["Time years"].get()
             if calc_type == "Simple Interest":
-                si = P * R * T
-                self.result_lbl.config(
-                    text=f"Simple Interest: ${si:.2f}\nTotal Amount: ${P+si:.2f}",
+                si, total = simple_interest(P, R, T)
+                panel.result_lbl.config(
+                    text=f"Simple Interest: ${si}\nTotal Amount: ${total}",
                     fg=INK_DARK,
                 )
             else:
-                n = int(self.entries["Compounds"].get())
-                amount = P * (1 + R / n) ** (n * T)
-                self.result_lbl.config(
-                    text=f"Compound Interest: ${amount-P:.2f}\nTotal Amount: ${amount:.2f}",
+                n = int(panel.entries["Compounds"].get())
+                ci, amount = compound_interest(P, R, T, n)
+                panel.result_lbl.config(
+                    text=f"Compound Interest: ${ci}\nTotal Amount: ${amount}",
                     fg=INK_DARK,
                 )
         except Exception:
-            self.result_lbl.config(text="Error: Enter valid numbers", fg="red")
+            panel.result_lbl.config(text="Error: Enter valid numbers", fg="red")
 
     # ----------  Loan EMI --------------------------------------------------- #
-    def _loan_ui(self):
+    def _loan_ui(self, panel):
         fields = ("Loan Amount", "Rate % per year", "Term years")
-        self.entries = {}
         for r, field in enumerate(fields):
-            tk.Label(self.content, text=f"{field}:", **self.app.label_opts).grid(
+            tk.Label(panel, text=f"{field}:", **self.app.label_opts).grid(
                 row=r, column=0, sticky="e", padx=10, pady=5
             )
-            e = tk.Entry(self.content, **self.app.entry_opts, width=15)
+            e = tk.Entry(panel, **self.app.entry_opts, width=15)
             e.grid(row=r, column=1, sticky="w", padx=10, pady=5)
-            self.entries[field] = e
+            panel.entries[field] = e
 
         ttk.Button(
-            self.content,
+            panel,
             text="Calculate EMI",
             style="Vintage.TButton",
             command=self._calc_loan,
         ).grid(row=3, column=0, columnspan=2, sticky="ew", pady=10, padx=20)
 
-        self.result_lbl = tk.Label(self.content, text="", **self.app.label_opts)
-        self.result_lbl.grid(row=4, column=0, columnspan=2, pady=20)
+        panel.result_lbl = tk.Label(panel, text="", **self.app.label_opts)
+        panel.result_lbl.grid(row=4, column=0, columnspan=2, pady=20)
 
         for i in range(2):
-            self.content.grid_columnconfigure(i, weight=1)
+            panel.grid_columnconfigure(i, weight=1)
 
+    @traced("ui.loan")
     def _calc_loan(self):
+        panel = self._panels["Loan Calculator"]
         try:
-            P = float(self.entries["Loan Amount"].get())
-            annual_rate = float(self.entries["Rate % per year"].get())
-            years = int(self.entries["Term years"].get())
-            r = (annual_rate / 100) / 12
-            n = years * 12
-            emi = P / n if r == 0 else P * (r * (1 + r) ** n) / ((1 + r) ** n - 1)
-            self.result_lbl.config(text=f"Monthly EMI: ${emi:.2f}", fg=INK_DARK)
+            P = panel.entries["Loan Amount"].get()
+            annual_rate = panel.entries["Rate % per year"].get()
+            years = int(panel.entries["Term years"].get())
+            monthly = emi(P, annual_rate, years)
+            panel.result_lbl.config(text=f"Monthly EMI: ${monthly}", fg=INK_DARK)
         except Exception:
-            self.result_lbl.config(text="Error: Enter valid numbers", fg="red")
+            panel.result_lbl.config(text="Error: Enter valid numbers", fg="red")
 
 
 # --------------------------------------------------------------------------- #
@@ -354,30 +481,15 @@ class CurrencyConverterFrame(tk.Frame):
     def __init__(self, parent, app: FinancialApp):
         super().__init__(parent, bg=PAPER_BG)
         self.app = app
-        self.api_url = "https://api.exchangerate-api.com/v4/latest/"
-        self.rates = {}
-        self.currencies = sorted(
-            [
-                "USD",
-                "EUR",
-                "JPY",
-                "GBP",
-                "AUD",
-                "CAD",
-                "CHF",
-                "CNY",
-                "INR",
-                "BRL",
-                "RUB",
-                "ZAR",
-                "SGD",
-                "NZD",
-                "MXN",
-                "KRW",
-            ]
-        )
+        self.store = RateStore()
+        self._fetched = queue.Queue()  # finished downloads from worker threads
+        self._pending = 0
+        self.currencies = list(CURRENCIES)
         self._widgets()
+        self._load_offline()
         self._update_rates()
+        if self.store.shared is not None:
+            self.after(SHARED_POLL_MS, self._watch_shared)
 
     # ----------------------------------------------------------------------- #
     def _widgets(self):
@@ -485,16 +597,59 @@ class CurrencyConverterFrame(tk.Frame):
         self.to_var.set(currency)
 
     # ----------------------------------------------------------------------- #
+    @traced("ui.update_rates", "show_msg")
     def _update_rates(self, show_msg=False):
         base = self.from_var.get()
         self.status_lbl.config(text=f"Updating rates for {base}…")
         if show_msg:
             self.update_msg.config(text="")
         self.update_idletasks()
+
+        # One shared table covers every base, see RateStore.prefers_shared
+        if self.store.prefers_shared(manual=show_msg):
+            if self._load_shared() and show_msg:
+                self.update_msg.config(
+                    text=f"✓ Using shared rates for {base}!", fg="#008000"
+                )
+                self.after(5000, lambda: self.update_msg.config(text=""))
+            return
+
+        # Download on a worker thread; _poll_fetches applies the result here
+        self._pending += 1
+        threading.Thread(
+            target=self._fetch, args=(base, show_msg, handoff()), daemon=True
+        ).start()
+        if self._pending == 1:
+            self.after(FETCH_POLL_MS, self._poll_fetches)
+
+    @traced("worker.fetch", "base")
+    def _fetch(self, base, show_msg, flow=None):
+        """Worker thread: download and decode only, never touch Tk."""
+        follow(flow)
+        try:
+            self._fetched.put((base, show_msg, self.store.fetch(base), None, handoff()))
+        except Exception as exc:
+            self._fetched.put((base, show_msg, None, exc, handoff()))
+
+    def _poll_fetches(self):
+        while True:
+            try:
+                result = self._fetched.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            self._apply_rates(*result)
+        if self._pending:
+            self.after(FETCH_POLL_MS, self._poll_fetches)
+
+    @traced("ui.apply_rates", "base")
+    def _apply_rates(self, base, show_msg, rates, error, flow=None):
+        follow(flow)
         try:
-            data = requests.get(f"{self.api_url}{base}", timeout=10).json()
-            self.rates = data.get("rates", {})
-            self.status_lbl.config(text=f"Rates updated: {data.get('date', '')}")
+            if error is not None:
+                raise error
+            self.store.store(base, rates)
+            self.status_lbl.config(text=f"Rates updated: {rates.date}")
             if show_msg:
                 self.update_msg.config(
                     text=f"✓ Updated rates for {base}!", fg="#008000"
@@ -505,16 +660,37 @@ class CurrencyConverterFrame(tk.Frame):
             if show_msg:
                 self.update_msg.config(text="✗ Failed to update rates", fg="#FF0000")
 
+    def _load_offline(self):
+        snapshot = self.store.load_offline(self.from_var.get())
+        if snapshot is None:
+            return
+        self.status_lbl.config(text=f"Offline rates from {snapshot.date}")
+
+    def _load_shared(self):
+        base = self.from_var.get()
+        date = self.store.load_shared(base)
+        if date is None:
+            self.status_lbl.config(text="Waiting for shared rates…")
+            return False
+        self.status_lbl.config(text=f"Rates updated: {date} (shared)")
+        return True
+
+    def _watch_shared(self):
+        if self.store.shared_changed():
+            self._load_shared()
+        elif self.store.due_for_refresh():
+            self._update_rates()
+        self.after(SHARED_POLL_MS, self._watch_shared)
+
     # ----------------------------------------------------------------------- #
+    @traced("ui.convert")
     def _convert(self):
         try:
-            amount = float(self.amount_entry.get())
-            rate = self.rates.get(self.to_var.get())
-            if rate is None:
-                raise ValueError("Rate missing")
-            result = amount * rate
+            amount, result = self.store.convert(
+                self.amount_entry.get(), self.from_var.get(), self.to_var.get()
+            )
             self.result_lbl.config(
-                text=f"{amount:.2f} {self.from_var.get()} = {result:.2f} {self.to_var.get()}",
+                text=f"{amount} {self.from_var.get()} = {result} {self.to_var.get()}",
                 fg=INK_DARK,
             )
         except Exception:
@@ -1,17 +1,32 @@
 
-import math
-import requests
+from startup import StartupProfile  # first, so the profile clock covers imports
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.uix.textinput import TextInput
-from kivy.uix.dropdown import DropDown
 from kivy.clock import Clock
 from kivy.metrics import dp, sp
 from kivy.core.window import Window
 
+from calccore import (
+    CURRENCIES,
+    ExpressionBuffer,
+    KeyInput,
+    LivePreview,
+    RateStore,
+    compound_interest,
+    emi,
+    simple_interest,
+)
+from calccore.tracing import follow, handoff, traced
+from event_trace import TraceRecorder
+from sampling_profiler import ProfilerToggle
+
+PROFILE = StartupProfile()  # enabled by "-- --profile-startup"
+PROFILE.mark("imports")
+
 # Global vintage color settings
 CREAM_BG = (0.98, 0.95, 0.88, 1)  # #FAF3E0
 PAPER_BG = (0.96, 0.90, 0.77, 1)  # #F5E6C4
@@ -19,10 +34,35 @@ INK_DARK = (0.36, 0.27, 0.21, 1)  # #5B4636
 BUTTON_BG = (0.55, 0.35, 0.17, 1)  # #8B5A2B
 INPUT_BG = (1.0, 0.97, 0.86, 1)  # #FFF8DC
 
+SHARED_POLL_SECONDS = 2  # how often to look for rates published by another instance
+PREVIEW_DELAY = 0.06  # typing pause (s) before the live result is refreshed
+MODES = ["Basic", "Scientific", "Financial"]
+TABS = ["Simple Interest", "Compound Interest", "Loan Calculator"]
+FIRST_FRAME_BUDGET_MS = 800  # start of the process until the calculator is usable
+PICKER_ROWS = 8  # currency rows visible at once; the rest scroll (and are recycled)
+
+# Keyboard keys (Kivy key codes) that map to calculator presses
+EDIT_KEYS = {
+    13: "=",  # Enter
+    271: "=",  # keypad Enter
+    8: "Backspace",
+    127: "Delete",
+    27: "Clear",  # Escape; handling it also keeps it from closing the app
+    276: "Left",
+    275: "Right",
+    278: "Home",
+    279: "End",
+}
+CONTROL_KEYS = {"z": "Undo", "y": "Redo"}  # with Ctrl held
+
 
 class FinancialApp(App):
     def build(self):
+        # -- --record-trace=FILE: log handler calls for event_trace.py replay
+        self.recorder = TraceRecorder.from_argv(self)
         self.title = "Python Multi-Tool – Vintage Edition"
+        # Ctrl+Shift+P: start/stop the sampling profiler (writes .folded stacks)
+        self.profiler = ProfilerToggle.install_kivy(Window)
         # Set initial window size (will be responsive)
         Window.size = (800, 600)
         Window.clearcolor = CREAM_BG
@@ -36,48 +76,105 @@ class FinancialApp(App):
         left_panel = BoxLayout(orientation="vertical", size_hint=(0.5, 1))
         right_panel = BoxLayout(orientation="vertical", size_hint=(0.5, 1))
 
-        # Add calculator and currency converter
+        # Only the calculator's Basic screen is in the first frame; the
+        # converter and the other screens follow one piece per frame.
         self.calculator = CalculatorWidget()
-        self.currency_converter = CurrencyConverterWidget()
+        self.currency_converter = None
+        self.right_panel = right_panel
+        PROFILE.mark("calculator")
 
         left_panel.add_widget(self.calculator)
-        right_panel.add_widget(self.currency_converter)
+        right_panel.add_widget(VintageLabel(text="Loading converter..."))
 
         main_layout.add_widget(left_panel)
         main_layout.add_widget(right_panel)
 
+        Window.bind(on_flip=self.on_first_frame)
         return main_layout
 
+    def on_first_frame(self, window):
+        # on_flip: the frame is on screen, so the calculator can be used
+        Window.unbind(on_flip=self.on_first_frame)
+        PROFILE.mark("first frame")
+        self.stages = self.startup_stages()
+        Clock.schedule_interval(self.next_stage, 0)
 
-class VintageButton(Button):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.background_color = BUTTON_BG
-        self.color = (1, 1, 1, 1)  # White text
-        self.font_size = sp(16)
-        self.font_name = "Roboto"  # Fallback font
-        self.bold = True
+    def startup_stages(self):
+        """Everything the first frame does without, one step per frame."""
+        self.right_panel.clear_widgets()
+        self.currency_converter = CurrencyConverterWidget()
+        self.right_panel.add_widget(self.currency_converter)
+        PROFILE.mark("converter")
+        yield
+        yield from self.calculator.prebuild()
+        PROFILE.mark("other screens")
+        PROFILE.report(budgets={"first frame": FIRST_FRAME_BUDGET_MS})
+
+    def next_stage(self, dt):
+        try:
+            next(self.stages)
+        except StopIteration:
+            return False
 
 
-class VintageLabel(Label):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.color = INK_DARK
-        self.font_size = sp(16)
-        self.font_name = "Roboto"
-        self.bold = True
+class VintageStyle:
+    """Fills in a widget's vintage look from one style dict shared by its class."""
 
+    style = {}
 
-class VintageTextInput(TextInput):
     def __init__(self, **kwargs):
+        # Passed straight to the constructor, so each property is set once
+        # (and anything the caller passes still wins)
+        for name, value in self.style.items():
+            kwargs.setdefault(name, value)
         super().__init__(**kwargs)
-        self.background_color = INPUT_BG
-        self.foreground_color = INK_DARK
-        self.font_size = sp(16)
-        self.font_name = "Roboto"
-        self.multiline = False
-        self.size_hint_y = None
-        self.height = dp(40)
+
+
+def warm_up(widget):
+    """Render the text of every label in a hidden widget tree ahead of time."""
+    for child in widget.walk():
+        if isinstance(child, Label):
+            child.texture_update()
+
+
+class VintageButton(VintageStyle, Button):
+    style = {
+        "background_color": BUTTON_BG,
+        "color": (1, 1, 1, 1),  # White text
+        "font_size": sp(16),
+        "font_name": "Roboto",  # Fallback font
+        "bold": True,
+    }
+
+
+class VintageLabel(VintageStyle, Label):
+    style = {
+        "color": INK_DARK,
+        "font_size": sp(16),
+        "font_name": "Roboto",
+        "bold": True,
+    }
+
+
+class CurrencyRow(VintageButton):
+    """One row of the recycled currency list; text and converter come from its data."""
+
+    converter = None
+
+    def on_release(self):
+        self.converter.pick_currency(self.text)
+
+
+class VintageTextInput(VintageStyle, TextInput):
+    style = {
+        "background_color": INPUT_BG,
+        "foreground_color": INK_DARK,
+        "font_size": sp(16),
+        "font_name": "Roboto",
+        "multiline": False,
+        "size_hint_y": None,
+        "height": dp(40),
+    }
 
 
 class CalculatorWidget(BoxLayout):
@@ -88,16 +185,30 @@ class CalculatorWidget(BoxLayout):
         self.spacing = dp(10)
 
         # Calculator state
-        self.expression = ""
+        self.buffer = None
         self.current_mode = "Basic"
         self.current_tab = "Simple Interest"
-        self.entries = {}
 
+        # Each mode's widget tree is built on first use and then kept, along
+        # with whatever expression was on its display.
+        self.views = {}
+        self.buffers = {}
+        self.displays = {}
+        self.previews = {}
+        self.shown_view = None
+        self.shown_mode = None
+        self.mode_dropdown = None  # built when first opened, then reused
+
+        # Keyboard input with a debounced live result under the display
+        self.keys = KeyInput()
+        self.preview = LivePreview()
+        self.preview_trigger = Clock.create_trigger(self.update_preview, PREVIEW_DELAY)
+        Window.bind(on_key_down=self.on_key_down)
+
+        self.build_header()
         self.build_ui()
 
-    def build_ui(self):
-        self.clear_widgets()
-
+    def build_header(self):
         # Header with mode selector
         header = BoxLayout(orientation="horizontal", size_hint_y=None, height=dp(50))
         header.add_widget(
@@ -113,32 +224,78 @@ class CalculatorWidget(BoxLayout):
 
         self.add_widget(header)
 
-        # Main content area
-        if self.current_mode == "Financial":
-            self.build_financial_ui()
-        else:
-            self.build_standard_ui()
+    def build_ui(self):
+        mode = self.current_mode
+        if self.shown_view is not None:
+            self.remove_widget(self.shown_view)
+
+        view = self.view_for(mode)
+        self.shown_view, self.shown_mode = view, mode
+        self.buffer = self.buffers.setdefault(mode, ExpressionBuffer())
+        if mode in self.displays:
+            self.display_input = self.displays[mode]
+            self.preview_label = self.previews[mode]
+            self.schedule_preview()
+        self.add_widget(view)
+
+    def view_for(self, mode):
+        """The widget tree of a mode, built the first time it is needed."""
+        view = self.views.get(mode)
+        if view is None:
+            view = BoxLayout(orientation="vertical", spacing=dp(10))
+            if mode == "Financial":
+                self.build_financial_ui(view)
+            else:
+                self.build_standard_ui(view, mode)
+            self.views[mode] = view
+        return view
+
+    def prebuild(self):
+        """Build the screens not on show yet, yielding after each one."""
+        for mode in MODES:
+            if mode not in self.views:
+                warm_up(self.view_for(mode))
+                yield
+        for tab in TABS:
+            if tab not in self.tab_panels:
+                warm_up(self.tab_panel(tab))
+                yield
 
     def show_mode_dropdown(self, instance):
-        dropdown = DropDown()
-        for mode in ["Basic", "Scientific", "Financial"]:
-            btn = VintageButton(text=mode, size_hint_y=None, height=dp(40))
-            btn.bind(on_release=lambda x, mode=mode: self.select_mode(mode, dropdown))
-            dropdown.add_widget(btn)
-        dropdown.open(instance)
+        if self.mode_dropdown is None:
+            from kivy.uix.dropdown import DropDown  # only needed once it is opened
+
+            dropdown = self.mode_dropdown = DropDown()
+            for mode in MODES:
+                btn = VintageButton(text=mode, size_hint_y=None, height=dp(40))
+                btn.bind(
+                    on_release=lambda x, mode=mode: self.select_mode(mode, dropdown)
+                )
+                dropdown.add_widget(btn)
+        self.mode_dropdown.open(instance)
 
+    @traced("ui.mode", "mode")
     def select_mode(self, mode, dropdown):
         self.current_mode = mode
         self.mode_btn.text = mode
         dropdown.dismiss()
         self.build_ui()
 
-    def build_standard_ui(self):
+    def build_standard_ui(self, container, mode):
         # Display
-        self.display_input = VintageTextInput(
+        display = VintageTextInput(
             text="", readonly=True, size_hint_y=None, height=dp(50), halign="right"
         )
-        self.add_widget(self.display_input)
+        self.displays[mode] = display
+        container.add_widget(display)
+
+        # Live result of what has been typed so far
+        preview_label = VintageLabel(
+            text="", size_hint_y=None, height=dp(24), font_size=sp(14), halign="right"
+        )
+        preview_label.bind(size=preview_label.setter("text_size"))
+        self.previews[mode] = preview_label
+        container.add_widget(preview_label)
 
         # Button layouts
         layouts = {
@@ -159,9 +316,9 @@ class CalculatorWidget(BoxLayout):
             ],
         }
 
-        grid = layouts[self.current_mode]
+        grid = layouts[mode]
         button_grid = GridLayout(
-            cols=5 if self.current_mode == "Scientific" else 4,
+            cols=5 if mode == "Scientific" else 4,
             spacing=dp(5),
             size_hint_y=None,
         )
@@ -170,91 +327,116 @@ class CalculatorWidget(BoxLayout):
         for row in grid:
             for char in row:
                 btn = VintageButton(text=char, size_hint_y=None, height=dp(50))
-                if char in ("Clear", "C") and self.current_mode == "Basic":
+                if char in ("Clear", "C") and mode == "Basic":
                     btn.size_hint_x = 4  # Span across all columns
                 btn.bind(on_release=lambda x, ch=char: self.press_button(ch))
                 button_grid.add_widget(btn)
 
-        self.add_widget(button_grid)
+        container.add_widget(button_grid)
 
+    @traced("ui.press", "char")
     def press_button(self, char):
-        if char in ("Clear", "C"):
-            self.expression = ""
-        elif char == "=":
-            try:
-                exp = self.expression.replace("^", "**").replace("π", str(math.pi))
-                for old, new in {
-                    "sqrt": "math.sqrt",
-                    "sin": "math.sin",
-                    "cos": "math.cos",
-                    "tan": "math.tan",
-                    "log": "math.log10",
-                    "ln": "math.log",
-                }.items():
-                    exp = exp.replace(f"{old}(", f"{new}(")
-                self.expression = str(eval(exp, {"__builtins__": None, "math": math}))
-            except Exception:
-                self.expression = "Error"
-        elif char in ("sin", "cos", "tan", "log", "ln", "sqrt"):
-            self.expression += f"{char}("
+        if self.buffer.press(char):
+            self.display_input.text = self.buffer.render()
+            self.schedule_preview()
+
+    def on_key_down(self, window, key, scancode, codepoint, modifiers):
+        # Typing into the financial or converter fields is left alone
+        if self.shown_mode == "Financial" or self.typing_elsewhere():
+            return False
+        if "ctrl" in modifiers:
+            press = CONTROL_KEYS.get(codepoint)
+            presses = [press] if press else []
+        elif key in EDIT_KEYS:
+            presses = [EDIT_KEYS[key]]
         else:
-            if self.expression == "Error":
-                self.expression = ""
-            self.expression += char
+            presses = self.keys.feed(codepoint or "")
+        if not presses:
+            return False
+        for char in presses:
+            self.press_button(char)
+        return True
+
+    def typing_elsewhere(self):
+        return any(
+            isinstance(w, TextInput) and w.focus and not w.readonly
+            for w in App.get_running_app().root.walk()
+        )
 
-        self.display_input.text = self.expression
+    def schedule_preview(self):
+        """Refresh the live result once typing pauses, not on every key."""
+        self.preview_trigger.cancel()
+        self.preview_trigger()
 
-    def build_financial_ui(self):
+    def update_preview(self, dt):
+        self.preview_label.text = self.preview.update(self.buffer.text)
+
+    def build_financial_ui(self, container):
         # Tab selector
         tab_layout = BoxLayout(
             orientation="horizontal", size_hint_y=None, height=dp(50), spacing=dp(5)
         )
-        tabs = ["Simple Interest", "Compound Interest", "Loan Calculator"]
+        self.tab_buttons = {}
 
-        for tab in tabs:
-            btn = VintageButton(text=tab, size_hint_x=1 / len(tabs))
-            if tab == self.current_tab:
-                btn.background_color = (0.7, 0.4, 0.2, 1)  # Darker for active tab
+        for tab in TABS:
+            btn = VintageButton(text=tab, size_hint_x=1 / len(TABS))
             btn.bind(on_release=lambda x, t=tab: self.select_tab(t))
             tab_layout.add_widget(btn)
+            self.tab_buttons[tab] = btn
 
-        self.add_widget(tab_layout)
-
-        # Content area
-        content = BoxLayout(orientation="vertical", spacing=dp(10))
-
-        if self.current_tab in ("Simple Interest", "Compound Interest"):
-            self.build_interest_ui(content)
-        else:
-            self.build_loan_ui(content)
+        container.add_widget(tab_layout)
 
-        self.add_widget(content)
+        # Content area: one panel per tab, built on first visit and then reused
+        self.tab_content = BoxLayout(orientation="vertical")
+        self.tab_panels = {}
+        container.add_widget(self.tab_content)
+        self.show_tab(self.current_tab)
 
+    @traced("ui.tab", "tab")
     def select_tab(self, tab):
+        self.show_tab(tab)
+
+    def show_tab(self, tab):
         self.current_tab = tab
-        self.build_ui()
+        for name, btn in self.tab_buttons.items():
+            # Darker for active tab
+            btn.background_color = (0.7, 0.4, 0.2, 1) if name == tab else BUTTON_BG
+        self.tab_content.clear_widgets()
+        self.tab_content.add_widget(self.tab_panel(tab))
+
+    def tab_panel(self, tab):
+        """A financial tab's panel, built the first time it is needed."""
+        panel = self.tab_panels.get(tab)
+        if panel is None:
+            panel = BoxLayout(orientation="vertical", spacing=dp(10))
+            if tab in ("Simple Interest", "Compound Interest"):
+                self.build_interest_ui(panel, tab)
+            else:
+                self.build_loan_ui(panel)
+            self.tab_panels[tab] = panel
+        return panel
 
-    def build_interest_ui(self, container):
+    def build_interest_ui(self, container, tab):
         form_layout = GridLayout(cols=2, spacing=dp(10), size_hint_y=None)
         form_layout.bind(minimum_height=form_layout.setter("height"))
 
         fields = ["Principal", "Rate % per year", "Time years"]
-        self.entries = {}
+        container.entries = {}
 
         for field in fields:
             form_layout.add_widget(
                 VintageLabel(text=f"{field}:", size_hint_y=None, height=dp(40))
             )
             entry = VintageTextInput()
-            self.entries[field] = entry
+            container.entries[field] = entry
             form_layout.add_widget(entry)
 
-        if self.current_tab == "Compound Interest":
+        if tab == "Compound Interest":
             form_layout.add_widget(
                 VintageLabel(text="Compounds/year:", size_hint_y=None, height=dp(40))
             )
             entry = VintageTextInput()
-            self.entries["Compounds"] = entry
+            container.entries["Compounds"] = entry
             form_layout.add_widget(entry)
 
         container.add_widget(form_layout)
@@ -265,49 +447,51 @@ class CalculatorWidget(BoxLayout):
         container.add_widget(calc_btn)
 
         # Result label
-        self.result_label = VintageLabel(
+        container.result_label = VintageLabel(
             text="",
             size_hint_y=None,
             height=dp(80),
             text_size=(None, None),
             halign="center",
         )
-        container.add_widget(self.result_label)
+        container.add_widget(container.result_label)
 
+    @traced("ui.interest")
     def calculate_interest(self):
+        panel = self.tab_panels[self.current_tab]
         try:
-            P = float(self.entries["Principal"].text)
-            R = float(self.entries["Rate % per year"].text) / 100
-            T = float(self.entries["Time years"].text)
+            P = panel.entries["Principal"].text
+            R = panel.entries["Rate % per year"].text
+            T = panel.entries["Time years"].text
 
             if self.current_tab == "Simple Interest":
-                si = P * R * T
-                self.result_label.text = (
-                    f"Simple Interest: ${si:.2f}\nTotal Amount: ${P+si:.2f}"
+                si, total = simple_interest(P, R, T)
+                panel.result_label.text = (
+                    f"Simple Interest: ${si}\nTotal Amount: ${total}"
                 )
             else:
-                n = int(self.entries["Compounds"].text)
-                amount = P * (1 + R / n) ** (n * T)
-                self.result_label.text = (
-                    f"Compound Interest: ${amount-P:.2f}\nTotal Amount: ${amount:.2f}"
+                n = int(panel.entries["Compounds"].text)
+                ci, amount = compound_interest(P, R, T, n)
+                panel.result_label.text = (
+                    f"Compound Interest: ${ci}\nTotal Amount: ${amount}"
                 )
         except Exception:
-            self.result_label.text = "Error: Enter valid numbers"
-            self.result_label.color = (1, 0, 0, 1)  # Red for error
+            panel.result_label.text = "Error: Enter valid numbers"
+            panel.result_label.color = (1, 0, 0, 1)  # Red for error
 
     def build_loan_ui(self, container):
         form_layout = GridLayout(cols=2, spacing=dp(10), size_hint_y=None)
         form_layout.bind(minimum_height=form_layout.setter("height"))
 
         fields = ["Loan Amount", "Rate % per year", "Term years"]
-        self.entries = {}
+        container.entries = {}
 
         for field in fields:
             form_layout.add_widget(
                 VintageLabel(text=f"{field}:", size_hint_y=None, height=dp(40))
             )
             entry = VintageTextInput()
-            self.entries[field] = entry
+            container.entries[field] = entry
             form_layout.add_widget(entry)
 
         container.add_widget(form_layout)
@@ -318,23 +502,23 @@ class CalculatorWidget(BoxLayout):
         container.add_widget(calc_btn)
 
         # Result label
-        self.result_label = VintageLabel(
+        container.result_label = VintageLabel(
             text="", size_hint_y=None, height=dp(60), halign="center"
         )
-        container.add_widget(self.result_label)
+        container.add_widget(container.result_label)
 
+    @traced("ui.loan")
     def calculate_loan(self):
+        panel = self.tab_panels["Loan Calculator"]
         try:
-            P = float(self.entries["Loan Amount"].text)
-            annual_rate = float(self.entries["Rate % per year"].text)
-            years = int(self.entries["Term years"].text)
-            r = (annual_rate / 100) / 12
-            n = years * 12
-            emi = P / n if r == 0 else P * (r * (1 + r) ** n) / ((1 + r) ** n - 1)
-            self.result_label.text = f"Monthly EMI: ${emi:.2f}"
+            P = panel.entries["Loan Amount"].text
+            annual_rate = panel.entries["Rate % per year"].text
+            years = int(panel.entries["Term years"].text)
+            monthly = emi(P, annual_rate, years)
+            panel.result_label.text = f"Monthly EMI: ${monthly}"
         except Exception:
-            self.result_label.text = "Error: Enter valid numbers"
-            self.result_label.color = (1, 0, 0, 1)
+            panel.result_label.text = "Error: Enter valid numbers"
+            panel.result_label.color = (1, 0, 0, 1)
 
 
 class CurrencyConverterWidget(BoxLayout):
@@ -344,34 +528,21 @@ class CurrencyConverterWidget(BoxLayout):
         self.padding = dp(10)
         self.spacing = dp(10)
 
-        self.api_url = "https://api.exchangerate-api.com/v4/latest/"
-        self.rates = {}
-        self.currencies = sorted(
-            [
-                "USD",
-                "EUR",
-                "JPY",
-                "GBP",
-                "AUD",
-                "CAD",
-                "CHF",
-                "CNY",
-                "INR",
-                "BRL",
-                "RUB",
-                "ZAR",
-                "SGD",
-                "NZD",
-                "MXN",
-                "KRW",
-            ]
-        )
+        self.store = RateStore()
+        self.currencies = list(CURRENCIES)
         self.from_currency = "USD"
         self.to_currency = "INR"
+        # One currency dropdown for both buttons, built when first opened
+        self.picker = None
+        self.currency_list = None
+        self.picking_from = True
 
         self.build_ui()
+        self.load_offline_rates()
         # Schedule rate update
         Clock.schedule_once(lambda dt: self.update_rates(), 1)
+        if self.store.shared is not None:
+            Clock.schedule_interval(self.watch_shared_rates, SHARED_POLL_SECONDS)
 
     def build_ui(self):
         # Title
@@ -463,16 +634,45 @@ class CurrencyConverterWidget(BoxLayout):
         self.show_currency_dropdown(instance, False)
 
     def show_currency_dropdown(self, instance, is_from):
-        dropdown = DropDown()
-        for currency in self.currencies:
-            btn = VintageButton(text=currency, size_hint_y=None, height=dp(40))
-            btn.bind(
-                on_release=lambda x, curr=currency: self.select_currency(
-                    curr, is_from, dropdown
-                )
+        self.picking_from = is_from
+        self.currency_picker().open(instance)
+
+    def currency_picker(self):
+        """The currency dropdown: a RecycleView, so only visible rows exist."""
+        if self.picker is None:
+            from kivy.uix.dropdown import DropDown  # only needed once it is opened
+            from kivy.uix.recycleboxlayout import RecycleBoxLayout
+            from kivy.uix.recycleview import RecycleView
+
+            rows = RecycleBoxLayout(
+                orientation="vertical",
+                default_size=(None, dp(40)),
+                default_size_hint=(1, None),
+                size_hint_y=None,
+            )
+            rows.bind(minimum_height=rows.setter("height"))
+            self.currency_list = RecycleView(
+                viewclass=CurrencyRow, size_hint_y=None, height=dp(40) * PICKER_ROWS
             )
-            dropdown.add_widget(btn)
-        dropdown.open(instance)
+            self.currency_list.add_widget(rows)
+            self.currency_list.data = self.currency_rows()
+            self.picker = DropDown()
+            self.picker.add_widget(self.currency_list)
+        return self.picker
+
+    def currency_rows(self):
+        return [{"text": code, "converter": self} for code in self.currencies]
+
+    def offer_currencies(self):
+        """Make every currency we have a rate for selectable."""
+        currencies = self.store.currencies
+        if currencies != self.currencies:
+            self.currencies = currencies
+            if self.currency_list is not None:
+                self.currency_list.data = self.currency_rows()
+
+    def pick_currency(self, currency):
+        self.select_currency(currency, self.picking_from, self.picker)
 
     def select_currency(self, currency, is_from, dropdown):
         if is_from:
@@ -485,15 +685,27 @@ class CurrencyConverterWidget(BoxLayout):
             self.to_btn.text = currency
         dropdown.dismiss()
 
+    @traced("ui.update_rates", "show_msg")
     def update_rates(self, show_msg=False):
         self.status_label.text = f"Updating rates for {self.from_currency}..."
         if show_msg:
             self.update_msg.text = ""
 
+        # Another instance on this host fetches for us; one shared table
+        # covers every base, so only a manual refresh forces a download.
+        if self.store.prefers_shared(manual=show_msg):
+            if self.load_shared_rates() and show_msg:
+                self.update_msg.text = f"✓ Using shared rates for {self.from_currency}!"
+                self.update_msg.color = (0, 0.5, 0, 1)
+                Clock.schedule_once(lambda dt: setattr(self.update_msg, "text", ""), 5)
+            return
+
         try:
             import threading
 
-            thread = threading.Thread(target=self._fetch_rates, args=(show_msg,))
+            thread = threading.Thread(
+                target=self._fetch_rates, args=(show_msg, handoff())
+            )
             thread.daemon = True
             thread.start()
         except Exception:
@@ -502,20 +714,54 @@ class CurrencyConverterWidget(BoxLayout):
                 self.update_msg.text = "✗ Failed to update rates"
                 self.update_msg.color = (1, 0, 0, 1)
 
-    def _fetch_rates(self, show_msg):
+    @traced("worker.fetch")
+    def _fetch_rates(self, show_msg, flow=None):
+        follow(flow)
         try:
-            data = requests.get(
-                f"{self.api_url}{self.from_currency}", timeout=10
-            ).json()
-            self.rates = data.get("rates", {})
+            base = self.from_currency
+            rates = self.store.fetch(base)
+            done = handoff()
+            Clock.schedule_once(lambda dt: self._store_rates(base, rates, done), 0)
             Clock.schedule_once(
-                lambda dt: self._update_ui_after_fetch(data, show_msg), 0
+                lambda dt: self._update_ui_after_fetch(rates, show_msg), 0
             )
         except Exception:
             Clock.schedule_once(lambda dt: self._update_ui_error(show_msg), 0)
 
-    def _update_ui_after_fetch(self, data, show_msg):
-        self.status_label.text = f"Rates updated: {data.get('date', '')}"
+    @traced("ui.store_rates", "base")
+    def _store_rates(self, base, rates, flow=None):
+        # Runs on the Kivy thread so convert_currency never sees a half update
+        follow(flow)
+        self.store.store(base, rates)
+        self.offer_currencies()
+
+    def load_offline_rates(self):
+        """Show the newest saved snapshot until fresh rates arrive."""
+        snapshot = self.store.load_offline(self.from_currency)
+        if snapshot is None:
+            return
+        self.offer_currencies()
+        self.status_label.text = f"Offline rates from {snapshot.date}"
+
+    def load_shared_rates(self):
+        base = self.from_currency
+        date = self.store.load_shared(base)
+        if date is None:
+            self.status_label.text = "Waiting for shared rates..."
+            return False
+        self.offer_currencies()
+        self.status_label.text = f"Rates updated: {date} (shared)"
+        return True
+
+    def watch_shared_rates(self, dt):
+        if self.store.shared_changed():
+            self.load_shared_rates()
+        elif self.store.due_for_refresh():
+            self.update_rates()
+
+    @traced("ui.rates_updated")
+    def _update_ui_after_fetch(self, rates, show_msg):
+        self.status_label.text = f"Rates updated: {rates.date}"
         if show_msg:
             self.update_msg.text = f"✓ Updated rates for {self.from_currency}!"
             self.update_msg.color = (0, 0.5, 0, 1)  # Green
@@ -527,15 +773,14 @@ class CurrencyConverterWidget(BoxLayout):
             self.update_msg.text = "✗ Failed to update rates"
             self.update_msg.color = (1, 0, 0, 1)  # Red
 
+    @traced("ui.convert")
     def convert_currency(self):
         try:
-            amount = float(self.amount_input.text)
-            rate = self.rates.get(self.to_currency)
-            if rate is None:
-                raise ValueError("Rate missing")
-            result = amount * rate
+            amount, result = self.store.convert(
+                self.amount_input.text, self.from_currency, self.to_currency
+            )
             self.result_label.text = (
-                f"{amount:.2f} {self.from_currency} = {result:.2f} {self.to_currency}"
+                f"{amount} {self.from_currency} = {result} {self.to_currency}"
             )
             self.result_label.color = INK_DARK
         except Exception:
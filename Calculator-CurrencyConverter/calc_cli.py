@@ -0,0 +1,214 @@
+import argparse
+import os
+import re
+import sys
+from collections import deque, namedtuple
+from itertools import islice
+
+from calccore import (
+    RateStore,
+    compound_interest,
+    emi,
+    evaluate,
+    simple_interest,
+)
+
+# --------------------------------------------------------------------------- #
+#  BATCH MODE: ONE CALCULATION PER LINE, STDIN TO STDOUT                      #
+# --------------------------------------------------------------------------- #
+# The front ends' maths without a window, for shell pipelines.  Fields are
+# separated by spaces or commas; every input line gives exactly one output
+# line (blank in, blank out), so results can be pasted back next to their
+# inputs.  A line that fails prints "Error" and its reason goes to stderr.
+#
+#   evaluate   2^10+sqrt(16)              ->  1028.0
+#   interest   25000 7.25 3 [PER_YEAR]    ->  5437.50<TAB>30437.50
+#              (simple interest, compound with PER_YEAR)
+#   emi        250000 8.5 20              ->  2169.56
+#   convert    100 USD EUR                ->  96.00
+#
+#   python calc_cli.py emi loans.txt
+#   generate_lines | python calc_cli.py evaluate --jobs 4 > results.txt
+#
+# Input is read CHUNK_LINES at a time and at most two chunks per process are
+# in flight, so memory stays flat however long the input is.  Conversions use
+# the saved rates (see calccore.rate_snapshot); --fetch downloads first.
+
+CHUNK_LINES = 2048
+BASE = "USD"
+
+Chunk = namedtuple("Chunk", "source first lines")  # first: line number of lines[0]
+
+_FIELDS = re.compile(r"[\s,]+")
+_store = None  # RateStore for convert, one per process
+
+
+def _fields(line, count, optional=0):
+    fields = _FIELDS.split(line)
+    if not count <= len(fields) <= count + optional:
+        expected = f"{count}" if not optional else f"{count}-{count + optional}"
+        raise ValueError(f"Expected {expected} fields, got {len(fields)}")
+    return fields
+
+
+# --------------------------------------------------------------------------- #
+#  ONE LINE EACH  (what "=", "Calculate", "Calculate EMI", "Convert" do)      #
+# --------------------------------------------------------------------------- #
+def evaluate_line(line):
+    return str(evaluate(line))
+
+
+def interest_line(line):
+    principal, rate, years, *per_year = _fields(line, 3, optional=1)
+    if per_year:
+        interest, total = compound_interest(principal, rate, years, int(per_year[0]))
+    else:
+        interest, total = simple_interest(principal, rate, years)
+    return f"{interest}\t{total}"
+
+
+def emi_line(line):
+    principal, rate, years = _fields(line, 3)
+    return str(emi(principal, rate, int(years)))
+
+
+def convert_line(line):
+    amount, from_curr, to_curr = _fields(line, 3)
+    return str(_store.convert(amount, from_curr.upper(), to_curr.upper())[1])
+
+
+KINDS = {
+    "evaluate": evaluate_line,
+    "interest": interest_line,
+    "emi": emi_line,
+    "convert": convert_line,
+}
+
+
+def load_rates(base):
+    """Make the saved rates current for convert_line in this process."""
+    global _store
+    _store = RateStore(share=False)
+    if _store.load_offline(base) is None:
+        raise SystemExit("No saved rates: run with --fetch once")
+
+
+def run_chunk(kind, lines):
+    """(output text, [(index in lines, error), ...]) for one chunk."""
+    function = KINDS[kind]
+    out, errors = [], []
+    for index, line in enumerate(lines):
+        line = line.strip()
+        if not line:
+            out.append("")
+            continue
+        try:
+            out.append(function(line))
+        except Exception as exc:  # one bad line must not take the worker down
+            out.append("Error")
+            errors.append((index, str(exc) or type(exc).__name__))
+    out.append("")
+    return "\n".join(out), errors
+
+
+# --------------------------------------------------------------------------- #
+#  STREAMING                                                                  #
+# --------------------------------------------------------------------------- #
+def read_chunks(paths, size=CHUNK_LINES):
+    """Chunks of the concatenated inputs; "-" (or no paths) is stdin."""
+    for path in paths or ["-"]:
+        if path == "-":
+            stream, source = sys.stdin, "<stdin>"
+        else:
+            stream, source = open(path, encoding="utf-8"), path
+        try:
+            first = 1
+            while True:
+                lines = list(islice(stream, size))
+                if not lines:
+                    break
+                yield Chunk(source, first, lines)
+                first += len(lines)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+def results(kind, chunks, jobs=1, base=BASE):
+    """(chunk, output, errors) in input order, computed in ``jobs`` processes."""
+    initargs = (base,) if kind == "convert" else None
+    if jobs <= 1:
+        if initargs:
+            load_rates(*initargs)
+        for chunk in chunks:
+            yield (chunk, *run_chunk(kind, chunk.lines))
+        return
+
+    import multiprocessing  # only paid for when asked
+
+    with multiprocessing.Pool(
+        jobs, initializer=load_rates if initargs else None, initargs=initargs or ()
+    ) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((chunk, pool.apply_async(run_chunk, (kind, chunk.lines))))
+            if len(pending) >= 2 * jobs:  # don't read ahead of the workers
+                chunk, job = pending.popleft()
+                yield (chunk, *job.get())
+        while pending:
+            chunk, job = pending.popleft()
+            yield (chunk, *job.get())
+
+
+def run(kind, paths, jobs=1, base=BASE, out=sys.stdout, err=sys.stderr):
+    """Process every line; the number of lines that failed."""
+    failed = 0
+    for chunk, text, errors in results(kind, read_chunks(paths), jobs, base):
+        out.write(text)
+        for index, message in errors:
+            print(f"{chunk.source}:{chunk.first + index}: {message}", file=err)
+        failed += len(errors)
+    out.flush()
+    return failed
+
+
+def fetch_rates(base):
+    """Download rates for ``base`` and save them for the workers to load."""
+    store = RateStore(share=False)
+    store.store(base, store.fetch(base))
+
+
+# --------------------------------------------------------------------------- #
+#  python calc_cli.py KIND [FILE...] [--jobs N] [--base USD] [--fetch]        #
+# --------------------------------------------------------------------------- #
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="calc_cli.py", description="One calculation per input line."
+    )
+    parser.add_argument("kind", choices=KINDS)
+    parser.add_argument("paths", nargs="*", metavar="FILE", help="default: stdin")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N")
+    parser.add_argument("--base", type=str.upper, default=BASE)
+    parser.add_argument("--fetch", action="store_true", help="download rates first")
+    return parser.parse_intermixed_args(argv)
+
+
+def main(argv):
+    args = parse_args(argv)
+    if args.fetch and args.kind == "convert":
+        try:
+            fetch_rates(args.base)
+        except (OSError, ValueError) as exc:
+            print(f"Rate download failed, using saved rates: {exc}", file=sys.stderr)
+    try:
+        failed = run(args.kind, args.paths, args.jobs, args.base)
+    except BrokenPipeError:  # e.g. piped into head: stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except KeyboardInterrupt:
+        return 130
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,399 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
+
+from calccore import (
+    API_URL,
+    RateStore,
+    compound_interest,
+    emi,
+    evaluate,
+    simple_interest,
+)
+from calccore.money import to_scaled
+from calccore.rate_snapshot import export_rates
+from calccore.shared_rates import STALE_AFTER
+
+try:
+    import orjson
+
+    _loads, _dumps = orjson.loads, orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(value):
+        return json.dumps(value, separators=(",", ":")).encode()
+
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# --------------------------------------------------------------------------- #
+#  CALCULATOR AS A LOCAL HTTP SERVICE                                         #
+# --------------------------------------------------------------------------- #
+# The evaluator, the interest and EMI formulas and the converter behind a
+# small HTTP/1.1 + JSON API, for programs that want FinancialApp's numbers
+# without its window.  Every endpoint takes a batch:
+#
+#   POST /v1/evaluate  {"expressions": ["2^10+sqrt(16)", ...]}
+#   POST /v1/interest  {"items": [{"principal": "25000", "rate": "7.25",
+#                                  "years": "3", "per_year": 12}, ...]}
+#                      (no "per_year": simple interest)
+#   POST /v1/emi       {"loans": [{"principal": "250000", "rate": "8.5",
+#                                  "years": 20}, ...]}
+#   POST /v1/convert   {"conversions": [{"amount": "100", "from": "USD",
+#                                        "to": "EUR"}, ...]}
+#   GET  /v1/rates     base, date and age of the rate cache
+#   GET  /health
+#
+# and answers {"results": [...]} in the same order, each result either the
+# values or {"error": "..."}, so one bad item does not fail its batch.  Money
+# goes out as plain decimal strings ("2169.56"), exact to the minor unit.
+#
+# One event loop serves every connection.  Requests on a keep-alive
+# connection may be pipelined; they are answered in order.  The loop itself
+# only does I/O: downloading rates and writing the snapshot run in the default
+# executor, and the maths runs on one worker thread, BATCH_CHUNK items per
+# job, so concurrent batches take turns.  The same thread installs downloaded
+# rates, so conversions never see a half-updated rate table.
+#
+#   python calc_service.py [--host 127.0.0.1] [--port 8080] [--base USD]
+
+HOST, PORT = "127.0.0.1", 8080
+BASE = "USD"
+
+MAX_HEADER = 16 * 1024  # bytes
+MAX_BODY = 4 * 1024 * 1024  # bytes
+MAX_BATCH = 10_000  # items per request
+MAX_EXPRESSION = 1000  # characters
+MAX_YEARS = 100
+MAX_PERIODS = 3000  # compounding periods (e.g. daily for 8 years)
+BATCH_CHUNK = 256  # batch items per job on the worker thread
+RETRY_SECONDS = 60  # after a failed rate download
+
+
+class RequestError(Exception):
+    """A request the service refuses as a whole; the HTTP status says why."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _batch(body, key):
+    items = body.get(key) if isinstance(body, dict) else None
+    if not isinstance(items, list):
+        raise RequestError(HTTPStatus.BAD_REQUEST, f'Expected {{"{key}": [...]}}')
+    if len(items) > MAX_BATCH:
+        raise RequestError(
+            HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"More than {MAX_BATCH} items"
+        )
+    return items
+
+
+def _field(item, name):
+    if not isinstance(item, dict) or name not in item:
+        raise ValueError(f"Missing {name!r}")
+    value = item[name]
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValueError(f"{name!r} must be a number or a string")
+    return value
+
+
+def _number(item, name):
+    """A numeric field, refused before any maths if too long or too large."""
+    value = _field(item, name)
+    to_scaled(value, 0)  # ValueError past MAX_NUMBER_LENGTH / MAX_EXPONENT
+    return value
+
+
+def _years(item):
+    years = _number(item, "years")
+    if not 0 <= float(years) <= MAX_YEARS:
+        raise ValueError(f"'years' must be between 0 and {MAX_YEARS}")
+    return years
+
+
+# --------------------------------------------------------------------------- #
+#  ONE BATCH ITEM EACH  (plain functions: no I/O, no awaiting)                #
+# --------------------------------------------------------------------------- #
+def evaluate_one(expression):
+    if not isinstance(expression, str):
+        raise ValueError("Expressions must be strings")
+    if len(expression) > MAX_EXPRESSION:
+        raise ValueError(f"Expression longer than {MAX_EXPRESSION} characters")
+    return {"result": str(evaluate(expression))}
+
+
+def interest_one(item):
+    principal, rate, years = (
+        _number(item, "principal"),
+        _number(item, "rate"),
+        _years(item),
+    )
+    if "per_year" in item:
+        per_year = int(_number(item, "per_year"))
+        if float(years) * per_year > MAX_PERIODS:
+            raise ValueError(f"More than {MAX_PERIODS} compounding periods")
+        interest, total = compound_interest(principal, rate, years, per_year)
+    else:
+        interest, total = simple_interest(principal, rate, years)
+    return {"interest": str(interest), "total": str(total)}
+
+
+def emi_one(item):
+    principal, rate, years = (
+        _number(item, "principal"),
+        _number(item, "rate"),
+        _years(item),
+    )
+    return {"emi": str(emi(principal, rate, years))}
+
+
+def run_items(function, items):
+    """``function`` of each item, or {"error": ...} where it raised."""
+    results = []
+    for item in items:
+        try:
+            results.append(function(item))
+        except Exception as exc:  # one bad item must not fail its batch
+            results.append({"error": str(exc) or type(exc).__name__})
+    return results
+
+
+# --------------------------------------------------------------------------- #
+#  THE SERVICE                                                                #
+# --------------------------------------------------------------------------- #
+class CalcService:
+    def __init__(self, base=BASE, url=None, refresh=True):
+        self.base = base
+        self.refresh = refresh
+        self.store = RateStore(url or API_URL, share=False)
+        self.worker = ThreadPoolExecutor(1, thread_name_prefix="calc-batch")
+        self.fetched_at = None  # time.time() of the last download
+        self.refresher = None  # the keep_rates_fresh() task
+        self.requests = 0
+        self.routes = {
+            ("POST", "/v1/evaluate"): self.evaluate,
+            ("POST", "/v1/interest"): self.interest,
+            ("POST", "/v1/emi"): self.emi,
+            ("POST", "/v1/convert"): self.convert,
+            ("GET", "/v1/rates"): self.rates,
+            ("GET", "/health"): self.health,
+        }
+
+    # ----------------------------------------------------------------------- #
+    async def start(self, host=HOST, port=PORT):
+        """Listen on ``host``:``port``; the server, already serving."""
+        self.store.load_offline(self.base)  # small mmap, before serving
+        if self.refresh:
+            self.refresher = asyncio.create_task(self.keep_rates_fresh())
+        return await asyncio.start_server(
+            self.serve_connection, host, port, limit=MAX_HEADER
+        )
+
+    async def update_rates(self):
+        """Download current rates without blocking the loop."""
+        loop = asyncio.get_running_loop()
+        table = await loop.run_in_executor(None, self.store.fetch, self.base)
+        install = partial(self.store.store, self.base, table, save=False)
+        await loop.run_in_executor(self.worker, install)
+        self.fetched_at = time.time()
+        await loop.run_in_executor(None, export_rates, self.base, table, table.date)
+
+    async def keep_rates_fresh(self):
+        while True:
+            try:
+                await self.update_rates()
+                delay = STALE_AFTER
+            except (OSError, ValueError) as exc:
+                print(f"Rate update failed: {exc}", file=sys.stderr)
+                delay = RETRY_SECONDS
+            await asyncio.sleep(delay)
+
+    # ----------------------------------------------------------------------- #
+    #  HTTP/1.1                                                               #
+    # ----------------------------------------------------------------------- #
+    async def serve_connection(self, reader, writer):
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break  # client closed between requests
+                except asyncio.LimitOverrunError:
+                    writer.write(self.response(431, {"error": "Headers too large"}))
+                    break
+                try:
+                    method, path, headers, keep_alive = self.parse_head(head)
+                    body = await self.read_body(reader, headers)
+                except RequestError as exc:
+                    # The body was not read, so the next request cannot be found
+                    writer.write(self.response(exc.status, {"error": str(exc)}))
+                    break
+                try:
+                    status, payload = await self.dispatch(method, path, body)
+                except RequestError as exc:
+                    status, payload = exc.status, {"error": str(exc)}
+                # Pipelined requests wait in the reader's buffer and are
+                # answered in order; drain() only waits when the client is
+                # not reading its responses
+                writer.write(self.response(status, payload, keep_alive))
+                await writer.drain()
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def parse_head(head):
+        """(method, path, headers, keep_alive) of a request head."""
+        request_line, *lines = head[:-4].decode("latin-1").split("\r\n")
+        try:
+            method, target, version = request_line.split(" ")
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Bad request line") from None
+        headers = {}
+        for line in lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.1":
+            keep_alive = connection != "close"
+        else:
+            keep_alive = connection == "keep-alive"
+        return method, target.partition("?")[0], headers, keep_alive
+
+    @staticmethod
+    async def read_body(reader, headers):
+        if "transfer-encoding" in headers:
+            raise RequestError(HTTPStatus.LENGTH_REQUIRED, "Send a Content-Length")
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Bad Content-Length") from None
+        if length > MAX_BODY:
+            raise RequestError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Body over {MAX_BODY} bytes"
+            )
+        return await reader.readexactly(length) if length > 0 else b""
+
+    @staticmethod
+    def response(status, payload, keep_alive=False):
+        body = _dumps(payload)
+        status = HTTPStatus(status)
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        return head.encode("latin-1") + body
+
+    async def dispatch(self, method, path, body):
+        self.requests += 1
+        handler = self.routes.get((method, path))
+        if handler is None:
+            if any(path == known for _, known in self.routes):
+                raise RequestError(HTTPStatus.METHOD_NOT_ALLOWED, "Wrong method")
+            raise RequestError(HTTPStatus.NOT_FOUND, f"No such endpoint: {path}")
+        if method == "POST":
+            try:
+                body = _loads(body)
+            except ValueError:
+                raise RequestError(HTTPStatus.BAD_REQUEST, "Body is not JSON") from None
+        return HTTPStatus.OK, await handler(body)
+
+    # ----------------------------------------------------------------------- #
+    #  ENDPOINTS                                                              #
+    # ----------------------------------------------------------------------- #
+    async def run_batch(self, function, items):
+        """{"results": [...]} for ``function`` over ``items``, in order."""
+        loop = asyncio.get_running_loop()
+        results = []
+        for start in range(0, len(items), BATCH_CHUNK):
+            chunk = items[start : start + BATCH_CHUNK]
+            results += await loop.run_in_executor(
+                self.worker, run_items, function, chunk
+            )
+        return {"results": results}
+
+    async def evaluate(self, body):
+        return await self.run_batch(evaluate_one, _batch(body, "expressions"))
+
+    async def interest(self, body):
+        return await self.run_batch(interest_one, _batch(body, "items"))
+
+    async def emi(self, body):
+        return await self.run_batch(emi_one, _batch(body, "loans"))
+
+    async def convert(self, body):
+        return await self.run_batch(self.convert_one, _batch(body, "conversions"))
+
+    def convert_one(self, item):
+        from_curr = str(_field(item, "from")).upper()
+        to_curr = str(_field(item, "to")).upper()
+        store = self.store
+        amount, converted = store.convert(_number(item, "amount"), from_curr, to_curr)
+        return {
+            "amount": str(amount),
+            "converted": str(converted),
+            "rate": store.rate(from_curr, to_curr),
+        }
+
+    async def rates(self, body):
+        store = self.store
+        return {
+            "base": store.base,
+            "date": getattr(store.rates, "date", None),
+            "fetched_at": self.fetched_at,
+            "currencies": store.currencies,
+        }
+
+    async def health(self, body):
+        return {"ok": True, "requests": self.requests, "rates": bool(self.store.rates)}
+
+
+# --------------------------------------------------------------------------- #
+#  python calc_service.py [--host H] [--port P] [--base USD] [--no-refresh]   #
+# --------------------------------------------------------------------------- #
+async def serve(host, port, base, refresh):
+    service = CalcService(base, refresh=refresh)
+    server = await service.start(host, port)
+    print(f"Serving on http://{host}:{port}/ (rates in {base})", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        prog="calc_service.py", description="The calculator as an HTTP/JSON service."
+    )
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--base", type=str.upper, default=BASE)
+    parser.add_argument(
+        "--no-refresh", dest="refresh", action="store_false", help="saved rates only"
+    )
+    args = parser.parse_args(argv)
+    host, port, base, refresh = args.host, args.port, args.base, args.refresh
+    if uvloop is not None:
+        uvloop.install()
+    try:
+        asyncio.run(serve(host, port, base, refresh))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,62 @@
+import importlib
+
+# --------------------------------------------------------------------------- #
+#  CALCCORE: THE CALCULATOR WITHOUT A GUI                                     #
+# --------------------------------------------------------------------------- #
+# Evaluation, editing, money and interest maths and exchange rates, shared by
+# the Tk and Kivy front ends and usable on their own.  The names below are
+# the stable API; the submodules hold the details (and their own CLIs:
+# python -m calccore.bench, python -m calccore.rate_snapshot ...).
+#
+# Submodules load on first use of one of their names, so a caller that only
+# evaluates expressions never pays for the rate code and its imports.
+
+_EXPORTS = {
+    "evaluator": (
+        "EvaluationError",
+        "KeyInput",
+        "LivePreview",
+        "calculate",
+        "evaluate",
+    ),
+    "expression_buffer": ("ExpressionBuffer",),
+    "matrix": ("MatrixError", "MatrixWorkspace", "format_result", "parse_matrix"),
+    "money": ("Money", "compound_interest", "emi", "simple_interest"),
+    "programmer": (
+        "ProgrammerError",
+        "all_digits",
+        "convert_literals",
+        "decimal_string",
+    ),
+    "rate_graph": ("RateGraph",),
+    "rate_payload": ("API_URL", "PayloadError", "RatePayloadDecoder"),
+    "rate_snapshot": ("RateTable",),
+    "rates": (
+        "CURRENCIES",
+        "FETCH_TIMEOUT",
+        "RateStore",
+        "RateUnavailable",
+        "download",
+    ),
+    "stream_stats": (
+        "NumberReader",
+        "StatsError",
+        "StreamStats",
+        "format_summary",
+    ),
+}
+_MODULE_OF = {name: module for module, names in _EXPORTS.items() for name in names}
+__all__ = sorted(_MODULE_OF)
+
+
+def __getattr__(name):
+    module = _MODULE_OF.get(name)
+    if module is None:
+        raise AttributeError(f"module 'calccore' has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | _MODULE_OF.keys())
@@ -0,0 +1,445 @@
+import argparse
+import fnmatch
+import json
+import math
+import platform
+import sys
+import time
+
+from .evaluator import _compile, calculate
+from .expression_buffer import ExpressionBuffer
+from .matrix import MatrixWorkspace, parse_matrix
+from .money import (
+    Money,
+    _emi_factor,
+    _growth_scaled,
+    compound_interest,
+    compound_total_many,
+    convert_many,
+    emi,
+    emi_many,
+    simple_interest,
+)
+from .rate_payload import RatePayloadDecoder
+from .rate_snapshot import BUNDLED_PATH, load, np
+from .programmer import all_digits, evaluate as evaluate_integer, views
+from .rates import RateStore
+from .stream_stats import StreamStats, parse_numbers
+
+# --------------------------------------------------------------------------- #
+#  MICRO-BENCHMARKS FOR THE CORE                                              #
+# --------------------------------------------------------------------------- #
+# Each benchmark is a setup function that returns the call to time; the call
+# runs ``number`` times per round (more if a round would take under 50 ms) and
+# the best of REPEAT rounds is reported, so the figures are the cost of the
+# code, not of whatever else the machine was doing.  No display or network is
+# needed (gui_bench.py adds the window construction benchmarks, which do).
+#
+# Results can be saved as a baseline and later runs compared with it.  A
+# benchmark is a regression, and makes the run exit with status 1, when it is
+# slower than its baseline by more than THRESHOLD plus the noise measured in
+# both runs (how far the median round was from the best), so a busy machine
+# widens the margin instead of raising false alarms.
+#
+#   python -m calccore.bench                          # everything
+#   python -m calccore.bench "evaluate.*"             # fnmatch patterns
+#   python -m calccore.bench --save base.json         # store a baseline
+#   python -m calccore.bench --compare base.json      # report against it
+
+REPEAT = 5
+MIN_ROUND_NS = 50_000_000  # calls per round are doubled until one takes this
+THRESHOLD = 0.10  # slowdown that counts as a regression
+BENCHMARKS = {}  # name -> (setup, number)
+
+
+class Skip(Exception):
+    """Raised by a setup whose benchmark cannot run here (e.g. no display)."""
+
+
+def bench(name, number=1000):
+    def register(setup):
+        BENCHMARKS[name] = (setup, number)
+        return setup
+
+    return register
+
+
+def _time(call, number):
+    loops = range(number)
+    start = time.perf_counter_ns()
+    for _ in loops:
+        call()
+    return time.perf_counter_ns() - start
+
+
+def run(name):
+    """(best time per call in ns, noise): noise is median / best - 1."""
+    setup, number = BENCHMARKS[name]
+    call = setup()
+    # Rounds shorter than MIN_ROUND_NS are mostly timer and scheduler noise
+    elapsed = _time(call, number)
+    while elapsed < MIN_ROUND_NS:
+        number *= 2
+        elapsed = _time(call, number)
+    rounds = sorted([elapsed] + [_time(call, number) for _ in range(REPEAT - 1)])
+    return rounds[0] / number, rounds[len(rounds) // 2] / rounds[0] - 1
+
+
+# ----------------------------------------------------------------------- #
+#  evaluator and expression buffer                                        #
+# ----------------------------------------------------------------------- #
+@bench("evaluate.cached")
+def _evaluate_cached():
+    return lambda: calculate("2^10+sqrt(16)*π-(3/4)")
+
+
+@bench("evaluate.uncached", number=200)
+def _evaluate_uncached():
+    def call():
+        _compile.cache_clear()
+        calculate("2^10+sqrt(16)*π-(3/4)")
+
+    return call
+
+
+@bench("evaluate.legacy_eval", number=200)
+def _evaluate_legacy():
+    # What "=" used to do: rewrite the text to math.xxx( calls, eval() it
+    names = {"sqrt": "math.sqrt", "sin": "math.sin", "cos": "math.cos"}
+    names.update({"tan": "math.tan", "log": "math.log10", "ln": "math.log"})
+
+    def call():
+        exp = "2^10+sqrt(16)*π-(3/4)".replace("^", "**").replace("π", str(math.pi))
+        for old, new in names.items():
+            exp = exp.replace(f"{old}(", f"{new}(")
+        try:
+            return str(eval(exp, {"__builtins__": None, "math": math}))
+        except Exception:
+            return "Error"
+
+    return call
+
+
+@bench("buffer.type_expression", number=200)
+def _buffer_typing():
+    keys = list("12.5*(3+4)") + ["sin", "π", ")", "Backspace", "="]
+
+    def call():
+        buffer = ExpressionBuffer()
+        for key in keys:
+            buffer.press(key)
+
+    return call
+
+
+# ----------------------------------------------------------------------- #
+#  money and interest                                                     #
+# ----------------------------------------------------------------------- #
+@bench("finance.simple_interest")
+def _simple_interest():
+    return lambda: simple_interest("25000", "7.25", "3")
+
+
+@bench("finance.compound_interest")
+def _compound_interest():
+    return lambda: compound_interest("25000", "7.25", "3", 12)
+
+
+@bench("finance.compound_interest.uncached", number=200)
+def _compound_interest_uncached():
+    def call():
+        _growth_scaled.cache_clear()
+        compound_interest("25000", "7.25", "30", 12)
+
+    return call
+
+
+@bench("finance.emi")
+def _emi():
+    return lambda: emi("250000", "8.5", "20")
+
+
+@bench("finance.emi.uncached", number=200)
+def _emi_uncached():
+    def call():
+        _emi_factor.cache_clear()
+        emi("250000", "8.5", "20")
+
+    return call
+
+
+def _principals():
+    return [100_000 * 100 + i for i in range(10_000)]
+
+
+@bench("finance.emi_many.10k", number=10)
+def _emi_many():
+    principals = _principals()
+    return lambda: emi_many(principals, "8.5", 20)
+
+
+@bench("finance.compound_total_many.10k", number=10)
+def _compound_many():
+    principals = _principals()
+    return lambda: compound_total_many(principals, "7.25", "3", 12)
+
+
+# ----------------------------------------------------------------------- #
+#  rates                                                                  #
+# ----------------------------------------------------------------------- #
+def _payload(base="USD"):
+    table = load(BUNDLED_PATH).rebase(base)
+    rates = {code: table[code] for code in table}
+    return json.dumps(
+        {"base": base, "date": table.date, "time_last_updated": 0, "rates": rates}
+    ).encode()
+
+
+@bench("rates.decode_payload")
+def _decode():
+    decoder, payload = RatePayloadDecoder(), _payload()
+    return lambda: decoder.decode(payload, "USD")
+
+
+def _store():
+    store = RateStore(share=False)
+    table = load(BUNDLED_PATH)
+    store.graph.update(table.base, table, table.date)
+    store.base, store.rates = table.base, table
+    return store
+
+
+@bench("rates.convert_direct")
+def _convert_direct():
+    store = _store()
+    return lambda: store.convert("1234.56", store.base, "EUR")
+
+
+@bench("rates.convert_cross")
+def _convert_cross():
+    store = _store()
+    return lambda: store.convert("1234.56", "EUR", "JPY")
+
+
+@bench("rates.convert_many.10k", number=10)
+def _convert_many():
+    amounts, rate = _principals(), _store().rate("USD", "EUR")
+    return lambda: convert_many(amounts, rate)
+
+
+@bench("money.parse_format")
+def _money():
+    return lambda: str(Money.parse("1234.56", "EUR"))
+
+
+# ----------------------------------------------------------------------- #
+#  matrix mode                                                            #
+# ----------------------------------------------------------------------- #
+def _matrix_text(rows, cols):
+    if np is None:
+        raise Skip("numpy is not installed")
+    values = np.random.default_rng(0).standard_normal((rows, cols))
+    values += np.eye(rows, cols) * rows  # well conditioned
+    return "\n".join(" ".join(map(str, row)) for row in values.tolist())
+
+
+@bench("matrix.parse.500", number=1)
+def _matrix_parse():
+    text = _matrix_text(500, 500)
+    return lambda: parse_matrix(text)
+
+
+@bench("matrix.solve.500", number=1)
+def _matrix_solve():
+    a, b = _matrix_text(500, 500), _matrix_text(500, 1)
+    return lambda: MatrixWorkspace().solve(a, b)
+
+
+@bench("matrix.solve.new_rhs.500", number=10)
+def _matrix_new_rhs():
+    """Only B edited: A's factorization is reused."""
+    a, b = _matrix_text(500, 500), _matrix_text(500, 1)
+    workspace = MatrixWorkspace()
+    workspace.solve(a, b)
+    edits = [b, b + "\n"]  # alternate so B is parsed every time
+
+    def call():
+        edits.reverse()
+        workspace.solve(a, edits[0])
+
+    return call
+
+
+@bench("matrix.eigenvalues.500", number=1)
+def _matrix_eigenvalues():
+    a = _matrix_text(500, 500)
+    return lambda: MatrixWorkspace().eigenvalues(a)
+
+
+# ----------------------------------------------------------------------- #
+#  statistics mode                                                        #
+# ----------------------------------------------------------------------- #
+@bench("stats.parse.100k", number=1)
+def _stats_parse():
+    text = _matrix_text(100_000, 1)
+    return lambda: parse_numbers(text)
+
+
+@bench("stats.add.1M", number=1)
+def _stats_add():
+    if np is None:
+        raise Skip("numpy is not installed")
+    values = np.random.default_rng(0).standard_normal(1_000_000)
+    stats = StreamStats()  # keeps growing: the cost of one more block
+    return lambda: stats.add(values)
+
+
+# ----------------------------------------------------------------------- #
+#  programmer mode                                                        #
+# ----------------------------------------------------------------------- #
+_BIG = "3 ** 210000"  # 100,196 decimal digits
+
+
+@bench("programmer.evaluate.word", number=200)
+def _programmer_word():
+    return lambda: evaluate_integer("(0xFF << 4 | 7) ^ ~0", 16, 32)
+
+
+@bench("programmer.views.100k_digits", number=20)
+def _programmer_views():
+    value = evaluate_integer(_BIG)
+    return lambda: views(value)
+
+
+@bench("programmer.all_digits.100k_digits", number=1)
+def _programmer_all_digits():
+    value = evaluate_integer(_BIG)
+    return lambda: all_digits(value, 10)
+
+
+# --------------------------------------------------------------------------- #
+#  BASELINES                                                                  #
+# --------------------------------------------------------------------------- #
+def environment():
+    """What the figures depend on besides the code."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "numpy": np.__version__ if np is not None else None,
+    }
+
+
+def save_baseline(path, results, noise):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "environment": environment(),
+                "results": results,
+                "noise": noise,
+            },
+            f,
+            indent=2,
+        )
+
+
+def load_baseline(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(baseline, results, noise, threshold=THRESHOLD):
+    """(name, baseline ns, ns, change, verdict) for every benchmark run."""
+    rows = []
+    for name, ns in results.items():
+        old = baseline["results"].get(name)
+        if old is None or ns is None:
+            rows.append((name, old, ns, None, "new" if old is None else "skipped"))
+            continue
+        change = ns / old - 1
+        margin = threshold + baseline["noise"].get(name, 0) + noise[name]
+        if change > margin:
+            verdict = "REGRESSION"
+        elif change < -margin:
+            verdict = "faster"
+        else:
+            verdict = ""
+        rows.append((name, old, ns, change, verdict))
+    return rows
+
+
+def _us(ns):
+    return f"{ns / 1000:>11.2f} us" if ns is not None else f"{'-':>14}"
+
+
+def report(rows, out=sys.stdout):
+    """Print a comparison; the number of regressions."""
+    print(f"{'benchmark':<36}{'baseline':>14}{'now':>14}{'change':>9}", file=out)
+    for name, old, ns, change, verdict in rows:
+        delta = f"{change:>+8.1%}" if change is not None else f"{'':>8}"
+        print(f"{name:<36}{_us(old)}{_us(ns)} {delta} {verdict}", file=out)
+    return sum(row[4] == "REGRESSION" for row in rows)
+
+
+# --------------------------------------------------------------------------- #
+#  python -m calccore.bench [PATTERN...] [--save F] [--compare F]             #
+# --------------------------------------------------------------------------- #
+def run_all(names, out=sys.stdout):
+    """({name: ns per call, None if skipped}, {name: noise}), printed as run."""
+    results, noise = {}, {}
+    print(f"{'benchmark':<36}{'per call':>14}{'calls/s':>14}{'noise':>8}", file=out)
+    for name in names:
+        try:
+            ns, noise[name] = run(name)
+        except Skip as exc:
+            results[name] = None
+            print(f"{name:<36}{'skipped':>14}  {exc}", file=out)
+            continue
+        results[name] = ns
+        print(
+            f"{name:<36}{ns / 1000:>11.2f} us{1e9 / ns:>14,.0f}{noise[name]:>8.1%}",
+            file=out,
+        )
+    return results, noise
+
+
+def _percent(text):
+    return float(text.rstrip("%")) / 100
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="python -m calccore.bench")
+    parser.add_argument("patterns", nargs="*", metavar="PATTERN", help="fnmatch")
+    parser.add_argument("--save", metavar="FILE", help="store a baseline")
+    parser.add_argument("--compare", metavar="FILE", help="report against one")
+    parser.add_argument(
+        "--threshold", type=_percent, default=THRESHOLD, help="e.g. 5%%"
+    )
+    args = parser.parse_intermixed_args(argv)
+    names = [
+        name
+        for name in BENCHMARKS
+        if not args.patterns or any(fnmatch.fnmatch(name, p) for p in args.patterns)
+    ]
+    if not names:
+        print(f"No benchmark matches {' '.join(args.patterns)}", file=sys.stderr)
+        return 2
+    baseline = load_baseline(args.compare) if args.compare else None
+
+    results, noise = run_all(names)
+    if args.save:
+        save_baseline(args.save, results, noise)
+        print(f"Baseline saved to {args.save}")
+    if baseline is None:
+        return 0
+    print()
+    if baseline["environment"] != environment():
+        print(f"Note: baseline recorded on {baseline['environment']}")
+    regressions = report(compare(baseline, results, noise, args.threshold))
+    print(f"{regressions} regression(s) over {args.threshold:.0%} plus noise")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
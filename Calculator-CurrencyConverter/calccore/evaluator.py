@@ -0,0 +1,183 @@
+import ast
+import math
+import warnings
+from functools import lru_cache
+
+from .tracing import traced
+
+# --------------------------------------------------------------------------- #
+#  EXPRESSION EVALUATOR                                                       #
+# --------------------------------------------------------------------------- #
+# Display text such as "2^3+sqrt(16)*π" is Python once "^" becomes "**": the
+# function names and π are looked up in a fixed namespace instead of being
+# rewritten to "math.xxx(" on every evaluation.  Only arithmetic gets that far:
+# the parsed tree may hold numbers, + - * / % ** and calls of FUNCTIONS and
+# nothing else (no attributes, lambdas, strings, lists...).  Compiled code is
+# cached by source text, so a live preview that re-evaluates while the user
+# types only compiles each distinct expression once.
+
+FUNCTIONS = {
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "sqrt": math.sqrt,
+    "log": math.log10,
+    "ln": math.log,
+}
+CONSTANTS = {"π": math.pi}
+MAX_POW_BITS = 4096  # a**b with a bigger exact integer result is refused
+
+# Typed words that stand for a button, e.g. "s", "i", "n" -> "sin"
+WORD_KEYS = {**{name: name for name in FUNCTIONS}, "pi": "π"}
+TYPED_CHARS = set("0123456789.+-*/^()π")
+
+
+class EvaluationError(ValueError):
+    pass
+
+
+def guarded_pow(base, exp):
+    """``base ** exp`` that fails fast instead of building a gigantic int."""
+    if isinstance(base, int) and isinstance(exp, int) and exp > 0 and abs(base) > 1:
+        if exp * math.log2(abs(base)) > MAX_POW_BITS:
+            raise OverflowError("Result too large")
+    return base**exp
+
+
+_NAMESPACE = {
+    "__builtins__": None,
+    **FUNCTIONS,
+    **CONSTANTS,
+    "_pow": guarded_pow,
+}
+
+
+# Everything a calculator expression's tree may contain
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Constant,
+    ast.Name,
+    ast.Call,
+    ast.Load,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.Pow,
+    ast.UAdd,
+    ast.USub,
+)
+
+# What evaluating allowed code can still raise for bad input, e.g. "1/0",
+# "sqrt(-1)", "sin(1,2)", "π(2)" or "9^9^9^9"
+_FAILURES = (ArithmeticError, ValueError, TypeError, RecursionError, MemoryError)
+
+
+def _check(tree):
+    """Raise EvaluationError unless ``tree`` is plain arithmetic."""
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise EvaluationError(f"Not allowed: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and type(node.value) not in (int, float):
+            raise EvaluationError(f"Not a number: {node.value!r}")
+        if isinstance(node, ast.Name) and node.id not in FUNCTIONS.keys() | CONSTANTS:
+            raise EvaluationError(f"Unknown name: {node.id}")
+        if isinstance(node, ast.Call) and (
+            not isinstance(node.func, ast.Name)
+            or node.func.id not in FUNCTIONS
+            or node.keywords
+        ):
+            raise EvaluationError("Only sin, cos, tan, sqrt, log and ln are callable")
+
+
+class _GuardPow(ast.NodeTransformer):
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if not isinstance(node.op, ast.Pow):
+            return node
+        call = ast.Call(ast.Name("_pow", ast.Load()), [node.left, node.right], [])
+        return ast.copy_location(call, node)
+
+
+def to_source(expression):
+    return expression.replace(" ", "").replace("^", "**")
+
+
+@lru_cache(maxsize=512)
+def _compile(source):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # e.g. "2(3)": 'int' is not callable
+        try:
+            tree = ast.parse(source, mode="eval")
+        except (SyntaxError, ValueError, RecursionError, MemoryError):
+            raise EvaluationError(f"Invalid expression: {source!r}") from None
+    _check(tree)
+    try:
+        tree = ast.fix_missing_locations(_GuardPow().visit(tree))
+        return compile(tree, "<calculator>", "eval")
+    except (RecursionError, MemoryError):  # e.g. an overlong "1+1+...+1"
+        raise EvaluationError("Expression too long") from None
+
+
+@traced("calc.evaluate", "expression")
+def evaluate(expression):
+    """Value of a calculator expression; raises EvaluationError."""
+    code = _compile(to_source(expression))
+    try:
+        return eval(code, _NAMESPACE)
+    except _FAILURES as exc:
+        raise EvaluationError(str(exc) or type(exc).__name__) from None
+
+
+def calculate(expression):
+    """What "=" puts on the display: the result, or "Error"."""
+    try:
+        return str(evaluate(expression))
+    except _FAILURES:  # also str()'s digit limit on a huge int result
+        return "Error"
+
+
+class LivePreview:
+    """Result preview that is only re-evaluated when the expression changed."""
+
+    def __init__(self):
+        self.source = None
+        self.text = ""
+
+    def update(self, expression):
+        source = to_source(expression)
+        source += ")" * (source.count("(") - source.count(")"))  # close for now
+        if source == self.source:
+            return self.text
+        self.source = source
+        try:
+            result = str(eval(_compile(source), _NAMESPACE))
+        except _FAILURES:  # EvaluationError included
+            result = ""
+        self.text = f"= {result}" if result and result != expression else ""
+        return self.text
+
+
+class KeyInput:
+    """Turns typed characters into calculator button presses."""
+
+    def __init__(self):
+        self.word = ""  # letters of a function name typed so far
+
+    def feed(self, char):
+        """Button presses for one typed character (usually zero or one)."""
+        if char.isalpha() and char not in CONSTANTS:
+            word = self.word + char.lower()
+            if word in WORD_KEYS:
+                self.word = ""
+                return [WORD_KEYS[word]]
+            self.word = word if any(k.startswith(word) for k in WORD_KEYS) else ""
+            return []
+        self.word = ""
+        if char == "=":
+            return ["="]
+        return [char] if char in TYPED_CHARS else []
@@ -0,0 +1,296 @@
+import re
+
+from .evaluator import FUNCTIONS, calculate
+
+# --------------------------------------------------------------------------- #
+#  TOKEN EXPRESSION BUFFER                                                    #
+# --------------------------------------------------------------------------- #
+# The display is a list of tokens: numbers ("12.5"), operators, brackets, "π"
+# and functions together with their bracket ("sin(").  The tokens before the
+# cursor and the tokens after it live on two stacks (a gap buffer), so typing,
+# backspace and moving the cursor only touch the top of a stack.
+#
+# Each token before the cursor also records the bracket depth after it, and
+# the bracket balance of the tokens after the cursor is kept as a running
+# sum: the parse state is updated per edit instead of re-scanning the text.
+#
+# Every edit is a small list of push/pop/replace steps, which is what undo
+# and redo replay.
+
+NUMBER, OPERATOR, OPEN, CLOSE, FUNCTION, CONSTANT, VALUE = range(7)
+
+_TOKEN = re.compile(
+    r"(?:\d+\.?\d*|\.\d+)(?:e[+-]?\d+)?|(?:%s)\(|[-+*/^()π]"
+    % "|".join(sorted(FUNCTIONS, key=len, reverse=True))
+)
+MAX_UNDO = 500
+CARET = "▏"
+
+
+def kind(token):
+    first = token[0]
+    if first.isdigit() or first == ".":
+        return NUMBER
+    if token == "(":
+        return OPEN
+    if token == ")":
+        return CLOSE
+    if token == "π":
+        return CONSTANT
+    if token.endswith("("):
+        return FUNCTION
+    if token in ("+", "-", "*", "/", "^"):
+        return OPERATOR
+    return VALUE  # a result we cannot edit, e.g. "Error"
+
+
+def _balance(token):
+    k = kind(token)
+    return 1 if k in (OPEN, FUNCTION) else -1 if k == CLOSE else 0
+
+
+def tokenize(text):
+    """Tokens for ``text``; anything unrecognised becomes one VALUE token."""
+    text = text.replace(" ", "")
+    tokens, pos = [], 0
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if match is None:
+            return [text]
+        tokens.append(match.group())
+        pos = match.end()
+    return tokens
+
+
+class ExpressionBuffer:
+    def __init__(self, text=""):
+        self._left = []  # tokens before the cursor
+        self._depths = []  # bracket depth after each token in _left
+        self._right = []  # tokens after the cursor, nearest last
+        self._right_balance = 0
+        self._left_chars = 0
+        self._text = None  # cached display text
+        self._undo = []
+        self._redo = []
+        self._action = None
+        if text:
+            self._record(lambda: self._insert_all(tokenize(text)))
+            self._undo.clear()
+
+    # ----------------------------------------------------------------------- #
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = "".join(self._left) + "".join(reversed(self._right))
+        return self._text
+
+    @property
+    def cursor(self):
+        """Cursor position in characters."""
+        return self._left_chars
+
+    @property
+    def depth(self):
+        """Brackets still open at the end of the expression."""
+        return (self._depths[-1] if self._depths else 0) + self._right_balance
+
+    @property
+    def tokens(self):
+        return self._left + self._right[::-1]
+
+    def render(self):
+        """Display text, with a caret when the cursor is not at the end."""
+        if not self._right:
+            return self.text
+        return "".join(self._left) + CARET + "".join(reversed(self._right))
+
+    def __len__(self):
+        return len(self._left) + len(self._right)
+
+    def __str__(self):
+        return self.text
+
+    # ----------------------------------------------------------------------- #
+    def press(self, key):
+        """Apply a calculator button or editing key; False if it was ignored."""
+        if key in ("Clear", "C"):
+            return self._record(self._clear)
+        if key == "=":
+            result = tokenize(calculate(self.text))
+            return self._record(lambda: (self._clear(), self._insert_all(result)))
+        if key in _MOVES:
+            return _MOVES[key](self)
+        if key == "Undo":
+            return self.undo()
+        if key == "Redo":
+            return self.redo()
+        if key == "Backspace":
+            return self._record(self._backspace)
+        if key == "Delete":
+            return self._record(self._delete)
+        if key in FUNCTIONS:
+            key += "("
+        elif key != "." and not _TOKEN.fullmatch(key):  # "." starts a number
+            return False
+        return self._record(lambda: self._type(key))
+
+    def move(self, steps):
+        """Move the cursor by whole tokens (negative is left)."""
+        moved = False
+        while steps < 0 and self._left:
+            self._shift_right()
+            steps += 1
+            moved = True
+        while steps > 0 and self._right:
+            self._shift_left()
+            steps -= 1
+            moved = True
+        return moved
+
+    def home(self):
+        return self.move(-len(self._left))
+
+    def end(self):
+        return self.move(len(self._right))
+
+    def undo(self):
+        if not self._undo:
+            return False
+        action = self._undo.pop()
+        for step in reversed(action):
+            self._replay(step, inverse=True)
+        self._redo.append(action)
+        return True
+
+    def redo(self):
+        if not self._redo:
+            return False
+        action = self._redo.pop()
+        for step in action:
+            self._replay(step, inverse=False)
+        self._undo.append(action)
+        return True
+
+    # ----------------------------------------------------------------------- #
+    #  edits, built from _push/_pop/_replace so they can be undone            #
+    # ----------------------------------------------------------------------- #
+    def _record(self, edit):
+        self._action = []
+        edit()
+        action, self._action = self._action, None
+        if not action:
+            return False
+        self._undo.append(action)
+        if len(self._undo) > MAX_UNDO:
+            del self._undo[0]
+        self._redo.clear()
+        return True
+
+    def _type(self, token):
+        if self._left and kind(self._left[-1]) == VALUE:
+            self._clear()  # typing over "Error" or another opaque result
+        top = self._left[-1] if self._left else None
+        if kind(token) == NUMBER and top is not None and kind(top) == NUMBER:
+            if token == "." and "." in top:
+                return
+            self._replace(top + token)
+        else:
+            self._push(token)
+
+    def _insert_all(self, tokens):
+        for token in tokens:
+            self._push(token)
+
+    def _backspace(self):
+        if not self._left:
+            return
+        top = self._left[-1]
+        if kind(top) == NUMBER and len(top) > 1:
+            self._replace(top[:-1])
+        else:
+            self._pop()
+
+    def _delete(self):
+        if self._right:
+            self._shift_left()
+            self._pop()
+
+    def _clear(self):
+        self.end()
+        while self._left:
+            self._pop()
+
+    # ----------------------------------------------------------------------- #
+    #  primitive steps: (op, position, old token, new token)                  #
+    # ----------------------------------------------------------------------- #
+    def _push(self, token):
+        self._apply_push(token)
+        self._action.append(("push", len(self._left), None, token))
+
+    def _pop(self):
+        token = self._left[-1]
+        self._apply_pop()
+        self._action.append(("pop", len(self._left) + 1, token, None))
+
+    def _replace(self, token):
+        old = self._left[-1]
+        self._apply_pop()
+        self._apply_push(token)
+        self._action.append(("replace", len(self._left), old, token))
+
+    def _replay(self, step, inverse):
+        op, position, old, new = step
+        if op == "push":
+            op = "pop" if inverse else "push"
+        elif op == "pop":
+            op = "push" if inverse else "pop"
+        elif inverse:
+            old, new = new, old
+        # every step acts on the token just before ``position``
+        target = position - 1 if op == "push" else position
+        self.move(target - len(self._left))
+        if op == "push":
+            self._apply_push(old if inverse else new)
+        elif op == "pop":
+            self._apply_pop()
+        else:
+            self._apply_pop()
+            self._apply_push(new)
+
+    def _apply_push(self, token):
+        depth = self._depths[-1] if self._depths else 0
+        self._left.append(token)
+        self._depths.append(depth + _balance(token))
+        self._left_chars += len(token)
+        self._text = None
+
+    def _apply_pop(self):
+        token = self._left.pop()
+        self._depths.pop()
+        self._left_chars -= len(token)
+        self._text = None
+        return token
+
+    # cursor moves don't change the text, so they don't invalidate _text
+    def _shift_left(self):
+        token = self._right.pop()
+        self._right_balance -= _balance(token)
+        depth = self._depths[-1] if self._depths else 0
+        self._left.append(token)
+        self._depths.append(depth + _balance(token))
+        self._left_chars += len(token)
+
+    def _shift_right(self):
+        token = self._left.pop()
+        self._depths.pop()
+        self._left_chars -= len(token)
+        self._right.append(token)
+        self._right_balance += _balance(token)
+
+
+_MOVES = {
+    "Left": lambda b: b.move(-1),
+    "Right": lambda b: b.move(1),
+    "Home": ExpressionBuffer.home,
+    "End": ExpressionBuffer.end,
+}
@@ -0,0 +1,44 @@
+import importlib.util
+import sys
+
+_pending = set()  # names made lazy whose code has not run yet
+
+
+class _Announcing:
+    """Loader wrapper that notes when a lazy module really executes."""
+
+    def __init__(self, loader):
+        self.loader = loader
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Step aside first: the executed module should only see its own loader
+        module.__spec__.loader = module.__loader__ = self.loader
+        self.loader.exec_module(module)
+        _pending.discard(module.__name__)
+
+
+def lazy_import(name):
+    """Module that only really loads on first attribute access; None if absent."""
+    if name in sys.modules:
+        return sys.modules[name]
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None:
+        return None
+    loader = importlib.util.LazyLoader(_Announcing(spec.loader))
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    _pending.add(name)
+    loader.exec_module(module)
+    return module
+
+
+def is_loaded(name):
+    """True once module ``name`` has actually executed (lazy or not)."""
+    return name in sys.modules and name not in _pending
@@ -0,0 +1,182 @@
+import warnings
+
+from .lazy import lazy_import
+from .tracing import traced
+
+# Loaded when the Matrix mode is first used
+np = lazy_import("numpy")
+
+# --------------------------------------------------------------------------- #
+#  MATRIX MODE MATHS                                                          #
+# --------------------------------------------------------------------------- #
+# Matrices are typed or pasted as text, one row per line (or separated by
+# ";"), entries separated by spaces or commas.  Everything is computed by
+# NumPy, i.e. by BLAS / LAPACK.
+#
+# A MatrixWorkspace keeps the last parsed text of each operand together with
+# what has been computed from it (inverse, determinant, eigenvalues, the
+# factorization used for solving).  Solving A x = B again after editing only
+# B re-parses B and reuses A's factorization: O(n^2) instead of O(n^3).
+
+SHOWN_ITEMS = 100  # larger results are summarized with "..."
+EDGE_ITEMS = 3
+PRECISION = 6
+
+
+class MatrixError(ValueError):
+    pass
+
+
+def parse_matrix(text):
+    """float64 array from rows of numbers; MatrixError if it is not one."""
+    rows = [row for row in text.replace(";", "\n").splitlines() if row.strip()]
+    if not rows:
+        raise MatrixError("Enter a matrix, one row per line")
+    cells = [row.replace(",", " ").split() for row in rows]
+    width = len(cells[0])
+    for number, row in enumerate(cells, 1):
+        if len(row) != width:
+            raise MatrixError(f"Row {number} has {len(row)} entries, not {width}")
+    try:
+        return np.array(cells, dtype=np.float64)
+    except ValueError:
+        raise MatrixError("Entries must be numbers") from None
+
+
+def shape_text(array):
+    return "×".join(str(n) for n in array.shape) if array.ndim else "scalar"
+
+
+def format_result(value, precision=PRECISION):
+    """Display text for a result array or number, summarized when large."""
+    if np.ndim(value) == 0:
+        number = complex(value) if np.iscomplexobj(value) else float(value)
+        return f"{number:.{precision}g}"
+    return np.array2string(
+        np.asarray(value),
+        precision=precision,
+        suppress_small=True,
+        threshold=SHOWN_ITEMS,
+        edgeitems=EDGE_ITEMS,
+        max_line_width=72,
+    )
+
+
+def _lu_factor():
+    """scipy.linalg's (lu_factor, lu_solve) if SciPy is installed, else None."""
+    try:
+        from scipy.linalg import lu_factor, lu_solve
+    except ImportError:
+        return None
+    return lu_factor, lu_solve
+
+
+class Operand:
+    """One operand's text, its array and the results derived from it."""
+
+    def __init__(self, text):
+        self.text = text
+        self.array = parse_matrix(text)
+        self.derived = {}
+
+    def square(self, what):
+        rows, cols = self.array.shape
+        if rows != cols:
+            raise MatrixError(f"{what} needs a square matrix, not {rows}×{cols}")
+        return self.array
+
+    def cached(self, key, compute):
+        if key not in self.derived:
+            self.derived[key] = compute()
+        return self.derived[key]
+
+
+class MatrixWorkspace:
+    def __init__(self):
+        self.operands = {}  # name ("A", "B") -> Operand of its current text
+
+    def operand(self, name, text):
+        operand = self.operands.get(name)
+        if operand is None or operand.text != text:
+            operand = self.operands[name] = Operand(text)
+        return operand
+
+    # ----------------------------------------------------------------------- #
+    @traced("matrix.multiply")
+    def multiply(self, a_text, b_text):
+        a, b = self.operand("A", a_text).array, self.operand("B", b_text).array
+        if a.shape[1] != b.shape[0]:
+            raise MatrixError(f"Cannot multiply {shape_text(a)} by {shape_text(b)}")
+        return a @ b
+
+    @traced("matrix.inverse")
+    def inverse(self, a_text):
+        a = self.operand("A", a_text)
+        a.square("Inverse")
+        return a.cached("inverse", lambda: _singular(np.linalg.inv, a.array))
+
+    @traced("matrix.determinant")
+    def determinant(self, a_text):
+        a = self.operand("A", a_text)
+        a.square("Determinant")
+
+        def compute():
+            sign, logdet = np.linalg.slogdet(a.array)
+            return sign * np.exp(logdet)
+
+        return a.cached("determinant", compute)
+
+    @traced("matrix.eigenvalues")
+    def eigenvalues(self, a_text):
+        a = self.operand("A", a_text)
+        a.square("Eigenvalues")
+
+        def compute():
+            array = a.array
+            if np.array_equal(array, array.T):
+                return np.linalg.eigvalsh(array)  # real, ascending, faster
+            values = np.linalg.eigvals(array)
+            if np.iscomplex(values).any():
+                return np.sort_complex(values)
+            return np.sort(values.real)
+
+        return a.cached("eigenvalues", compute)
+
+    @traced("matrix.solve")
+    def solve(self, a_text, b_text):
+        """x with A x = B; A's factorization is kept for the next B."""
+        a = self.operand("A", a_text)
+        n = len(a.square("Solving"))
+        b = self.operand("B", b_text).array
+        if b.shape[0] == 1 and b.shape[1] == n:
+            b = b.T  # a right-hand side typed as one row
+        if b.shape[0] != n:
+            raise MatrixError(f"B needs {n} rows to solve with a {n}×{n} A")
+        if not np.isfinite(a.array).all():
+            raise MatrixError("A must not contain inf or nan")  # on either path
+        lu = _lu_factor()
+        if lu is not None:
+            lu_factor, lu_solve = lu
+            factors = a.cached("lu", lambda: _lu_checked(lu_factor, a.array))
+            return lu_solve(factors, b)
+        # No SciPy: the inverse is the reusable factorization
+        return a.cached("inverse", lambda: _singular(np.linalg.inv, a.array)) @ b
+
+
+def _lu_checked(lu_factor, array):
+    """lu_factor's result, or MatrixError where np.linalg.inv would fail."""
+    # LAPACK reports an exactly zero pivot; NumPy raises on it, SciPy only
+    # warns and then solves to inf/nan
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        lu, piv = lu_factor(array)
+    if not np.diag(lu).all():
+        raise MatrixError("The matrix is singular")
+    return lu, piv
+
+
+def _singular(function, array):
+    try:
+        return function(array)
+    except np.linalg.LinAlgError:
+        raise MatrixError("The matrix is singular") from None
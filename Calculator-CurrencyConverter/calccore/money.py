@@ -0,0 +1,362 @@
+import math
+import re
+from functools import lru_cache
+
+from .lazy import lazy_import
+from .tracing import traced
+
+# Loaded on first bulk call; the bulk helpers fall back to plain Python ints
+np = lazy_import("numpy")
+
+# --------------------------------------------------------------------------- #
+#  FIXED-POINT MONEY                                                          #
+# --------------------------------------------------------------------------- #
+# Amounts are integers in minor units (cents), rates are integers scaled by
+# 10**RATE_DIGITS.  Every result is rounded exactly once, with an explicit
+# rounding mode, so the same inputs give the same cents on every machine.
+
+ROUND_HALF_EVEN = "half_even"
+ROUND_HALF_UP = "half_up"  # ties away from zero
+ROUND_DOWN = "down"  # toward zero
+ROUND_UP = "up"  # away from zero
+ROUND_FLOOR = "floor"
+ROUND_CEILING = "ceiling"
+
+MINOR_DIGITS = 2
+RATE_DIGITS = 8
+FACTOR_DIGITS = 15  # growth factors in the bulk interest kernels
+
+# Input bounds: amounts and rates are parsed exactly, so "1e10000000" would
+# otherwise be a ten-million-digit integer, and daily compounding over a
+# thousand years a multi-megabyte one.  Both raise ValueError instead.
+MAX_NUMBER_LENGTH = 64  # characters of a number's text
+MAX_EXPONENT = 64  # |e| in "1.5e3"
+MAX_FACTOR_BITS = 1 << 21  # size of an interest / EMI factor's numerator
+FACTOR_CACHE = 64  # cached interest / EMI factors of each kind
+
+# ISO 4217 currencies without a minor unit
+ZERO_DECIMAL = {"JPY", "KRW", "ISK", "CLP", "VND", "XAF", "XOF", "UGX", "PYG"}
+
+_NUMBER = re.compile(r"^\s*([+-]?)(\d*)(?:\.(\d*))?(?:[eE]([+-]?\d+))?\s*$")
+_MAX_EXACT = 2**52
+
+
+def minor_digits(currency):
+    return 0 if currency in ZERO_DECIMAL else MINOR_DIGITS
+
+
+def round_div(num, den, rounding=ROUND_HALF_EVEN):
+    """Divide two ints and round the quotient with ``rounding``."""
+    if den < 0:
+        num, den = -num, -den
+    q, r = divmod(num, den)  # floor division, 0 <= r < den
+    if r == 0 or rounding == ROUND_FLOOR:
+        return q
+    if rounding == ROUND_CEILING:
+        return q + 1
+    if rounding == ROUND_DOWN:
+        return q + 1 if q < 0 else q
+    if rounding == ROUND_UP:
+        return q if q < 0 else q + 1
+    twice = 2 * r
+    if twice != den:
+        return q + 1 if twice > den else q
+    if rounding == ROUND_HALF_UP:
+        return q if q < 0 else q + 1
+    if rounding == ROUND_HALF_EVEN:
+        return q + (q & 1)
+    raise ValueError(f"Unknown rounding mode: {rounding}")
+
+
+def to_scaled(value, digits, rounding=ROUND_HALF_EVEN):
+    """Convert a str/int/float to an int scaled by ``10**digits``.
+
+    Floats go through their shortest repr, so ``0.1`` means exactly 0.1 and
+    not the nearest binary fraction.
+    """
+    if isinstance(value, int):
+        return value * 10**digits
+    if isinstance(value, float):
+        value = repr(value)
+    text = str(value)
+    if len(text) > MAX_NUMBER_LENGTH:
+        raise ValueError(f"Number longer than {MAX_NUMBER_LENGTH} characters")
+    match = _NUMBER.match(text)
+    if not match or not (match.group(2) or match.group(3)):
+        raise ValueError(f"Not a number: {value!r}")
+    sign, whole, frac, exp = match.groups()
+    frac = frac or ""
+    exp = int(exp or 0)
+    if abs(exp) > MAX_EXPONENT:
+        raise ValueError(f"Exponent beyond ±{MAX_EXPONENT}: {value!r}")
+    mantissa = int((whole or "0") + frac)
+    shift = digits - len(frac) + exp
+    if sign == "-":
+        mantissa = -mantissa
+    if shift >= 0:
+        return mantissa * 10**shift
+    return round_div(mantissa, 10**-shift, rounding)
+
+
+class Money:
+    __slots__ = ("minor", "currency", "digits")
+
+    def __init__(self, minor, currency="", digits=None):
+        self.minor = int(minor)
+        self.currency = currency
+        self.digits = minor_digits(currency) if digits is None else digits
+
+    @classmethod
+    def parse(cls, value, currency="", rounding=ROUND_HALF_EVEN):
+        digits = minor_digits(currency)
+        return cls(to_scaled(value, digits, rounding), currency, digits)
+
+    # ----------------------------------------------------------------------- #
+    def convert(self, rate, to_currency="", rounding=ROUND_HALF_EVEN):
+        """Convert at ``rate`` (units of ``to_currency`` per unit of self)."""
+        scaled = to_scaled(rate, RATE_DIGITS)
+        digits = minor_digits(to_currency)
+        num = self.minor * scaled * 10**digits
+        den = 10 ** (RATE_DIGITS + self.digits)
+        return Money(round_div(num, den, rounding), to_currency, digits)
+
+    def _same(self, other):
+        if not isinstance(other, Money):
+            return NotImplemented
+        if (other.currency, other.digits) != (self.currency, self.digits):
+            raise ValueError("Cannot mix currencies")
+        return other
+
+    def __add__(self, other):
+        other = self._same(other)
+        if other is NotImplemented:
+            return other
+        return Money(self.minor + other.minor, self.currency, self.digits)
+
+    def __sub__(self, other):
+        other = self._same(other)
+        if other is NotImplemented:
+            return other
+        return Money(self.minor - other.minor, self.currency, self.digits)
+
+    def __neg__(self):
+        return Money(-self.minor, self.currency, self.digits)
+
+    def __eq__(self, other):
+        if not isinstance(other, Money):
+            return NotImplemented
+        return (self.minor, self.currency, self.digits) == (
+            other.minor,
+            other.currency,
+            other.digits,
+        )
+
+    def __lt__(self, other):
+        return self.minor < self._same(other).minor
+
+    def __hash__(self):
+        return hash((self.minor, self.currency, self.digits))
+
+    def __str__(self):
+        sign = "-" if self.minor < 0 else ""
+        whole, frac = divmod(abs(self.minor), 10**self.digits)
+        if not self.digits:
+            return f"{sign}{whole}"
+        return f"{sign}{whole}.{frac:0{self.digits}d}"
+
+    def __repr__(self):
+        return f"Money({str(self)!r}, {self.currency!r})"
+
+
+# --------------------------------------------------------------------------- #
+#  INTEREST / LOANS  (exact rationals, rounded once)                          #
+# --------------------------------------------------------------------------- #
+@traced("calc.simple_interest", "principal", "rate_pct", "years")
+def simple_interest(principal, rate_pct, years, rounding=ROUND_HALF_EVEN):
+    """Return (interest, total) for P * R% * T."""
+    p = principal if isinstance(principal, Money) else Money.parse(principal)
+    r = to_scaled(rate_pct, RATE_DIGITS)
+    t = to_scaled(years, RATE_DIGITS)
+    si = Money(
+        round_div(p.minor * r * t, 100 * 10 ** (2 * RATE_DIGITS), rounding),
+        p.currency,
+        p.digits,
+    )
+    return si, p + si
+
+
+# The factors below are the expensive part (big-int powers) and depend only
+# on rate and term, which repeat across a batch or a session: they are cached
+# by their scaled integer inputs.  An entry is a few KB for everyday terms but
+# up to 2 * MAX_FACTOR_BITS (about 0.5 MB) for long, frequent compounding, so
+# the caches stay small: FACTOR_CACHE entries each, at most ~32 MB.
+
+
+def _check_factor(base, periods):
+    if periods * base.bit_length() > MAX_FACTOR_BITS:
+        raise ValueError("Too many periods for this rate")
+
+
+def _growth(rate_pct, per_year, years):
+    if per_year <= 0:
+        raise ValueError("Compounds per year must be positive")
+    return _growth_scaled(
+        to_scaled(rate_pct, RATE_DIGITS), per_year, to_scaled(years, RATE_DIGITS)
+    )
+
+
+@lru_cache(maxsize=FACTOR_CACHE)
+def _growth_scaled(r, per_year, t):
+    # (1 + r/n) ** (n*T) as an exact fraction (num, den).  Whole compounding
+    # periods are exact; a trailing fractional period (e.g. 2.5 years
+    # compounded yearly) is a float factor rounded to FACTOR_DIGITS.
+    unit = 100 * per_year * 10**RATE_DIGITS
+    periods, frac = divmod(t * per_year, 10**RATE_DIGITS)
+    _check_factor(unit + r, periods)
+    num, den = (unit + r) ** periods, unit**periods
+    if frac:
+        scale = 10**FACTOR_DIGITS
+        num *= round((1 + r / unit) ** (frac / 10**RATE_DIGITS) * scale)
+        den *= scale
+    return num, den
+
+
+@traced("calc.compound_interest", "principal", "rate_pct", "years", "per_year")
+def compound_interest(principal, rate_pct, years, per_year, rounding=ROUND_HALF_EVEN):
+    """Return (interest, total) for P * (1 + R/n) ** (n*T)."""
+    p = principal if isinstance(principal, Money) else Money.parse(principal)
+    num, den = _growth(rate_pct, int(per_year), years)
+    total = Money(round_div(p.minor * num, den, rounding), p.currency, p.digits)
+    return total - p, total
+
+
+@traced("calc.emi", "principal", "annual_rate_pct", "years")
+def emi(principal, annual_rate_pct, years, rounding=ROUND_HALF_EVEN):
+    """Monthly instalment P * r(1+r)^n / ((1+r)^n - 1), r = R/12, n = 12*T."""
+    p = principal if isinstance(principal, Money) else Money.parse(principal)
+    n = int(years) * 12
+    if n <= 0:
+        raise ValueError("Term must be at least one year")
+    r = to_scaled(annual_rate_pct, RATE_DIGITS)
+    if r == 0:
+        return Money(round_div(p.minor, n, rounding), p.currency, p.digits)
+    num, div = _emi_factor(r, n)
+    return Money(round_div(p.minor * num, div, rounding), p.currency, p.digits)
+
+
+@lru_cache(maxsize=FACTOR_CACHE)
+def _emi_factor(r, n):
+    # EMI per unit of principal, r(1+r)^n / ((1+r)^n - 1), as (num, den)
+    den = 1200 * 10**RATE_DIGITS  # monthly rate = r / den
+    _check_factor(den + r, n)
+    growth = (den + r) ** n
+    return r * growth, den * (growth - den**n)
+
+
+# --------------------------------------------------------------------------- #
+#  BULK KERNELS  (NumPy int64)                                                #
+# --------------------------------------------------------------------------- #
+# a * f // S is computed without 128-bit ints: a float estimate of the
+# quotient is corrected with the exact remainder, which int64 gets right
+# modulo 2**64 and is small enough to be exact as long as the quotient stays
+# below 2**52.  Anything larger falls back to Python ints.
+
+
+def _round_array(q, r, den, rounding):
+    # q, r from floor division, 0 <= r < den
+    if rounding == ROUND_FLOOR:
+        return q
+    if rounding == ROUND_CEILING:
+        return q + (r > 0)
+    if rounding == ROUND_DOWN:
+        return q + ((r > 0) & (q < 0))
+    if rounding == ROUND_UP:
+        return q + ((r > 0) & (q >= 0))
+    twice = 2 * r
+    up = twice > den
+    tie = twice == den
+    if rounding == ROUND_HALF_UP:
+        return q + (up | (tie & (q >= 0)))
+    if rounding == ROUND_HALF_EVEN:
+        return q + (up | (tie & (q % 2 == 1)))
+    raise ValueError(f"Unknown rounding mode: {rounding}")
+
+
+def mul_div_many(values, factor, den, rounding=ROUND_HALF_EVEN):
+    """Round(values * factor / den) element-wise, exactly, as a list of ints."""
+    if np is None:
+        return [round_div(int(v) * int(factor), den, rounding) for v in values]
+    return _mul_div_array(values, factor, den, rounding).tolist()
+
+
+def _mul_div_array(values, factor, den, rounding):
+    a = np.asarray(values, dtype=np.int64)
+    f = np.asarray(factor, dtype=np.int64)
+    if den >= 2**62 or not a.size:
+        return _mul_div_python(a, f, den, rounding)
+    a_max = float(np.abs(a).max())
+    f_max = float(np.abs(f).max())
+    if a_max * f_max / den >= _MAX_EXACT or f_max >= 2**62:
+        return _mul_div_python(a, f, den, rounding)
+    with np.errstate(over="ignore"):
+        prod = a * f  # wraps modulo 2**64
+        q = np.floor(a.astype(np.float64) * (f.astype(np.float64) / den))
+        q = q.astype(np.int64)
+        r = prod - q * den
+    fix = np.floor_divide(r, den)
+    q += fix
+    r -= fix * den
+    return _round_array(q, r, den, rounding)
+
+
+def _mul_div_python(a, f, den, rounding):
+    f = np.broadcast_to(f, a.shape)
+    out = [round_div(int(x) * int(y), den, rounding) for x, y in zip(a.flat, f.flat)]
+    return np.array(out, dtype=object).reshape(a.shape)  # may exceed int64
+
+
+def convert_many(
+    amounts_minor,
+    rate,
+    from_digits=MINOR_DIGITS,
+    to_digits=MINOR_DIGITS,
+    rounding=ROUND_HALF_EVEN,
+):
+    """Convert an array of minor-unit amounts at a single ``rate``."""
+    scaled = to_scaled(rate, RATE_DIGITS) * 10**to_digits
+    den = 10 ** (RATE_DIGITS + from_digits)
+    common = math.gcd(scaled, den)
+    return mul_div_many(amounts_minor, scaled // common, den // common, rounding)
+
+
+def simple_interest_many(principals_minor, rate_pct, years, rounding=ROUND_HALF_EVEN):
+    """Interest in minor units for each principal (rate and term shared)."""
+    factor = to_scaled(rate_pct, RATE_DIGITS) * to_scaled(years, RATE_DIGITS)
+    den = 100 * 10 ** (2 * RATE_DIGITS)
+    common = math.gcd(factor, den)
+    return mul_div_many(principals_minor, factor // common, den // common, rounding)
+
+
+def compound_total_many(
+    principals_minor, rate_pct, years, per_year, rounding=ROUND_HALF_EVEN
+):
+    """Compounded totals in minor units; the growth factor is computed once."""
+    num, den = _growth(rate_pct, int(per_year), years)
+    scale = 10**FACTOR_DIGITS
+    factor = round_div(num * scale, den)
+    return mul_div_many(principals_minor, factor, scale, rounding)
+
+
+def emi_many(principals_minor, annual_rate_pct, years, rounding=ROUND_HALF_EVEN):
+    """Monthly EMI in minor units for each principal (rate and term shared)."""
+    # EMI is linear in P: one exact per-unit factor serves the whole batch
+    n = int(years) * 12
+    if n <= 0:
+        raise ValueError("Term must be at least one year")
+    r = to_scaled(annual_rate_pct, RATE_DIGITS)
+    if r == 0:
+        return mul_div_many(principals_minor, 1, n, rounding)
+    num, div = _emi_factor(r, n)
+    scale = 10**FACTOR_DIGITS
+    factor = round_div(num * scale, div)
+    return mul_div_many(principals_minor, factor, scale, rounding)
@@ -0,0 +1,345 @@
+import ast
+import decimal
+import math
+import re
+from functools import lru_cache
+
+from .tracing import traced
+
+# --------------------------------------------------------------------------- #
+#  PROGRAMMER MODE: INTEGERS, BASES, WORD SIZES                               #
+# --------------------------------------------------------------------------- #
+# Expressions use Python's integer operators (+ - * / % ** & | ^ ~ << >>,
+# "^" is XOR here) and pow / gcd / abs.  Bare numbers are read in the input
+# base; 0x / 0o / 0b prefixes always work except that in HEX "0b1" is a hex
+# number.  With a word size every intermediate result wraps to a signed word
+# like C's fixed-width integers, and "/" and "%" truncate toward zero as in C.
+#
+# Integers only grow through *, **, << and pow(); those are refused beyond
+# MAX_BITS (about 315,000 decimal digits), which keeps every single big-int
+# operation short.  The views then convert only the digits they show: the
+# leading and trailing ones of a long number, found by bit slicing for HEX /
+# OCT / BIN and by a short Decimal estimate for DEC, so showing a
+# 100,000-digit result costs microseconds, not a full conversion.
+
+WORD_SIZES = (8, 16, 32, 64, None)  # None: arbitrary precision
+BASES = {"HEX": 16, "DEC": 10, "OCT": 8, "BIN": 2}
+MAX_BITS = 1 << 20
+MAX_MODPOW_WORK = 1 << 38  # exponent bits x modulus bits squared
+SHOWN_DIGITS = 64  # longer views show their first and last EDGE_DIGITS
+EDGE_DIGITS = 24
+GROUPS = {16: 4, 10: 3, 8: 3, 2: 4}  # digits per space-separated group
+
+_PREFIXES = {16: "0x", 8: "0o", 2: "0b"}
+_SPECS = {16: "X", 8: "o", 2: "b"}
+_BITS_PER_DIGIT = {16: 4, 8: 3, 2: 1}
+_WORD = re.compile(r"[0-9A-Za-z_]+")
+_LITERAL = {
+    16: re.compile(r"(0[xX])?[0-9A-Fa-f_]+"),
+    10: re.compile(r"[0-9_]+|0[xXoObB][0-9A-Fa-f_]+"),
+    8: re.compile(r"[0-7_]+|0[xXoObB][0-9A-Fa-f_]+"),
+    2: re.compile(r"[01_]+|0[xXoObB][0-9A-Fa-f_]+"),
+}
+
+
+class ProgrammerError(ValueError):
+    pass
+
+
+def wrap(value, bits):
+    """``value`` as a signed ``bits``-bit word (unchanged when bits is None)."""
+    if bits is None:
+        return value
+    value &= (1 << bits) - 1
+    return value - (1 << bits) if value >> (bits - 1) else value
+
+
+# --------------------------------------------------------------------------- #
+#  Parsing                                                                    #
+# --------------------------------------------------------------------------- #
+def _prefixed(word, base):
+    """Whether ``word`` names its own base (in HEX, 0b1 is a hex number)."""
+    prefix = word[:2].lower()
+    return prefix == "0x" or (prefix in ("0o", "0b") and base != 16)
+
+
+def _python_literal(word, base):
+    """A number typed in ``base`` as Python source."""
+    if _prefixed(word, base):
+        return word
+    if base == 10:
+        return word.lstrip("0_") or "0"  # Python refuses leading zeros
+    return _PREFIXES[base] + word
+
+
+def _substitute(text, base):
+    def replace(match):
+        word = match.group()
+        if word in FUNCTIONS:
+            return word
+        if not _LITERAL[base].fullmatch(word):
+            raise ProgrammerError(f"Not a base-{base} number: {word[:20]}")
+        return _python_literal(word, base)
+
+    return _WORD.sub(replace, text)
+
+
+def convert_literals(text, base, new_base):
+    """``text`` with its bare numbers rewritten from ``base`` to ``new_base``."""
+
+    def replace(match):
+        word = match.group()
+        if word in FUNCTIONS or _prefixed(word, base):
+            return word  # a prefixed number means the same in any base
+        number = int(word.replace("_", ""), base)
+        return str(number) if new_base == 10 else format(number, _SPECS[new_base])
+
+    try:
+        return _WORD.sub(replace, text)
+    except ValueError:  # not a valid number: leave the text for the user
+        return text
+
+
+@lru_cache(maxsize=256)
+def parse(text, base=10):
+    """The expression's syntax tree, numbers read in ``base``."""
+    if not text.strip():
+        raise ProgrammerError("Enter an expression")
+    source = _substitute(text, base).strip()
+    try:
+        return ast.parse(source, mode="eval").body
+    except (SyntaxError, ValueError):
+        raise ProgrammerError("Invalid expression") from None
+
+
+# --------------------------------------------------------------------------- #
+#  Evaluation                                                                 #
+# --------------------------------------------------------------------------- #
+def _check_bits(bits):
+    if bits > MAX_BITS:
+        raise ProgrammerError(f"Result too large (over {MAX_BITS:,} bits)")
+
+
+def _divide(a, b):
+    """C division: the quotient truncated toward zero."""
+    if b == 0:
+        raise ProgrammerError("Division by zero")
+    quotient = abs(a) // abs(b)
+    return -quotient if (a < 0) != (b < 0) else quotient
+
+
+def _remainder(a, b):
+    return a - b * _divide(a, b)
+
+
+def _power(a, b, bits):
+    if b < 0:
+        raise ProgrammerError("Negative exponent")
+    if bits is not None:
+        return pow(a, b, 1 << bits)  # only the word's bits are ever kept
+    if abs(a) > 1 and b > 0:
+        _check_bits(math.ceil(b * math.log2(abs(a))))
+    return a**b
+
+
+def _shift_left(a, b, bits):
+    if b < 0:
+        raise ProgrammerError("Negative shift")
+    if bits is not None:
+        return 0 if b >= bits else a << b
+    if a:
+        _check_bits(a.bit_length() + b)
+    return a << b
+
+
+def _shift_right(a, b, bits):
+    if b < 0:
+        raise ProgrammerError("Negative shift")
+    return a >> b if b < a.bit_length() + 1 else (-1 if a < 0 else 0)
+
+
+def _multiply(a, b, bits):
+    if bits is None:
+        _check_bits(a.bit_length() + b.bit_length())
+    return a * b
+
+
+def guarded_pow(a, b, m=None, bits=None):
+    """pow(a, b[, m]) refusing results or work beyond the limits."""
+    if m is None:
+        return _power(a, b, bits)
+    if m == 0:
+        raise ProgrammerError("pow() modulus is zero")
+    if abs(b).bit_length() * m.bit_length() ** 2 > MAX_MODPOW_WORK:
+        raise ProgrammerError("pow() would take too long")
+    try:
+        return pow(a, b, m)  # b < 0: the modular inverse's power
+    except ValueError:
+        raise ProgrammerError("Base is not invertible for that modulus") from None
+
+
+FUNCTIONS = {
+    "pow": guarded_pow,
+    "gcd": lambda a, b, bits=None: math.gcd(a, b),
+    "abs": lambda a, bits=None: abs(a),
+}
+_BINARY = {
+    ast.Add: lambda a, b, bits: a + b,
+    ast.Sub: lambda a, b, bits: a - b,
+    ast.Mult: _multiply,
+    ast.Div: lambda a, b, bits: _divide(a, b),
+    ast.FloorDiv: lambda a, b, bits: _divide(a, b),
+    ast.Mod: lambda a, b, bits: _remainder(a, b),
+    ast.Pow: _power,
+    ast.LShift: _shift_left,
+    ast.RShift: _shift_right,
+    ast.BitAnd: lambda a, b, bits: a & b,
+    ast.BitOr: lambda a, b, bits: a | b,
+    ast.BitXor: lambda a, b, bits: a ^ b,
+}
+_UNARY = {
+    ast.UAdd: lambda a: a,
+    ast.USub: lambda a: -a,
+    ast.Invert: lambda a: ~a,
+}
+
+
+def _evaluate(node, bits):
+    if isinstance(node, ast.Constant) and type(node.value) is int:
+        return wrap(node.value, bits)
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+        a, b = _evaluate(node.left, bits), _evaluate(node.right, bits)
+        return wrap(_BINARY[type(node.op)](a, b, bits), bits)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY:
+        return wrap(_UNARY[type(node.op)](_evaluate(node.operand, bits)), bits)
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in FUNCTIONS
+        and not node.keywords
+    ):
+        args = [_evaluate(arg, bits) for arg in node.args]
+        try:
+            return wrap(FUNCTIONS[node.func.id](*args, bits=bits), bits)
+        except TypeError:
+            raise ProgrammerError(f"Wrong arguments for {node.func.id}()") from None
+    raise ProgrammerError("Only integers and integer operators are allowed")
+
+
+@traced("prog.evaluate", "text")
+def evaluate(text, base=10, bits=None):
+    """Integer value of ``text``; raises ProgrammerError."""
+    try:
+        return _evaluate(parse(text, base), bits)
+    except RecursionError:
+        raise ProgrammerError("Expression nested too deeply") from None
+
+
+# --------------------------------------------------------------------------- #
+#  Display                                                                    #
+# --------------------------------------------------------------------------- #
+def _pattern(value, base, bits):
+    """(sign, magnitude) shown for ``value``: words show their bit pattern."""
+    if bits is not None and base != 10:
+        return "", value & ((1 << bits) - 1)
+    return ("-" if value < 0 else ""), abs(value)
+
+
+def _leading_decimal(n, count):
+    """(first ``count`` digits, number of digits) of a big positive int."""
+    shift = max(n.bit_length() - 192, 0)  # 192 bits: ~57 digits are plenty
+    with decimal.localcontext() as context:
+        context.prec = count + 20
+        context.Emax = decimal.MAX_EMAX
+        estimate = decimal.Decimal(n >> shift) * decimal.Decimal(2) ** shift
+    digits = "".join(map(str, estimate.as_tuple().digits))
+    guard = digits[count:-3]
+    if guard.strip("9") and guard.strip("0"):  # no carry can reach the head
+        return digits[:count], estimate.adjusted() + 1
+    full = decimal_string(n)  # e.g. exactly 10**k: settle it exactly
+    return full[:count], len(full)
+
+
+def _visible(magnitude, base):
+    """(shown digits, digit count): all of them, or head…tail."""
+    if base == 10:
+        if magnitude.bit_length() <= 3 * SHOWN_DIGITS:
+            digits = str(magnitude)
+            if len(digits) <= SHOWN_DIGITS:
+                return digits, len(digits)
+        head, count = _leading_decimal(magnitude, EDGE_DIGITS)
+        if count <= SHOWN_DIGITS:
+            digits = str(magnitude)
+            return digits, len(digits)
+        tail = str(magnitude % 10**EDGE_DIGITS).zfill(EDGE_DIGITS)
+        return f"{head}…{tail}", count
+    per_digit, spec = _BITS_PER_DIGIT[base], _SPECS[base]
+    count = max(-(-magnitude.bit_length() // per_digit), 1)
+    if count <= SHOWN_DIGITS:
+        return format(magnitude, spec), count
+    head = magnitude >> ((count - EDGE_DIGITS) * per_digit)
+    tail = magnitude & ((1 << EDGE_DIGITS * per_digit) - 1)
+    return f"{head:{spec}}…{tail:0{EDGE_DIGITS}{spec}}", count
+
+
+def _grouped(digits, base):
+    size = GROUPS[base]
+    first = len(digits) % size or size
+    groups = [digits[:first]]
+    groups += [digits[i : i + size] for i in range(first, len(digits), size)]
+    return " ".join(groups)
+
+
+def view(value, base, bits=None):
+    """One display line for ``value`` in ``base``, only the visible digits."""
+    sign, magnitude = _pattern(value, base, bits)
+    digits, count = _visible(magnitude, base)
+    if bits is not None and base in (16, 2):  # the whole word, zero-padded
+        digits = digits.zfill(bits // _BITS_PER_DIGIT[base])
+    if "…" in digits:
+        return f"{sign}{digits}  ({count:,} digits)"
+    return sign + _grouped(digits, base)
+
+
+@traced("prog.views")
+def views(value, bits=None):
+    return {name: view(value, base, bits) for name, base in BASES.items()}
+
+
+def decimal_string(n):
+    """str(n) for any size, subquadratic: halves joined by Decimal products."""
+    if n < 0:
+        return "-" + decimal_string(-n)
+    if n.bit_length() <= 8192:
+        return str(n)
+    with decimal.localcontext() as context:
+        context.prec = decimal.MAX_PREC
+        context.Emax = decimal.MAX_EMAX
+        context.Emin = decimal.MIN_EMIN
+        context.traps[decimal.Inexact] = True
+        powers = {}
+
+        def power(bits):
+            if bits not in powers:
+                powers[bits] = decimal.Decimal(2) ** bits
+            return powers[bits]
+
+        def convert(n, bits):  # n < 2**bits
+            if bits <= 4096:
+                return decimal.Decimal(n)
+            low_bits = bits >> 1
+            high = n >> low_bits
+            low = n - (high << low_bits)
+            high = convert(high, bits - low_bits)
+            return high * power(low_bits) + convert(low, low_bits)
+
+        return str(convert(n, n.bit_length()))
+
+
+@traced("prog.all_digits", "base")
+def all_digits(value, base, bits=None):
+    """Every digit of ``value`` in ``base``, e.g. for the clipboard."""
+    sign, magnitude = _pattern(value, base, bits)
+    if base == 10:
+        return sign + decimal_string(magnitude)
+    return sign + format(magnitude, _SPECS[base])
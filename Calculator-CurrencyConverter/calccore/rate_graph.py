@@ -0,0 +1,182 @@
+import math
+
+# --------------------------------------------------------------------------- #
+#  CONVERSION GRAPH                                                           #
+# --------------------------------------------------------------------------- #
+# Every cached rate table (one per base currency, from the API or from a
+# snapshot) is a "star" of edges around its base: BASE -> X at the quoted
+# rate and X -> BASE at its inverse.  Best paths are the ones with the fewest
+# hops, so a conversion goes through as few quotes as possible.
+#
+# Hop counts and split points of every pair are kept in n x n tables.
+# Adding or refreshing one base only inserts that base's star (O(n^2))
+# instead of re-running the full Floyd-Warshall rebuild (O(n^3)).  The rate
+# of a pair is composed along its path the first time it is asked for and
+# remembered until the next update, so an update never touches every pair.
+
+INF = math.inf
+DIRECT = -1
+NO_PATH = -2
+
+
+class RateGraph:
+    def __init__(self):
+        self.codes = []
+        self.index = {}
+        self.tables = {}  # base -> (rates dict, as_of)
+        self.dist = []
+        self.via = []
+        self.composed = {}  # (i, j) -> rate, for pairs looked up since the last update
+
+    # ----------------------------------------------------------------------- #
+    def update(self, base, rates, as_of=""):
+        """Add or refresh the rate table quoted against ``base``."""
+        rates = {c: float(r) for c, r in rates.items() if r and c != base}
+        old = self.tables.get(base)
+        if old is not None and as_of and old[1] and as_of < old[1]:
+            return  # an older snapshot never replaces a newer table
+
+        self.tables[base] = (rates, as_of)
+        for code in (base, *rates):
+            self._add_code(code)
+
+        if old is not None and not old[0].keys() <= rates.keys():
+            # Quotes disappeared, so some paths may be gone: rebuild.
+            self.rebuild()
+            return
+
+        self._insert_star(base, rates)
+        self.composed.clear()
+
+    def rate(self, from_curr, to_curr):
+        """Best available rate from ``from_curr`` to ``to_curr`` or None."""
+        i = self.index.get(from_curr)
+        j = self.index.get(to_curr)
+        if i is None or j is None or self.dist[i][j] == INF:
+            return None
+        rate = self.composed.get((i, j))
+        if rate is None:
+            rate = self.composed[i, j] = self._compose(i, j)
+        return rate
+
+    def path(self, from_curr, to_curr):
+        """Currencies visited by the best conversion path, ends included."""
+        i = self.index.get(from_curr)
+        j = self.index.get(to_curr)
+        if i is None or j is None or self.dist[i][j] == INF:
+            return []
+        return [self.codes[k] for k in self._walk(i, j)]
+
+    # ----------------------------------------------------------------------- #
+    def rebuild(self):
+        """Recompute every path from scratch (Floyd-Warshall)."""
+        n = len(self.codes)
+        dist = [[INF] * n for _ in range(n)]
+        via = [[NO_PATH] * n for _ in range(n)]
+        for i in range(n):
+            dist[i][i] = 0
+            via[i][i] = DIRECT
+        for base, (rates, _) in self.tables.items():
+            b = self.index[base]
+            for code in rates:
+                x = self.index[code]
+                dist[b][x] = dist[x][b] = 1
+                via[b][x] = via[x][b] = DIRECT
+
+        for k in range(n):
+            dist_k = dist[k]
+            for i in range(n):
+                d_ik = dist[i][k]
+                if d_ik == INF:
+                    continue
+                dist_i = dist[i]
+                via_i = via[i]
+                for j in range(n):
+                    d = d_ik + dist_k[j]
+                    if d < dist_i[j]:
+                        dist_i[j] = d
+                        via_i[j] = k
+
+        self.dist = dist
+        self.via = via
+        self.composed.clear()
+
+    # ----------------------------------------------------------------------- #
+    def _add_code(self, code):
+        if code in self.index:
+            return
+        self.index[code] = len(self.codes)
+        self.codes.append(code)
+        for row in self.dist:
+            row.append(INF)
+        for row in self.via:
+            row.append(NO_PATH)
+        n = len(self.codes)
+        self.dist.append([INF] * n)
+        self.via.append([NO_PATH] * n)
+        self.dist[n - 1][n - 1] = 0
+        self.via[n - 1][n - 1] = DIRECT
+
+    def _insert_star(self, base, rates):
+        # Every new edge touches ``base``, so a shortest path that uses one of
+        # them passes through ``base`` exactly once.  First find the new
+        # distance from every node to ``base``, then relax all pairs through it.
+        dist, via = self.dist, self.via
+        n = len(self.codes)
+        b = self.index[base]
+        neighbours = [self.index[c] for c in rates]
+
+        for x in neighbours:
+            dist[b][x] = dist[x][b] = 1
+            via[b][x] = via[x][b] = DIRECT
+
+        to_base = [dist[i][b] for i in range(n)]
+        for i in range(n):
+            dist_i = dist[i]
+            best, split = to_base[i], None
+            for x in neighbours:
+                d = dist_i[x] + 1
+                if d < best:
+                    best, split = d, x
+            if split is not None:
+                to_base[i] = dist_i[b] = dist[b][i] = best
+                via[i][b] = via[b][i] = split
+
+        for i in range(n):
+            d_ib = to_base[i]
+            if d_ib == INF:
+                continue
+            dist_i = dist[i]
+            via_i = via[i]
+            for j in range(n):
+                d = d_ib + to_base[j]
+                if d < dist_i[j]:
+                    dist_i[j] = d
+                    via_i[j] = b
+
+    def _edge_rate(self, i, j):
+        src, dst = self.codes[i], self.codes[j]
+        own = self.tables.get(src)
+        if own is not None and dst in own[0]:
+            return own[0][dst]
+        other = self.tables.get(dst)
+        if other is not None and src in other[0]:
+            return 1.0 / other[0][src]
+        return None
+
+    def _compose(self, i, j):
+        """Product of the edge rates along the best path from i to j."""
+        rate = 1.0
+        path = self._walk(i, j)
+        for a, b in zip(path, path[1:]):
+            edge = self._edge_rate(a, b)
+            if edge is None:
+                return None
+            rate *= edge
+        return rate
+
+    def _walk(self, i, j):
+        k = self.via[i][j]
+        if k == DIRECT:
+            return [i] if i == j else [i, j]
+        return self._walk(i, k)[:-1] + self._walk(k, j)
@@ -0,0 +1,167 @@
+import math
+import os
+import re
+import sys
+import time
+from array import array
+
+from .rate_snapshot import RateTable, np
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+    BACKEND = "orjson"
+except ImportError:
+    try:
+        import ujson
+
+        _loads = ujson.loads
+        BACKEND = "ujson"
+    except ImportError:
+        import json
+
+        _loads = json.loads
+        BACKEND = "json"
+
+# --------------------------------------------------------------------------- #
+#  /v4/latest PAYLOAD DECODER                                                 #
+# --------------------------------------------------------------------------- #
+# The API answers with
+#   {"base": "USD", "date": "2024-05-01", "time_last_updated": 1714521601,
+#    "rates": {"USD": 1, "AED": 3.67, ...}, ...provider/terms links...}
+#
+# decode() is a full JSON parse with validated array output: the JSON backend
+# builds the whole document as Python objects (from the raw bytes, without
+# text decoding or charset sniffing), the checks run once over the whole
+# "rates" object instead of per rate, and only a RateTable (currency index +
+# float64 array) outlives decode().  The parse itself is not streamed:
+# scanning just the "rates" object in Python measured no faster than a C
+# backend decoding everything (~110 vs ~100 us for 160 currencies on the
+# stdlib json), and would be a second, laxer JSON parser to maintain.
+
+# CALC_RATES_URL points the apps at another server, e.g. mock_rate_server.py
+API_URL = (
+    os.environ.get("CALC_RATES_URL") or "https://api.exchangerate-api.com/v4/latest/"
+)
+
+_CODE = re.compile(r"[A-Z]{3}")
+_CODES = re.compile(r"(?:[A-Z]{3})+")
+_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_NUMERIC = {int, float}
+
+
+class PayloadError(ValueError):
+    pass
+
+
+class DecodeStats:
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.last_ns = 0
+        self.bytes = 0
+
+    @property
+    def mean_us(self):
+        return self.total_ns / self.count / 1000 if self.count else 0.0
+
+    def __repr__(self):
+        return (
+            f"DecodeStats(count={self.count}, mean={self.mean_us:.1f}us, "
+            f"last={self.last_ns / 1000:.1f}us, bytes={self.bytes}, backend={BACKEND})"
+        )
+
+
+class RatePayloadDecoder:
+    def __init__(self):
+        self.stats = DecodeStats()
+
+    def decode(self, payload, expect_base=None):
+        """Parse a /v4/latest payload (bytes or str); its validated RateTable."""
+        start = time.perf_counter_ns()
+        try:
+            data = _loads(payload)
+        except ValueError as exc:
+            raise PayloadError(f"Malformed JSON: {exc}") from None
+        table = self._table(data, expect_base)
+
+        elapsed = time.perf_counter_ns() - start
+        self.stats.count += 1
+        self.stats.total_ns += elapsed
+        self.stats.last_ns = elapsed
+        self.stats.bytes += len(payload)
+        return table
+
+    # ----------------------------------------------------------------------- #
+    @staticmethod
+    def _table(data, expect_base):
+        if not isinstance(data, dict):
+            raise PayloadError("Payload is not a JSON object")
+        base = data.get("base")
+        if not isinstance(base, str) or not _CODE.fullmatch(base):
+            raise PayloadError(f"Bad base currency: {base!r}")
+        if expect_base is not None and base != expect_base:
+            raise PayloadError(f"Asked for {expect_base} rates, got {base}")
+        date = data.get("date", "")
+        if not isinstance(date, str) or (date and not _DATE.fullmatch(date)):
+            raise PayloadError(f"Bad date: {date!r}")
+        stamp = data.get("time_last_updated")
+        if stamp is None:
+            stamp = time.time()
+        elif type(stamp) not in (int, float):
+            raise PayloadError(f"Bad time_last_updated: {stamp!r}")
+
+        rates = data.get("rates")
+        if not isinstance(rates, dict) or not rates:
+            raise PayloadError("Missing rates object")
+        codes = tuple(rates)
+        joined = "".join(codes)
+        if len(joined) != 3 * len(codes) or not _CODES.fullmatch(joined):
+            raise PayloadError("Rates contain an invalid currency code")
+        raw = rates.values()
+        if not set(map(type, raw)) <= _NUMERIC:
+            raise PayloadError("Rates contain a non-numeric value")
+
+        if np is not None:
+            values = np.fromiter(raw, dtype=np.float64, count=len(codes))
+            valid = bool(0 < values.min() and values.max() < math.inf)  # NaN fails
+        else:
+            values = array("d", raw)
+            valid = all(v > 0 and math.isfinite(v) for v in values)
+        if not valid:
+            raise PayloadError("Rates must be positive finite numbers")
+        return RateTable(base, codes, values, date, float(stamp))
+
+
+# --------------------------------------------------------------------------- #
+#  python -m calccore.rate_payload FILE...   time decoding archived payloads  #
+# --------------------------------------------------------------------------- #
+def main(paths):
+    import tracemalloc
+
+    decoder = RatePayloadDecoder()
+    payloads = []
+    for path in paths:
+        with open(path, "rb") as f:
+            payloads.append((path, f.read()))
+
+    tracemalloc.start()
+    for path, payload in payloads:
+        try:
+            table = decoder.decode(payload)
+        except PayloadError as exc:
+            print(f"{path}: invalid ({exc})")
+            continue
+        print(
+            f"{path}: {table.base} {table.date} {len(table)} rates "
+            f"in {decoder.stats.last_ns / 1000:.1f}us"
+        )
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{decoder.stats}, peak allocations {peak / 1024:.1f} KiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
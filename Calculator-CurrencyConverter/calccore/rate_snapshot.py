@@ -0,0 +1,216 @@
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from collections.abc import Mapping
+
+from .lazy import lazy_import
+
+# Loaded on first use; without it memoryview.cast does the same job, just
+# without vector ops
+np = lazy_import("numpy")
+
+# --------------------------------------------------------------------------- #
+#  BINARY RATE SNAPSHOTS                                                      #
+# --------------------------------------------------------------------------- #
+# A snapshot file is
+#
+#   header   magic "RSNP", version, count, timestamp, date, base   (40 bytes)
+#   index    count currency codes, 3 ASCII bytes each, padded to 8 bytes
+#   values   count little-endian float64 rates
+#   trailer  CRC32 of everything above
+#
+# Loading maps the file and views the values in place, so the app can show
+# (possibly stale) rates before the network or any JSON is touched.
+
+MAGIC = b"RSNP"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHd16s3s5x")
+_CRC = struct.Struct("<I")
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUNDLED_PATH = os.path.join(APP_DIR, "Data", "rates.snap")
+CACHE_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "vintage-calc",
+    "rates.snap",
+)
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+class RateTable(Mapping):
+    """Read-only ``{currency: rate}`` over a currency index and a float array."""
+
+    def __init__(self, base, codes, values, date="", timestamp=0.0, source=None):
+        self.base = base
+        self.codes = tuple(codes)
+        self.values = values
+        self.date = date
+        self.timestamp = timestamp
+        self.index = dict(zip(self.codes, range(len(self.codes))))
+        self._source = source  # keeps an mmap alive while values view it
+
+    @classmethod
+    def from_rates(cls, base, rates, date="", timestamp=None):
+        codes = [base] + sorted(c for c in rates if c != base)
+        values = [1.0] + [float(rates[c]) for c in codes[1:]]
+        if np is not None:
+            values = np.array(values, dtype=np.float64)
+        if timestamp is None:
+            timestamp = time.time()
+        return cls(base, codes, values, date, timestamp)
+
+    def __getitem__(self, code):
+        return float(self.values[self.index[code]])
+
+    def __iter__(self):
+        return iter(self.codes)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, code):
+        return code in self.index
+
+    def rebase(self, base):
+        """Same table quoted against another currency in the index."""
+        if base == self.base:
+            return self
+        pivot = self[base]
+        if np is not None:
+            values = np.asarray(self.values, dtype=np.float64) / pivot
+        else:
+            values = [v / pivot for v in self.values]
+        return RateTable(base, self.codes, values, self.date, self.timestamp)
+
+
+# --------------------------------------------------------------------------- #
+def dumps(table):
+    """Serialize a RateTable to snapshot bytes."""
+    count = len(table.codes)
+    index = "".join(table.codes).encode("ascii")
+    index += b"\0" * (-len(index) % 8)
+    values = struct.pack(f"<{count}d", *(float(v) for v in table.values))
+    body = (
+        _HEADER.pack(
+            MAGIC,
+            VERSION,
+            count,
+            float(table.timestamp),
+            table.date.encode("ascii", "replace")[:16],
+            table.base.encode("ascii"),
+        )
+        + index
+        + values
+    )
+    return body + _CRC.pack(zlib.crc32(body))
+
+
+def loads(buf, source=None):
+    """Build a RateTable that views ``buf`` (bytes, mmap, ...) in place."""
+    view = memoryview(buf)
+    if len(view) < _HEADER.size + _CRC.size:
+        raise SnapshotError("Snapshot is truncated")
+    magic, version, count, timestamp, date, base = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC or version != VERSION:
+        raise SnapshotError("Not a rate snapshot (or an unsupported version)")
+    index_off = _HEADER.size
+    values_off = index_off + (3 * count + 7) // 8 * 8
+    end = values_off + 8 * count
+    if len(view) != end + _CRC.size:
+        raise SnapshotError("Snapshot size does not match its header")
+    if zlib.crc32(view[:end]) != _CRC.unpack_from(view, end)[0]:
+        raise SnapshotError("Snapshot checksum mismatch")
+
+    raw = bytes(view[index_off : index_off + 3 * count]).decode("ascii")
+    codes = [raw[i : i + 3] for i in range(0, len(raw), 3)]
+    if np is not None:
+        values = np.frombuffer(buf, dtype="<f8", count=count, offset=values_off)
+    elif sys.byteorder == "little":
+        values = view[values_off:end].cast("d")
+    else:
+        values = struct.unpack_from(f"<{count}d", view, values_off)
+    return RateTable(
+        base.decode("ascii"),
+        codes,
+        values,
+        date.rstrip(b"\0").decode("ascii", "replace"),
+        timestamp,
+        source if source is not None else buf,
+    )
+
+
+def load(path):
+    """Memory-map a snapshot file; raises OSError or SnapshotError."""
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return loads(mapped)
+
+
+def save(table, path):
+    """Write a snapshot atomically (readers never see a partial file)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(dumps(table))
+    os.replace(tmp, path)
+
+
+def load_latest(paths=(CACHE_PATH, BUNDLED_PATH)):
+    """Newest valid snapshot among ``paths``, or None."""
+    best = None
+    for path in paths:
+        try:
+            table = load(path)
+        except (OSError, ValueError):
+            continue
+        if best is None or table.timestamp > best.timestamp:
+            best = table
+    return best
+
+
+def export_rates(base, rates, date="", path=CACHE_PATH):
+    """Save freshly fetched rates for the next cold start; never raises."""
+    try:
+        if not isinstance(rates, RateTable):
+            rates = RateTable.from_rates(base, rates, date)
+        save(rates, path)
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+# --------------------------------------------------------------------------- #
+#  python -m calccore.rate_snapshot export [BASE] [PATH]  |  show [PATH]      #
+# --------------------------------------------------------------------------- #
+def main(argv):
+    command = argv[0] if argv else "show"
+    if command == "export":
+        from .rate_payload import RatePayloadDecoder
+        from .rates import download
+
+        base = argv[1] if len(argv) > 1 else "USD"
+        path = argv[2] if len(argv) > 2 else BUNDLED_PATH
+        table = RatePayloadDecoder().decode(download(base), base)
+        save(table, path)
+        print(f"Wrote {len(table)} {base} rates to {path}")
+    elif command == "show":
+        table = load(argv[1] if len(argv) > 1 else BUNDLED_PATH)
+        print(f"{table.base} rates from {table.date}, {len(table)} currencies")
+        for code in table:
+            print(f"  {code}  {table[code]:.6f}")
+    else:
+        print(
+            "usage: python -m calccore.rate_snapshot export [BASE] [PATH] | show [PATH]"
+        )
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
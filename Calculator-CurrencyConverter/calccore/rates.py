@@ -0,0 +1,140 @@
+from .money import Money
+from .rate_graph import RateGraph
+from .rate_payload import API_URL, RatePayloadDecoder
+from .rate_snapshot import export_rates, load_latest
+from .shared_rates import STALE_AFTER, open_shared_table
+from .tracing import span, traced
+
+# --------------------------------------------------------------------------- #
+#  RATES FOR A CONVERTER                                                      #
+# --------------------------------------------------------------------------- #
+# Everything a converter pane needs apart from its widgets: where rates come
+# from (saved snapshot, the user's shared table or a download), the rate
+# graph for pairs without a direct quote, and the conversion itself.
+#
+# fetch() is the only method meant for a worker thread; the front ends call
+# everything else from their UI thread.
+
+FETCH_TIMEOUT = 10  # seconds
+
+# Offered before any rates are known; RateStore.currencies adds the rest
+# fmt: off
+CURRENCIES = (
+    "AUD", "BGN", "BRL", "CAD", "CHF", "CNY", "CZK", "DKK", "EUR", "GBP", "HKD",
+    "HRK", "HUF", "IDR", "ILS", "INR", "ISK", "JPY", "KRW", "MXN", "MYR", "NOK",
+    "NZD", "PHP", "PLN", "RON", "RUB", "SEK", "SGD", "THB", "TRY", "USD", "ZAR",
+)
+# fmt: on
+
+
+class RateUnavailable(LookupError):
+    pass
+
+
+def download(base, url=API_URL, timeout=FETCH_TIMEOUT):
+    """Raw /v4/latest payload for ``base``; network errors are OSErrors."""
+    import requests  # deferred: ~0.1 s of imports kept off startup
+
+    # Connecting is part of the first span: requests does not report it
+    with span("http.request", url=f"{url}{base}") as request:
+        response = requests.get(f"{url}{base}", timeout=timeout, stream=True)
+        request.set(status=response.status_code)
+    with response:
+        response.raise_for_status()
+        with span("http.body") as body:
+            content = response.content
+            body.set(bytes=len(content))
+    return content
+
+
+class RateStore:
+    def __init__(self, url=API_URL, share=True):
+        self.url = url
+        self.base = None  # currency self.rates are quoted against
+        self.rates = {}
+        self.graph = RateGraph()
+        self.decoder = RatePayloadDecoder()
+        self.shared = open_shared_table() if share else None
+        self.shared_version = None
+
+    @property
+    def currencies(self):
+        """The usual currencies plus every one there is a rate for."""
+        return sorted(set(CURRENCIES).union(self.rates))
+
+    # ----------------------------------------------------------------------- #
+    @traced("rates.fetch", "base")
+    def fetch(self, base):
+        """Download and decode rates for ``base`` (safe on a worker thread)."""
+        payload = download(base, self.url)
+        with span("rates.parse", bytes=len(payload)) as parse:
+            table = self.decoder.decode(payload, base)
+            parse.set(currencies=len(table))
+        return table
+
+    @traced("rates.store", "base")
+    def store(self, base, table, save=True):
+        """Make fetched rates current, share them and keep a snapshot."""
+        self.base, self.rates = base, table
+        self.graph.update(base, table, table.date)
+        if self.shared is not None:
+            self.shared.publish(base, table, table.date)
+            self.shared_version = self.shared.version
+        if save:
+            export_rates(base, table, table.date)
+
+    @traced("rates.load_offline", "base")
+    def load_offline(self, base):
+        """The newest saved snapshot, used until fresh rates arrive; or None."""
+        snapshot = load_latest()
+        if snapshot is not None:
+            self.graph.update(snapshot.base, snapshot, snapshot.date)
+            if base in snapshot:
+                self.base, self.rates = base, snapshot.rebase(base)
+        return snapshot
+
+    # ----------------------------------------------------------------------- #
+    #  the shared table another instance may be filling                       #
+    # ----------------------------------------------------------------------- #
+    def prefers_shared(self, manual=False):
+        """True if the shared table should be used instead of downloading."""
+        shared = self.shared
+        # Only the elected instance downloads, and only when the table is
+        # stale or on a manual refresh
+        return shared is not None and (
+            not shared.elect() or (not manual and shared.age() < STALE_AFTER)
+        )
+
+    def load_shared(self, base):
+        """Date of the shared rates, now current for ``base``; None if absent."""
+        anchor, date, _, codes, _ = self.shared.snapshot()
+        self.shared_version = self.shared.version
+        if base not in codes:
+            return None
+        self.base, self.rates = base, self.shared.view(base)
+        self.graph.update(anchor, dict(self.shared.view(anchor)), date)
+        return date
+
+    def shared_changed(self):
+        return self.shared.version != self.shared_version
+
+    def due_for_refresh(self):
+        """True if the shared table is stale and this instance should fetch."""
+        return self.shared.age() > STALE_AFTER and self.shared.elect()
+
+    # ----------------------------------------------------------------------- #
+    def rate(self, from_curr, to_curr):
+        """Direct quote if there is one, else the best path; None if neither."""
+        rate = self.rates.get(to_curr) if from_curr == self.base else None
+        if rate is None:
+            rate = self.graph.rate(from_curr, to_curr)
+        return rate
+
+    @traced("rates.convert", "amount", "from_curr", "to_curr")
+    def convert(self, amount, from_curr, to_curr):
+        """(amount, converted) as Money; ValueError for a bad amount."""
+        amount = Money.parse(amount, from_curr)
+        rate = self.rate(from_curr, to_curr)
+        if rate is None:
+            raise RateUnavailable(f"No rate from {from_curr} to {to_curr}")
+        return amount, amount.convert(rate, to_curr)
@@ -0,0 +1,241 @@
+import os
+import struct
+import tempfile
+import time
+from collections.abc import Mapping
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:  # no POSIX/Win32 shared memory on this platform
+    shared_memory = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: no election, so no sharing (see open_shared_table)
+    fcntl = None
+
+# --------------------------------------------------------------------------- #
+#  PER-USER SHARED RATE TABLE                                                 #
+# --------------------------------------------------------------------------- #
+# One block of shared memory holds the latest rate table for every copy of
+# the app the same user is running.  One instance (the one holding LOCK_PATH)
+# downloads rates and publishes them; all the others read the same memory in
+# place.  The block and the lock file are named after the user and only they
+# may open them (0o600): another account cannot plant rates.
+#
+# Not host-wide: on a terminal server each user still downloads once.  One
+# table for all users would have to be writable by whichever user's instance
+# wins the election (so any user could plant rates), or be read-only for all
+# but its creator, which SharedMemory cannot open (it always maps read-write)
+# and which stops being updated once the creator logs out.
+#
+# Layout:  header | currency codes (3 bytes each) | float64 values
+# The table is quoted against one anchor currency, so a rate for any base is
+# values[to] / values[base] and one download serves every base.
+#
+# Writers bump ``seq`` to an odd number, write, and bump it to the next even
+# number (a seqlock).  Readers retry when ``seq`` was odd or changed under
+# them, so they never see a half-written table and never block the writer.
+# A reader that finds no stable table within READ_TIMEOUT (say the fetcher
+# died mid-write) reads "no rates" and the store falls back to its own.
+
+_USER = os.getuid() if hasattr(os, "getuid") else ""
+SHM_NAME = f"vintage_calc_rates_{_USER}"
+LOCK_PATH = os.path.join(tempfile.gettempdir(), f"vintage_calc_rates_{_USER}.lock")
+MAX_CURRENCIES = 256
+MAGIC = b"RTBL"
+VERSION = 1
+STALE_AFTER = 600  # seconds before the fetcher downloads again
+READ_TIMEOUT = 0.05  # seconds a reader waits for a publish to finish
+
+# magic, version, seq, count, fetcher pid, updated (epoch), date, anchor code
+_HEADER = struct.Struct("<4sHxxQIId16s3s5x")
+_SEQ = struct.Struct("<Q")
+_SEQ_OFF = 8
+_CODES_OFF = _HEADER.size
+_VALUES_OFF = (_CODES_OFF + 3 * MAX_CURRENCIES + 7) // 8 * 8
+SIZE = _VALUES_OFF + 8 * MAX_CURRENCIES
+
+
+class SharedRateTable:
+    def __init__(self, name=SHM_NAME):
+        try:
+            self.shm = shared_memory.SharedMemory(name=name)
+            created = False
+        except FileNotFoundError:
+            try:
+                self.shm = shared_memory.SharedMemory(name=name, create=True, size=SIZE)
+                created = True
+            except FileExistsError:  # another instance won the race
+                self.shm = shared_memory.SharedMemory(name=name)
+                created = False
+        # The table must outlive whichever process created it
+        resource_tracker.unregister(self.shm._name, "shared_memory")
+        if not created and not _own(self.shm._fd):
+            self.shm.close()
+            raise PermissionError(f"{name} belongs to another user")
+
+        self.buf = self.shm.buf
+        self.values = self.buf[_VALUES_OFF:SIZE].cast("d")
+        self.is_fetcher = False
+        self._lock_file = None
+        self._index = {}
+        self._index_seq = -1
+
+    # ----------------------------------------------------------------------- #
+    def elect(self):
+        """Try to become the fetcher for this user; True if we are it."""
+        if self.is_fetcher:
+            return True
+        if self._lock_file is None:
+            flags = os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0)
+            fd = os.open(LOCK_PATH, flags, 0o600)
+            if not _own(fd):
+                os.close(fd)
+                return False
+            self._lock_file = os.fdopen(fd, "a+")
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+        self.is_fetcher = True
+        return True
+
+    @property
+    def version(self):
+        return _SEQ.unpack_from(self.buf, _SEQ_OFF)[0]
+
+    def age(self):
+        """Seconds since the last publish (inf if nothing published yet)."""
+        updated = self.snapshot()[2]
+        return time.time() - updated if updated else float("inf")
+
+    # ----------------------------------------------------------------------- #
+    def publish(self, base, rates, date=""):
+        """Write a rate table quoted against ``base`` (fetcher only)."""
+        codes = [base] + [c for c in sorted(rates) if c != base and len(c) == 3]
+        codes = codes[:MAX_CURRENCIES]
+        seq = self.version | 1
+        _SEQ.pack_into(self.buf, _SEQ_OFF, seq)  # odd: write in progress
+        _HEADER.pack_into(
+            self.buf,
+            0,
+            MAGIC,
+            VERSION,
+            seq,
+            len(codes),
+            os.getpid(),
+            time.time(),
+            date.encode("ascii", "replace")[:16],
+            base.encode("ascii"),
+        )
+        self.buf[_CODES_OFF : _CODES_OFF + 3 * len(codes)] = "".join(codes).encode(
+            "ascii"
+        )
+        self.values[0] = 1.0
+        for i, code in enumerate(codes[1:], 1):
+            self.values[i] = float(rates[code])
+        _SEQ.pack_into(self.buf, _SEQ_OFF, seq + 1)
+
+    def _stable(self, read, default):
+        """read(seq) from a table no publish changed meanwhile, or ``default``."""
+        deadline = time.monotonic() + READ_TIMEOUT
+        while True:
+            seq = self.version
+            if not seq & 1:
+                result = read(seq)
+                if self.version == seq:
+                    return result
+            if time.monotonic() > deadline:
+                return default
+            time.sleep(0)
+
+    def snapshot(self):
+        """Consistent copy of (anchor, date, updated, codes, values)."""
+        return self._stable(self._snapshot, ("", "", 0.0, (), ()))
+
+    def _snapshot(self, seq):
+        magic, _, _, count, _, updated, date, anchor = _HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC:
+            return "", "", 0.0, (), ()
+        raw = bytes(self.buf[_CODES_OFF : _CODES_OFF + 3 * count])
+        values = tuple(self.values[:count])
+        codes = tuple(_codes(raw))
+        date = date.rstrip(b"\0").decode("ascii", "replace")
+        return anchor.decode("ascii", "replace"), date, updated, codes, values
+
+    def cross(self, base, code):
+        """Rate from ``base`` to ``code`` read in place, or None."""
+
+        def read(seq):
+            index = self._index
+            if seq != self._index_seq:
+                count = _HEADER.unpack_from(self.buf, 0)[3]
+                raw = bytes(self.buf[_CODES_OFF : _CODES_OFF + 3 * count])
+                index = {code: i for i, code in enumerate(_codes(raw))}
+            i, j = index.get(base), index.get(code)
+            value = None
+            if i is not None and j is not None and self.values[i]:
+                value = self.values[j] / self.values[i]
+            return seq, index, value
+
+        seq, index, value = self._stable(read, (None, None, None))
+        if seq is not None:
+            self._index, self._index_seq = index, seq
+        return value
+
+    def view(self, base):
+        return SharedRatesView(self, base)
+
+    def close(self):
+        self.values.release()
+        self.buf = None
+        self.shm.close()
+        if self._lock_file is not None:
+            self._lock_file.close()  # releases the election lock
+
+
+class SharedRatesView(Mapping):
+    """Live ``{currency: rate}`` mapping for one base, backed by the table."""
+
+    def __init__(self, table, base):
+        self.table = table
+        self.base = base
+
+    def __getitem__(self, code):
+        value = self.table.cross(self.base, code)
+        if value is None:
+            raise KeyError(code)
+        return value
+
+    def __iter__(self):
+        codes = self.table.snapshot()[3]
+        return iter(codes if self.base in codes else ())
+
+    def __len__(self):
+        codes = self.table.snapshot()[3]
+        return len(codes) if self.base in codes else 0
+
+
+def _codes(raw):
+    # "replace": a half-written table is discarded anyway, it must not raise
+    return (raw[i : i + 3].decode("ascii", "replace") for i in range(0, len(raw), 3))
+
+
+def _own(fd):
+    """True if this user owns the file behind ``fd`` (always, off POSIX)."""
+    return not hasattr(os, "getuid") or os.fstat(fd).st_uid == os.getuid()
+
+
+def open_shared_table(name=SHM_NAME):
+    """Attach to (or create) this user's table; None if unsupported."""
+    # CALC_SHARED_RATES=0 keeps an instance to itself (benchmarks, replays).
+    # Without flock there is no fetcher election, so no sharing either.
+    if shared_memory is None or fcntl is None:
+        return None
+    if os.environ.get("CALC_SHARED_RATES") == "0":
+        return None
+    try:
+        return SharedRateTable(name)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,363 @@
+import math
+import random
+
+from .lazy import lazy_import
+from .tracing import traced
+
+# Loaded when the Statistics mode is first used
+np = lazy_import("numpy")
+
+# --------------------------------------------------------------------------- #
+#  STATISTICS MODE: ONE PASS, BOUNDED MEMORY                                  #
+# --------------------------------------------------------------------------- #
+# Data arrives in chunks (pasted text, appended text, file blocks) and every
+# chunk is folded into three small summaries, never kept:
+#
+#   RunningMoments     count, mean, variance (Welford's update, applied per
+#                      chunk with Chan et al.'s merge), min, max
+#   QuantileSketch     a KLL sketch: ~3*K values whatever the count, rank
+#                      error around 1.7/K (exact while the data fits)
+#   StreamingHistogram exact counts in at most MAX_BINS equal bins whose width,
+#                      a power of two, doubles as the data spreads
+#
+# All three merge, so statistics of A + B come from A's and B's summaries, and
+# appending data only costs the new data.
+
+SKETCH_K = 400
+MAX_BINS = 256
+SHOWN_BINS = 12  # histogram rows in format_summary
+BAR_WIDTH = 12
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+FILE_CHUNK = 1 << 22  # characters read from a file at a time
+SEPARATORS = " \t\r\n,;"
+
+
+class StatsError(ValueError):
+    pass
+
+
+# --------------------------------------------------------------------------- #
+#  Numbers from text                                                          #
+# --------------------------------------------------------------------------- #
+def parse_numbers(text):
+    """float64 array of the numbers in ``text`` (whitespace, "," or ";")."""
+    tokens = text.replace(",", " ").replace(";", " ").split()
+    try:
+        return np.array(tokens, dtype=np.float64)
+    except ValueError:
+        for token in tokens:
+            try:
+                float(token)
+            except ValueError:
+                raise StatsError(f"Not a number: {token[:20]!r}") from None
+        raise
+
+
+class NumberReader:
+    """Numbers from text that arrives in pieces, split anywhere."""
+
+    def __init__(self):
+        self.tail = ""  # text after the last separator: maybe half a number
+
+    def feed(self, text):
+        text = self.tail + text
+        cut = max(text.rfind(separator) for separator in SEPARATORS) + 1
+        self.tail = text[cut:]
+        return parse_numbers(text[:cut])
+
+    def pending(self):
+        """The numbers in the tail, as if no more text were coming."""
+        return parse_numbers(self.tail)
+
+
+def read_numbers(path, cancelled=None, chunk=FILE_CHUNK):
+    """Yield arrays of a text file's numbers, one block at a time."""
+    reader = NumberReader()
+    with open(path, encoding="utf-8") as f:
+        while True:
+            if cancelled is not None and cancelled():
+                raise StatsError("Cancelled")
+            text = f.read(chunk)
+            if not text:
+                break
+            yield reader.feed(text)
+    yield reader.pending()
+
+
+# --------------------------------------------------------------------------- #
+#  Mean, variance, min, max                                                   #
+# --------------------------------------------------------------------------- #
+class RunningMoments:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared distances from the mean
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, values):
+        if len(values):
+            mean = float(values.mean())
+            m2 = float(np.square(values - mean).sum())
+            self._combine(len(values), mean, m2, values.min(), values.max())
+
+    def merge(self, other):
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    def _combine(self, count, mean, m2, low, high):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, float(low))
+        self.max = max(self.max, float(high))
+
+    @property
+    def variance(self):
+        """Sample variance (n - 1)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def population_variance(self):
+        return self.m2 / self.count if self.count else math.nan
+
+
+# --------------------------------------------------------------------------- #
+#  Quantiles                                                                  #
+# --------------------------------------------------------------------------- #
+class QuantileSketch:
+    """KLL sketch: level h holds values that each stand for 2**h inputs."""
+
+    def __init__(self, k=SKETCH_K, seed=None):
+        self.k = k
+        self.count = 0
+        self.levels = []
+        self._random = random.Random(seed)
+
+    def copy(self):
+        sketch = QuantileSketch(self.k)
+        sketch.count = self.count
+        sketch.levels = list(self.levels)  # arrays are replaced, never changed
+        sketch._random = self._random
+        return sketch
+
+    @property
+    def exact(self):
+        return len(self.levels) <= 1
+
+    def __len__(self):
+        return sum(len(level) for level in self.levels)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def _push(self, level, values):
+        if level == len(self.levels):
+            self.levels.append(values)
+        else:
+            self.levels[level] = np.concatenate((self.levels[level], values))
+
+    def add(self, values):
+        if len(values):
+            self.count += len(values)
+            self._push(0, values)
+            self._compress()
+
+    def merge(self, other):
+        for level, values in enumerate(other.levels):
+            self._push(level, values)
+        self.count += other.count
+        self._compress()
+
+    def _compress(self):
+        """Halve full levels into the next one until every level fits."""
+        level = 0
+        while level < len(self.levels):
+            values = self.levels[level]
+            if len(values) <= self._capacity(level):
+                level += 1
+                continue
+            values = np.sort(values, kind="stable")  # sorted runs merge fast
+            keep = len(values) % 2  # an odd one out stays behind
+            self.levels[level] = values[:keep]
+            offset = keep + self._random.getrandbits(1)
+            self._push(level + 1, values[offset::2])
+            level = 0  # a new top level shrinks the capacities below it
+
+    def quantiles(self, qs):
+        if not self.count:
+            return [math.nan for _ in qs]
+        if self.exact:
+            return np.quantile(self.levels[0], qs).tolist()
+        values = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [np.full(len(level), 1 << h) for h, level in enumerate(self.levels)]
+        )
+        order = np.argsort(values, kind="stable")
+        ranks = np.cumsum(weights[order])
+        at = np.searchsorted(ranks, np.asarray(qs) * ranks[-1])
+        return values[order][np.minimum(at, len(values) - 1)].tolist()
+
+
+# --------------------------------------------------------------------------- #
+#  Histogram                                                                  #
+# --------------------------------------------------------------------------- #
+def _finest_width(magnitude):
+    """The narrowest useful bin near ``magnitude``: about one float step."""
+    return math.ldexp(1.0, max(math.frexp(magnitude)[1] - 52, -1074))
+
+
+class StreamingHistogram:
+    """Bin i counts values in [i * width, (i + 1) * width)."""
+
+    def __init__(self, max_bins=MAX_BINS):
+        self.max_bins = max_bins
+        self.width = None
+        self.start = 0  # bin number of counts[0]
+        self.counts = None
+        self.low = math.inf
+        self.high = -math.inf
+
+    def copy(self):
+        histogram = StreamingHistogram(self.max_bins)
+        histogram.__dict__.update(self.__dict__)  # counts is replaced, not changed
+        return histogram
+
+    def _bins(self, low, high, width):
+        return math.floor(high / width) - math.floor(low / width) + 1
+
+    def _fit(self, low, high, width):
+        """The narrowest width >= ``width`` putting [low, high] in max_bins."""
+        spread = high / 2 - low / 2  # halved: cannot overflow
+        if spread > 0:
+            needed = math.ceil(math.log2(spread / (self.max_bins - 1))) + 1
+            width = max(width, math.ldexp(1.0, needed))
+        while self._bins(low, high, width) > self.max_bins:
+            width *= 2
+        return width
+
+    def _rebinned(self, width):
+        """(start, counts) of this histogram with bins ``width`` wide."""
+        if width == self.width:
+            return self.start, self.counts
+        shift = min(round(math.log2(width / self.width)), 62)
+        start = self.start >> shift
+        positions = (np.arange(len(self.counts)) + self.start) >> shift
+        counts = np.bincount(positions - start, weights=self.counts)
+        return start, counts.astype(np.int64)
+
+    def _combine(self, low, high, width, parts):
+        start = math.floor(low / width)
+        counts = np.zeros(self._bins(low, high, width), dtype=np.int64)
+        for part_start, part in parts:
+            at = part_start - start
+            counts[at : at + len(part)] += part
+        self.width, self.start, self.counts = width, start, counts
+        self.low, self.high = low, high
+
+    def add(self, values):
+        if not len(values):
+            return
+        low = min(self.low, float(values.min()))
+        high = max(self.high, float(values.max()))
+        width = self.width or _finest_width(max(abs(low), abs(high)))
+        width = self._fit(low, high, width)
+        parts = [] if self.counts is None else [self._rebinned(width)]
+        index = np.floor(values / width).astype(np.int64)
+        first = int(index.min())
+        parts.append((first, np.bincount(index - first)))
+        self._combine(low, high, width, parts)
+
+    def merge(self, other):
+        if other.counts is None:
+            return
+        if self.counts is None:
+            self.__dict__.update(other.copy().__dict__)
+            return
+        low, high = min(self.low, other.low), max(self.high, other.high)
+        width = self._fit(low, high, max(self.width, other.width))
+        parts = [self._rebinned(width), other._rebinned(width)]
+        self._combine(low, high, width, parts)
+
+    def rows(self, shown=SHOWN_BINS):
+        """[(left edge, right edge, count)] in at most ``shown`` rows."""
+        if self.counts is None:
+            return []
+        group = -(-len(self.counts) // shown)
+        counts = np.zeros(group * -(-len(self.counts) // group), dtype=np.int64)
+        counts[: len(self.counts)] = self.counts
+        totals = counts.reshape(-1, group).sum(axis=1)
+        edges = (self.start + group * np.arange(len(totals) + 1)) * self.width
+        return list(zip(edges[:-1].tolist(), edges[1:].tolist(), totals.tolist()))
+
+
+# --------------------------------------------------------------------------- #
+#  All of it                                                                  #
+# --------------------------------------------------------------------------- #
+class StreamStats:
+    def __init__(self):
+        self.moments = RunningMoments()
+        self.sketch = QuantileSketch()
+        self.histogram = StreamingHistogram()
+        self.skipped = 0  # NaN and infinities
+
+    @property
+    def count(self):
+        return self.moments.count
+
+    @traced("stats.add")
+    def add(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        finite = np.isfinite(values)
+        if not finite.all():
+            self.skipped += int(len(values) - finite.sum())
+            values = values[finite]
+        self.moments.add(values)
+        self.sketch.add(values)
+        self.histogram.add(values)
+
+    def merged(self, *others):
+        """A new StreamStats for this data followed by ``others``'."""
+        stats = StreamStats()
+        stats.moments.__dict__.update(self.moments.__dict__)
+        stats.sketch = self.sketch.copy()
+        stats.histogram = self.histogram.copy()
+        stats.skipped = self.skipped
+        for other in others:
+            stats.moments.merge(other.moments)
+            stats.sketch.merge(other.sketch)
+            stats.histogram.merge(other.histogram)
+            stats.skipped += other.skipped
+        return stats
+
+
+def format_summary(stats):
+    """The Statistics mode's result text."""
+    moments = stats.moments
+    if not moments.count:
+        return "No data"
+    lines = [f"count     {moments.count:,}"]
+    if stats.skipped:
+        lines[0] += f"  ({stats.skipped:,} NaN/inf skipped)"
+    lines += [
+        f"mean      {moments.mean:.10g}",
+        f"std dev   {math.sqrt(moments.variance):.10g}  (n-1)",
+        f"          {math.sqrt(moments.population_variance):.10g}  (n)",
+        f"variance  {moments.variance:.10g}  (n-1)",
+        f"min       {moments.min:.10g}",
+        f"max       {moments.max:.10g}",
+        "",
+        "quantiles" if stats.sketch.exact else "quantiles (approximate)",
+    ]
+    for q, value in zip(QUANTILES, stats.sketch.quantiles(QUANTILES)):
+        lines.append(f"  {q:>4.0%}    {value:.8g}")
+    lines += ["", "histogram"]
+    rows = stats.histogram.rows()
+    peak = max(count for _, _, count in rows) or 1
+    for left, right, count in rows:
+        bar = "█" * round(BAR_WIDTH * count / peak)
+        lines.append(f"  {left:>10.4g} … {right:<10.4g} {bar} {count:,}")
+    return "\n".join(lines)
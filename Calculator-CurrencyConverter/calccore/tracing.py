@@ -0,0 +1,204 @@
+import atexit
+import functools
+import inspect
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+
+# --------------------------------------------------------------------------- #
+#  TRACING SPANS, EXPORTED AS A CHROME TRACE                                  #
+# --------------------------------------------------------------------------- #
+# Off unless the process starts with --trace=FILE or CALC_TRACE=FILE; then
+# every span (a named, timed slice with attributes) is kept in memory and the
+# whole trace is written to FILE at exit, in the Chrome trace event format
+# that chrome://tracing and https://ui.perfetto.dev open.
+#
+#   @traced("calc.emi", "principal")        # whole function, chosen args
+#   with span("http.body") as s:            # a block; s.set(bytes=...)
+#
+# Spans on one thread nest by time.  Work handed to another thread is linked
+# with a flow arrow: handoff() in the sending span, follow(token) in the
+# receiving one.
+#
+# Disabled, @traced returns the function itself and span() a shared no-op,
+# so the instrumentation costs nothing on hot paths.
+
+MAX_EVENTS = 1_000_000  # later events are counted, not kept
+ARG_CHARS = 80  # longest recorded argument text
+
+
+def trace_path(argv=None, environ=None):
+    """FILE from --trace=FILE or CALC_TRACE=FILE; None when not tracing."""
+    argv = sys.argv[1:] if argv is None else argv
+    environ = os.environ if environ is None else environ
+    for arg in argv:
+        if arg.startswith("--trace="):
+            return arg.split("=", 1)[1]
+    return environ.get("CALC_TRACE") or None
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+NO_SPAN = _NoSpan()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "attrs", "start")
+
+    def __init__(self, tracer, name, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, kind, exc, tb):
+        end = time.perf_counter_ns()
+        if kind is not None:
+            self.attrs["error"] = f"{kind.__name__}: {exc}"
+        self.tracer.complete(self.name, self.start, end, self.attrs)
+        return False
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+class Tracer:
+    def __init__(self, path=None):
+        self.path = path
+        self.events = []  # list.append is atomic: worker threads add freely
+        self.dropped = 0
+        self.pid = os.getpid()
+        self.origin = time.perf_counter_ns()
+        self.flow_ids = itertools.count(1)
+        self.threads = {}  # ident -> name, for the viewer's track labels
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def span(self, name, **attrs):
+        return Span(self, name, attrs) if self.path is not None else NO_SPAN
+
+    def _add(self, event):
+        if len(self.events) >= MAX_EVENTS:
+            self.dropped += 1
+            return
+        tid = threading.get_ident()
+        if tid not in self.threads:
+            self.threads[tid] = threading.current_thread().name
+        event["pid"], event["tid"] = self.pid, tid
+        self.events.append(event)
+
+    def complete(self, name, start, end, attrs):
+        self._add(
+            {
+                "name": name,
+                "cat": name.partition(".")[0],
+                "ph": "X",
+                "ts": (start - self.origin) / 1000,
+                "dur": (end - start) / 1000,
+                "args": attrs,
+            }
+        )
+
+    def _flow(self, phase, token):
+        event = {
+            "name": "handoff",
+            "cat": "flow",
+            "ph": phase,
+            "id": token,
+            "ts": (time.perf_counter_ns() - self.origin) / 1000,
+        }
+        if phase == "f":
+            event["bp"] = "e"  # bind to the span around it
+        self._add(event)
+
+    def handoff(self):
+        """Token for follow() on another thread; None when disabled."""
+        if self.path is None:
+            return None
+        token = next(self.flow_ids)
+        self._flow("s", token)
+        return token
+
+    def follow(self, token):
+        if token is not None and self.path is not None:
+            self._flow("f", token)
+
+    def export(self, path=None):
+        """Write the trace as Chrome trace JSON to ``path`` (default: FILE)."""
+        names = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self.pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in list(self.threads.items())
+        ]
+        with open(path or self.path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "traceEvents": names + self.events,
+                    "displayTimeUnit": "ms",
+                    "otherData": {"argv": sys.argv, "dropped": self.dropped},
+                },
+                f,
+            )
+
+
+TRACER = Tracer(trace_path())
+if TRACER.enabled:
+    atexit.register(TRACER.export)
+
+span = TRACER.span
+handoff = TRACER.handoff
+follow = TRACER.follow
+
+
+def _attribute(value):
+    if isinstance(value, (bool, int, float)) or value is None:
+        return value
+    return (value if isinstance(value, str) else repr(value))[:ARG_CHARS]
+
+
+def traced(name, *arg_names):
+    """Decorator: the call as one span, with ``arg_names`` as attributes."""
+
+    def decorate(function):
+        if not TRACER.enabled:
+            return function
+        signature = inspect.signature(function)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            attrs = {}
+            if arg_names:
+                bound = signature.bind_partial(*args, **kwargs).arguments
+                for arg in arg_names:
+                    if arg in bound:
+                        attrs[arg] = _attribute(bound[arg])
+            with Span(TRACER, name, attrs):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
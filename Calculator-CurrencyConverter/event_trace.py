@@ -0,0 +1,514 @@
+import argparse
+import functools
+import importlib
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+
+# --------------------------------------------------------------------------- #
+#  EVENT TRACES: RECORD A SESSION, REPLAY IT AS A BENCHMARK                   #
+# --------------------------------------------------------------------------- #
+# A trace is a JSON-lines file of *logical* events (button presses, mode and
+# tab switches, currency picks...), not of mouse coordinates, so it replays on
+# any window size.  The events are the same for every front end; each
+# adapter below translates them to and from its own handler calls:
+#
+#   press [key]   mode [mode]   tab [tab]   interest [tab]   loan []
+#   from [code]   to [code]     convert []  update []   (a manual refresh)
+#
+# so a session recorded on one front end replays on the others, as long as
+# they have its modes (the Kivy app has no Matrix/Statistics/Programmer).
+#
+#   python CCPFinal.py --record-trace=session.jsonl
+#   python event_trace.py replay session.jsonl [--app CCP] [--latency MS]
+#
+# Recording wraps the handler methods of the app's classes; the typed values
+# of the amount and financial fields are stored with the events that read
+# them.  Replay starts a local mock rate server (mock_rate_server.py), runs
+# the events back to back and reports per-event latency and allocations.
+
+TRACE_VERSION = 2  # 1: Kivy currency picks were one "currency" event
+SETTLE_TIMEOUT = 10.0  # seconds to wait for a rate fetch during replay
+
+# A recordable handler: which app attribute owns it, the class and method it
+# is defined as, how many positional args make up the event, extra arguments
+# that replay must pass (e.g. Kivy's dropdown), a filter for calls that are
+# not this event, and an attribute of the owner that is the event's last
+# argument (Kivy's interest handler reads the tab from current_tab).
+Hook = namedtuple(
+    "Hook", "part cls method nargs extra only state", defaults=(0, (), None, None)
+)
+
+
+class _ClosedDropDown:
+    """Stands in for the Kivy dropdown a selection handler dismisses."""
+
+    def dismiss(self):
+        pass
+
+
+def _show_msg(args, kwargs, name="show_msg"):
+    return bool(args[0] if args else kwargs.get(name))
+
+
+def _picking_from(args, kwargs):
+    return bool(args[1])
+
+
+def _picking_to(args, kwargs):
+    return not args[1]
+
+
+# ----------------------------------------------------------------------- #
+#  per front end: where the handlers and the typed-in fields live         #
+# ----------------------------------------------------------------------- #
+class _Adapter:
+    def __init__(self, hooks, converter, panels, amount, pending=None, modes=None):
+        self.hooks = hooks
+        self.converter = converter  # app attribute of the converter
+        self.panels = panels  # calculator attribute: tab -> panel
+        self.amount = amount  # converter attribute of the amount field
+        self.pending = pending  # converter counter of running fetches
+        self.modes = modes  # calculator modes, if not every one there is
+
+    def event_args(self, owner, hook, args):
+        """A handler call's positional ``args`` as event arguments."""
+        event_args = list(args[: hook.nargs])
+        if hook.state:
+            event_args.append(getattr(owner, hook.state))
+        return event_args
+
+    def call(self, app, event, args):
+        """Run ``event`` on ``app`` through this front end's handler."""
+        hook = self.hooks[event]
+        owner = getattr(app, hook.part)
+        if hook.state:
+            *args, value = args
+            setattr(owner, hook.state, value)
+        return getattr(owner, hook.method)(*args, *hook.extra)
+
+    def unsupported(self, events):
+        """Events of a trace this front end cannot replay, as text."""
+        missing = set()
+        for event in events:
+            name, args = event["event"], event.get("args", [])
+            if name not in self.hooks:
+                missing.add(f"{name} events")
+            elif name == "mode" and self.modes and args[0] not in self.modes:
+                missing.add(f"the {args[0]} mode")
+        return sorted(missing)
+
+    def panel(self, calculator, event, args):
+        if event == "loan":
+            tab = "Loan Calculator"
+        elif args:
+            tab = args[0]
+        else:
+            tab = calculator.current_tab  # Kivy tracks the tab itself
+        return getattr(calculator, self.panels)[tab]
+
+    def fields(self, owner, event, args):
+        """The typed values ``event`` is about to read."""
+        if event in ("interest", "loan"):
+            entries = self.panel(owner, event, args).entries
+            return {name: _get(entry) for name, entry in entries.items()}
+        if event == "convert":
+            return {"amount": _get(getattr(owner, self.amount))}
+        return None
+
+    def set_fields(self, owner, event, args, fields):
+        if not fields:
+            return
+        if event == "convert":
+            _set(getattr(owner, self.amount), fields["amount"])
+        else:
+            entries = self.panel(owner, event, args).entries
+            for name, value in fields.items():
+                _set(entries[name], value)
+
+    def settle(self, app):
+        """Let Tk finish the redraw (and any rate fetch) an event started."""
+        if not hasattr(app, "update_idletasks"):
+            return
+        app.update_idletasks()
+        converter = getattr(app, self.converter)
+        deadline = time.monotonic() + SETTLE_TIMEOUT
+        while getattr(converter, self.pending) and time.monotonic() < deadline:
+            app.update()
+            time.sleep(0.001)
+
+
+def _get(entry):
+    return entry.text if hasattr(entry, "text") else entry.get()
+
+
+def _set(entry, value):
+    if hasattr(entry, "text"):
+        entry.text = value
+    else:
+        entry.delete(0, "end")
+        entry.insert(0, value)
+
+
+_DROPDOWN = (_ClosedDropDown(),)
+
+ADAPTERS = {
+    "CCP": _Adapter(
+        {
+            "press": Hook("calculator", "CalculatorFrame", "button_press", 1),
+            "mode": Hook("calculator", "CalculatorFrame", "change_mode", 1),
+            "tab": Hook("calculator", "CalculatorFrame", "switch_tab", 1),
+            "interest": Hook("calculator", "CalculatorFrame", "calculate_interest", 1),
+            "loan": Hook("calculator", "CalculatorFrame", "calculate_loan"),
+            "from": Hook(
+                "converter", "CurrencyConverterFrame", "change_from_currency", 1
+            ),
+            "to": Hook("converter", "CurrencyConverterFrame", "change_to_currency", 1),
+            "convert": Hook("converter", "CurrencyConverterFrame", "convert"),
+            "update": Hook(
+                "converter", "CurrencyConverterFrame", "manual_update_rates"
+            ),
+        },
+        converter="converter",
+        panels="tab_panels",
+        amount="amount_entry",
+        pending="pending_fetches",
+    ),
+    "CCPFinal": _Adapter(
+        {
+            "press": Hook("calculator", "CalculatorFrame", "_press", 1),
+            "mode": Hook("calculator", "CalculatorFrame", "_switch_mode", 1),
+            "tab": Hook("calculator", "CalculatorFrame", "_switch_tab", 1),
+            "interest": Hook("calculator", "CalculatorFrame", "_calc_interest", 1),
+            "loan": Hook("calculator", "CalculatorFrame", "_calc_loan"),
+            "from": Hook("converter", "CurrencyConverterFrame", "_set_from", 1),
+            "to": Hook("converter", "CurrencyConverterFrame", "_set_to", 1),
+            "convert": Hook("converter", "CurrencyConverterFrame", "_convert"),
+            "update": Hook(
+                "converter",
+                "CurrencyConverterFrame",
+                "_update_rates",
+                extra=(True,),
+                only=_show_msg,
+            ),
+        },
+        converter="converter",
+        panels="_panels",
+        amount="amount_entry",
+        pending="_pending",
+    ),
+    "CalculatorCurrencyKivy": _Adapter(
+        {
+            "press": Hook("calculator", "CalculatorWidget", "press_button", 1),
+            "mode": Hook("calculator", "CalculatorWidget", "select_mode", 1, _DROPDOWN),
+            "tab": Hook("calculator", "CalculatorWidget", "select_tab", 1),
+            "interest": Hook(
+                "calculator",
+                "CalculatorWidget",
+                "calculate_interest",
+                state="current_tab",
+            ),
+            "loan": Hook("calculator", "CalculatorWidget", "calculate_loan"),
+            "from": Hook(
+                "currency_converter",
+                "CurrencyConverterWidget",
+                "select_currency",
+                1,
+                (True, *_DROPDOWN),
+                only=_picking_from,
+            ),
+            "to": Hook(
+                "currency_converter",
+                "CurrencyConverterWidget",
+                "select_currency",
+                1,
+                (False, *_DROPDOWN),
+                only=_picking_to,
+            ),
+            "convert": Hook(
+                "currency_converter", "CurrencyConverterWidget", "convert_currency"
+            ),
+            "update": Hook(
+                "currency_converter",
+                "CurrencyConverterWidget",
+                "update_rates",
+                extra=(True,),
+                only=_show_msg,
+            ),
+        },
+        converter="currency_converter",
+        panels="tab_panels",
+        amount="amount_input",
+        modes=("Basic", "Scientific", "Financial"),
+    ),
+}
+
+
+def app_name(app):
+    """Front-end name of ``app`` (its module file), also when run as __main__."""
+    module = sys.modules[type(app).__module__]
+    return os.path.splitext(os.path.basename(module.__file__))[0]
+
+
+# --------------------------------------------------------------------------- #
+#  RECORDING                                                                  #
+# --------------------------------------------------------------------------- #
+class TraceRecorder:
+    def __init__(self, app, path):
+        self.name = app_name(app)
+        self.adapter = ADAPTERS[self.name]
+        self.file = open(path, "w", encoding="utf-8", buffering=1)  # per line
+        self.start = time.perf_counter()
+        self.depth = 0  # > 0 while a recorded handler runs
+        self.write({"trace": TRACE_VERSION, "app": self.name, "started": time.time()})
+
+        # Kivy picks both currencies with one method: its hooks share a wrapper
+        module = sys.modules[type(app).__module__]
+        methods = {}
+        for event, hook in self.adapter.hooks.items():
+            methods.setdefault((hook.cls, hook.method), []).append((event, hook))
+        for (cls_name, name), hooks in methods.items():
+            cls = getattr(module, cls_name)
+            setattr(cls, name, self._wrap(hooks, getattr(cls, name)))
+
+    @classmethod
+    def from_argv(cls, app, argv=None):
+        """Recorder for ``app`` if --record-trace=FILE was given."""
+        argv = sys.argv[1:] if argv is None else argv
+        for arg in argv:
+            if arg.startswith("--record-trace="):
+                return cls(app, arg.split("=", 1)[1])
+        return None
+
+    def _wrap(self, hooks, method):
+        @functools.wraps(method)
+        def recorded(owner, *args, **kwargs):
+            # Only the outermost call is a user action: mode switches that
+            # rebuild a tab or currency picks that refresh rates are not
+            # events of their own.
+            if self.depth == 0:
+                for event, hook in hooks:
+                    if hook.only is None or hook.only(args, kwargs):
+                        self.record(owner, event, hook, args)
+                        break
+            self.depth += 1
+            try:
+                return method(owner, *args, **kwargs)
+            finally:
+                self.depth -= 1
+
+        return recorded
+
+    def record(self, owner, event, hook, args):
+        event_args = self.adapter.event_args(owner, hook, args)
+        record = {
+            "t": round(time.perf_counter() - self.start, 4),
+            "event": event,
+            "args": event_args,
+        }
+        fields = self.adapter.fields(owner, event, event_args)
+        if fields:
+            record["fields"] = fields
+        self.write(record)
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def load_trace(path):
+    """(header, events) of a trace file."""
+    with open(path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    if not lines or lines[0].get("trace") != TRACE_VERSION:
+        raise ValueError(f"{path} is not an event trace")
+    return lines[0], lines[1:]
+
+
+# --------------------------------------------------------------------------- #
+#  REPLAY                                                                     #
+# --------------------------------------------------------------------------- #
+class ReplayStats:
+    """Latency (ms) and allocation (bytes) samples per event type."""
+
+    def __init__(self):
+        self.samples = {}  # event -> [(ms, allocated, peak)]
+
+    def add(self, event, ms, allocated=0, peak=0):
+        self.samples.setdefault(event, []).append((ms, allocated, peak))
+
+    def summary(self):
+        result = {}
+        for event, samples in sorted(self.samples.items()):
+            times = sorted(ms for ms, _, _ in samples)
+            allocated = sum(a for _, a, _ in samples)
+            result[event] = {
+                "count": len(samples),
+                "mean_ms": round(sum(times) / len(times), 3),
+                "p95_ms": round(times[min(len(times) - 1, len(times) * 95 // 100)], 3),
+                "max_ms": round(times[-1], 3),
+                "mean_kib": round(allocated / len(samples) / 1024, 1),
+                "peak_kib": round(max(p for _, _, p in samples) / 1024, 1),
+            }
+        return result
+
+    def report(self, out=sys.stdout):
+        print(
+            f"{'event':<10}{'count':>7}{'mean ms':>10}{'p95 ms':>10}{'max ms':>10}"
+            f"{'mean KiB':>10}{'peak KiB':>10}",
+            file=out,
+        )
+        for event, s in self.summary().items():
+            print(
+                f"{event:<10}{s['count']:>7}{s['mean_ms']:>10.2f}{s['p95_ms']:>10.2f}"
+                f"{s['max_ms']:>10.2f}{s['mean_kib']:>10.1f}{s['peak_kib']:>10.1f}",
+                file=out,
+            )
+
+
+def isolate(latency):
+    """Point the app at a fresh mock server, away from the user's rates."""
+    # Before the app (and rate_snapshot) are imported: the API URL and the
+    # cache directory are read at import time.
+    os.environ["CALC_SHARED_RATES"] = "0"
+    os.environ["XDG_CACHE_HOME"] = tempfile.mkdtemp(prefix="calc-replay-")
+    os.environ["KIVY_NO_ARGS"] = "1"
+    from mock_rate_server import start_mock_server
+
+    server = start_mock_server(latency=latency)
+    os.environ["CALC_RATES_URL"] = server.url
+    return server
+
+
+def _play(app, adapter, event, allocations, stats):
+    name, args = event["event"], event.get("args", [])
+    owner = getattr(app, adapter.hooks[name].part)
+    adapter.set_fields(owner, name, args, event.get("fields"))
+
+    if allocations:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    adapter.call(app, name, args)
+    adapter.settle(app)
+    ms = (time.perf_counter() - start) * 1000
+    if allocations:
+        current, peak = tracemalloc.get_traced_memory()
+        stats.add(event["event"], ms, current - before, peak - before)
+    else:
+        stats.add(event["event"], ms)
+
+
+def replay(path, name=None, latency=0.0, allocations=True):
+    """Run a trace against a fresh app; returns ReplayStats."""
+    header, events = load_trace(path)
+    name = name or header["app"]
+    adapter = ADAPTERS[name]
+    missing = adapter.unsupported(events)
+    if missing:
+        raise ValueError(f"{name} cannot replay {', '.join(missing)}")
+    server = isolate(latency)
+    module = importlib.import_module(name)
+    stats = ReplayStats()
+    try:
+        if name == "CalculatorCurrencyKivy":
+            _replay_kivy(module, adapter, events, allocations, stats)
+        else:
+            _replay_tk(module, adapter, events, allocations, stats)
+    finally:
+        server.shutdown()
+    return stats
+
+
+def _replay_tk(module, adapter, events, allocations, stats):
+    app = module.FinancialApp()
+    # Wait for the deferred converter and its first rate download
+    deadline = time.monotonic() + SETTLE_TIMEOUT
+    while getattr(app, adapter.converter) is None and time.monotonic() < deadline:
+        app.update()
+    adapter.settle(app)
+
+    if allocations:
+        tracemalloc.start()
+    try:
+        for event in events:
+            _play(app, adapter, event, allocations, stats)
+    finally:
+        if allocations:
+            tracemalloc.stop()
+        app.destroy()
+
+
+def _replay_kivy(module, adapter, events, allocations, stats):
+    """One event per frame, timed from the handler call to its return."""
+    from kivy.clock import Clock
+
+    app = module.FinancialApp()
+    queue = iter(events)
+
+    def step(dt):
+        event = next(queue, None)
+        if event is None:
+            app.stop()
+            return False
+        _play(app, adapter, event, allocations, stats)
+
+    if allocations:
+        tracemalloc.start()
+    Clock.schedule_once(lambda dt: Clock.schedule_interval(step, 0), 1)
+    try:
+        app.run()
+    finally:
+        if allocations:
+            tracemalloc.stop()
+
+
+# --------------------------------------------------------------------------- #
+#  python event_trace.py show TRACE                                           #
+#  python event_trace.py replay TRACE [--app NAME] [--latency MS]             #
+#                                    [--no-alloc] [--json FILE]               #
+# --------------------------------------------------------------------------- #
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="event_trace.py")
+    commands = parser.add_subparsers(dest="command", required=True)
+    show = commands.add_parser("show", help="summarize a trace")
+    show.add_argument("trace")
+    play = commands.add_parser("replay", help="replay a trace as a benchmark")
+    play.add_argument("trace")
+    play.add_argument("--app", choices=sorted(ADAPTERS), help="default: the recorder")
+    play.add_argument("--latency", type=float, default=0.0, metavar="MS")
+    play.add_argument("--no-alloc", dest="allocations", action="store_false")
+    play.add_argument("--json", metavar="FILE", help="write the summary here")
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    args = parse_args(argv)
+    if args.command == "show":
+        header, events = load_trace(args.trace)
+        counts = {}
+        for event in events:
+            counts[event["event"]] = counts.get(event["event"], 0) + 1
+        duration = events[-1]["t"] if events else 0.0
+        print(f"{header['app']}: {len(events)} events over {duration:.1f} s")
+        for event, count in sorted(counts.items()):
+            print(f"  {event:<10}{count:>6}")
+        return 0
+
+    try:
+        stats = replay(args.trace, args.app, args.latency / 1000, args.allocations)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    stats.report()
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(stats.summary(), f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,95 @@
+import importlib
+import sys
+from functools import partial
+
+from calccore import bench
+from tk_modes import EXTRA_MODES
+
+# --------------------------------------------------------------------------- #
+#  WINDOW CONSTRUCTION BENCHMARKS FOR THE TK FRONT ENDS                       #
+# --------------------------------------------------------------------------- #
+# Adds to calccore.bench, and takes the same options, the time to create each
+# app's main window and to build each calculator mode's widgets from scratch
+# (what the first switch to a mode costs).  The converter pane is left out:
+# it loads after the first paint and needs rates.  Without a display these
+# benchmarks are reported as skipped and the core ones still run.
+#
+#   python gui_bench.py "gui.*" --save gui.json
+#   python gui_bench.py --compare base.json   # the whole suite
+
+APPS = {
+    # module: (builder for Basic/Scientific, builder for Financial)
+    "CCP": ("create_standard_ui", "create_financial_ui"),
+    "CCPFinal": ("_standard_ui", "_financial_ui"),
+}
+MODES = ("Basic", "Scientific", "Financial", *EXTRA_MODES)
+
+_apps = {}  # module -> one open FinancialApp shared by its mode benchmarks
+
+
+def _module(name):
+    import tkinter as tk
+
+    try:
+        tk.Tcl().eval("package require Tk")
+    except tk.TclError as exc:
+        raise bench.Skip(str(exc).splitlines()[0]) from None
+    return importlib.import_module(name)
+
+
+def _app(name):
+    app = _apps.get(name)
+    if app is None:
+        app = _apps[name] = _module(name).FinancialApp()
+        app.withdraw()
+        app.update_idletasks()
+    return app
+
+
+def _window(name):
+    def setup():
+        module = _module(name)
+
+        def call():
+            app = module.FinancialApp()
+            app.update_idletasks()
+            app.destroy()
+
+        return call
+
+    return setup
+
+
+def _mode(name, mode):
+    def setup():
+        app = _app(name)
+        standard, financial = APPS[name]
+        calculator = app.calculator
+        if mode == "Financial":
+            build = getattr(calculator, financial)
+        elif mode in EXTRA_MODES:
+            build = partial(
+                EXTRA_MODES[mode], calculator.container, calculator.mode_kit
+            )
+        else:
+            build = partial(getattr(calculator, standard), mode)
+
+        def call():
+            frame = build()
+            frame.pack(expand=True, fill="both")
+            app.update_idletasks()  # geometry too, as on a real switch
+            frame.destroy()
+
+        return call
+
+    return setup
+
+
+for _name in APPS:
+    bench.bench(f"gui.{_name}.window", number=3)(_window(_name))
+    for _mode_name in MODES:
+        bench.bench(f"gui.{_name}.{_mode_name}", number=20)(_mode(_name, _mode_name))
+
+
+if __name__ == "__main__":
+    sys.exit(bench.main(sys.argv[1:]))
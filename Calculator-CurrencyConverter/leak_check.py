@@ -0,0 +1,197 @@
+import argparse
+import gc
+import importlib
+import sys
+import time
+from collections import Counter, namedtuple
+
+# --------------------------------------------------------------------------- #
+#  LEAK CHECK FOR THE TK FRONT ENDS                                           #
+# --------------------------------------------------------------------------- #
+# Screens (calculator modes and financial tabs) are meant to be built once and
+# reused, so switching back and forth must not leave anything behind.  This
+# counts what a rebuild would leak:
+#
+#   widgets     Tk widgets alive on the Tcl side (destroyed ones are gone)
+#   variables   global Tcl variables (every StringVar is one)
+#   commands    Tcl commands, including one per Python callback / lambda
+#   objects     Python objects the garbage collector tracks
+#
+#   python CCPFinal.py --leak-check            # a line on stderr per sample
+#   python leak_check.py soak CCP --cycles 100 # drive the screens, report growth
+
+SAMPLE_SECONDS = 30
+OBJECT_SLACK = 1.0  # objects per cycle still counted as noise (caches, floats)
+
+Counts = namedtuple("Counts", "widgets variables commands objects")
+
+
+def count_widgets(root):
+    """Widgets in the Tcl widget tree below (and including) ``root``."""
+    tk = root.tk
+    todo, seen = [str(root)], 0
+    while todo:
+        path = todo.pop()
+        seen += 1
+        todo.extend(tk.splitlist(tk.call("winfo", "children", path)))
+    return seen
+
+
+def sample(root):
+    """Counts for the whole interpreter, after a full collection."""
+    gc.collect()
+    return Counts(
+        widgets=count_widgets(root),
+        variables=len(root.tk.splitlist(root.tk.call("info", "globals"))),
+        commands=len(root.tk.splitlist(root.tk.call("info", "commands"))),
+        objects=len(gc.get_objects()),
+    )
+
+
+def type_counts():
+    gc.collect()
+    return Counter(type(obj).__name__ for obj in gc.get_objects())
+
+
+def growth(before, after):
+    return Counts(*(b - a for a, b in zip(before, after)))
+
+
+def format_counts(counts, delta=None):
+    parts = []
+    for name, value in counts._asdict().items():
+        change = getattr(delta, name, 0) if delta is not None else 0
+        parts.append(f"{name}={value}" + (f" ({change:+d})" if change else ""))
+    return " ".join(parts)
+
+
+def screen_of(app):
+    """Name of the calculator screen on show, e.g. "Financial/Loan Calculator"."""
+    calculator = getattr(app, "calculator", None)
+    if calculator is None:
+        return "starting"
+    mode = calculator.mode.get()
+    if mode == "Financial":
+        mode += "/" + calculator.current_tab.get()
+    return mode
+
+
+# --------------------------------------------------------------------------- #
+#  --leak-check: sample a running app                                         #
+# --------------------------------------------------------------------------- #
+class LeakMonitor:
+    """Periodic counts, compared with the first visit to the same screen."""
+
+    def __init__(self, root, interval=SAMPLE_SECONDS, out=sys.stderr):
+        self.root = root
+        self.interval_ms = int(interval * 1000)
+        self.out = out
+        self.first = {}  # screen -> Counts of its first sample
+        root.after(self.interval_ms, self.tick)
+
+    @classmethod
+    def from_argv(cls, root, argv=None):
+        """Monitor for ``root`` if --leak-check was given."""
+        argv = sys.argv[1:] if argv is None else argv
+        return cls(root) if "--leak-check" in argv else None
+
+    def tick(self):
+        screen = screen_of(self.root)
+        counts = sample(self.root)
+        first = self.first.setdefault(screen, counts)
+        print(
+            f"leak-check {time.strftime('%H:%M:%S')} {screen}: "
+            f"{format_counts(counts, growth(first, counts))}",
+            file=self.out,
+        )
+        self.root.after(self.interval_ms, self.tick)
+
+
+# --------------------------------------------------------------------------- #
+#  soak test: the same screen switches, many times                            #
+# --------------------------------------------------------------------------- #
+# (event, args) in event_trace terms, so the cycle runs on either Tk app.  No
+# calculator key presses: the undo history they fill is bounded but would
+# read as growth here.
+CYCLE = [
+    ("mode", ["Scientific"]),
+    ("mode", ["Financial"]),
+    ("tab", ["Compound Interest"]),
+    ("interest", ["Compound Interest"]),
+    ("tab", ["Loan Calculator"]),
+    ("loan", []),
+    ("tab", ["Simple Interest"]),
+    ("mode", ["Basic"]),
+    ("to", ["EUR"]),
+    ("convert", []),
+    ("to", ["INR"]),
+]
+
+
+def run_cycle(app, adapter):
+    for event, args in CYCLE:
+        adapter.call(app, event, args)
+        app.update()
+
+
+def soak(name, cycles=50, warmup=3, out=sys.stdout):
+    """Drive ``name``'s screens ``cycles`` times; True if nothing grew."""
+    from event_trace import ADAPTERS, isolate
+
+    adapter = ADAPTERS[name]
+    server = isolate(0.0)
+    app = importlib.import_module(name).FinancialApp()
+    try:
+        while app.converter is None:
+            app.update()
+        adapter.settle(app)
+
+        for _ in range(warmup):  # first visits build and cache every screen
+            run_cycle(app, adapter)
+        start, types = sample(app), type_counts()
+        print(f"after {warmup} warm-up cycles: {format_counts(start)}", file=out)
+
+        for cycle in range(1, cycles + 1):
+            run_cycle(app, adapter)
+            if cycle % max(1, cycles // 5) == 0 or cycle == cycles:
+                counts = sample(app)
+                delta = growth(start, counts)
+                print(f"cycle {cycle:>5}: {format_counts(counts, delta)}", file=out)
+        end = sample(app)
+        grown = (type_counts() - types).most_common(10)
+    finally:
+        app.destroy()
+        server.shutdown()
+
+    delta = growth(start, end)
+    leaked = any(delta[:3]) or delta.objects / cycles > OBJECT_SLACK
+    print(
+        f"growth per cycle: {delta.widgets / cycles:.2f} widgets, "
+        f"{delta.variables / cycles:.2f} variables, "
+        f"{delta.commands / cycles:.2f} commands, "
+        f"{delta.objects / cycles:.2f} objects",
+        file=out,
+    )
+    if grown:
+        print("types that grew: " + ", ".join(f"{t} +{n}" for t, n in grown), file=out)
+    print("LEAK" if leaked else "OK", file=out)
+    return not leaked
+
+
+# --------------------------------------------------------------------------- #
+#  python leak_check.py soak [CCP|CCPFinal] [--cycles N]                      #
+# --------------------------------------------------------------------------- #
+def main(argv):
+    parser = argparse.ArgumentParser(prog="leak_check.py")
+    parser.add_argument("command", choices=["soak"])
+    parser.add_argument(
+        "app", nargs="?", choices=["CCP", "CCPFinal"], default="CCPFinal"
+    )
+    parser.add_argument("--cycles", type=int, default=50, metavar="N")
+    args = parser.parse_args(argv)
+    name, cycles = args.app, args.cycles
+    return 0 if soak(name, cycles) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,99 @@
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from calccore.rate_snapshot import BUNDLED_PATH, load
+
+# --------------------------------------------------------------------------- #
+#  LOCAL STAND-IN FOR THE RATE API                                            #
+# --------------------------------------------------------------------------- #
+# Serves /v4/latest/<BASE> in the real API's shape from a rate snapshot, with
+# an optional artificial delay.  Point an app at it with
+#
+#   CALC_RATES_URL=http://127.0.0.1:8765/v4/latest/ python CCPFinal.py
+
+
+class MockRateServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, snapshot_path=BUNDLED_PATH, latency=0.0):
+        super().__init__(address, _Handler)
+        self.table = load(snapshot_path)
+        self.latency = latency
+        self.payloads = {}  # base -> encoded response
+        self.requests = 0
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v4/latest/"
+
+    def payload(self, base):
+        body = self.payloads.get(base)
+        if body is None:
+            table = self.table.rebase(base)
+            body = json.dumps(
+                {
+                    "provider": "mock_rate_server",
+                    "base": base,
+                    "date": table.date,
+                    "time_last_updated": int(table.timestamp),
+                    "rates": {code: table[code] for code in table},
+                }
+            ).encode()
+            self.payloads[base] = body
+        return body
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        prefix = "/v4/latest/"
+        base = self.path[len(prefix) :] if self.path.startswith(prefix) else ""
+        if base not in server.table:
+            self.send_error(404, "Unknown base currency")
+            return
+        if server.latency:
+            time.sleep(server.latency)
+        body = server.payload(base)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep benchmark output clean
+
+
+def start_mock_server(port=0, latency=0.0, snapshot_path=BUNDLED_PATH):
+    """Serve on 127.0.0.1 from a background thread; returns the server."""
+    server = MockRateServer(("127.0.0.1", port), snapshot_path, latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# --------------------------------------------------------------------------- #
+#  python mock_rate_server.py [PORT] [LATENCY_MS]                             #
+# --------------------------------------------------------------------------- #
+def main(argv):
+    parser = argparse.ArgumentParser(prog="mock_rate_server.py")
+    parser.add_argument("port", nargs="?", type=int, default=8765)
+    parser.add_argument("latency_ms", nargs="?", type=float, default=0.0)
+    args = parser.parse_args(argv)
+    port, latency = args.port, args.latency_ms / 1000
+    server = MockRateServer(("127.0.0.1", port), latency=latency)
+    print(f"Serving {len(server.table)} currencies at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
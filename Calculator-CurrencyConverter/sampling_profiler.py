@@ -0,0 +1,190 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# --------------------------------------------------------------------------- #
+#  ON-DEMAND SAMPLING PROFILER                                                #
+# --------------------------------------------------------------------------- #
+# Ctrl+Shift+P in a running app starts sampling, the same keys again stop it
+# and write the samples next to the app as calc-profile-<time>.folded, one
+# "thread;outer;...;inner count" line per distinct stack.  That is the input
+# of flamegraph.pl, inferno and speedscope.
+#
+# A daemon thread reads every thread's stack (sys._current_frames) every
+# INTERVAL seconds, so the UI thread, the rate download threads and anything
+# else running are all covered and nothing has to be restarted under a
+# profiler.  Idle time shows up as the Tk / Kivy main loop waiting.
+#
+#   python sampling_profiler.py top calc-profile-*.folded   # hottest functions
+
+INTERVAL = 0.01  # seconds between samples (100 Hz)
+MAX_DEPTH = 200  # frames kept per stack, innermost first
+TOP = 20
+
+
+class SamplingProfiler:
+    def __init__(self, interval=INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()  # folded stack -> samples
+        self.samples = 0
+        self.started = None
+        self.elapsed = 0.0
+        self._labels = {}  # code object -> frame label
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self):
+        self.stacks.clear()
+        self.samples = 0
+        self.started = time.perf_counter()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.elapsed = time.perf_counter() - self.started
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    thread = names.get(ident, f"thread-{ident}")
+                    self.stacks[self._fold(thread, frame)] += 1
+            self.samples += 1
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            filename = os.path.basename(code.co_filename)
+            label = f"{code.co_name} ({filename}:{code.co_firstlineno})"
+            label = label.replace(";", ":")  # the folded format's separator
+            self._labels[code] = label
+        return label
+
+    def _fold(self, thread, frame):
+        labels = []
+        while frame is not None and len(labels) < MAX_DEPTH:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        labels.append(thread.replace(";", ":"))
+        return ";".join(reversed(labels))
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+        return path
+
+
+# --------------------------------------------------------------------------- #
+#  THE HIDDEN SHORTCUT                                                        #
+# --------------------------------------------------------------------------- #
+class ProfilerToggle:
+    """Start / stop a SamplingProfiler; every stop writes a .folded file."""
+
+    def __init__(self, directory=None, on_change=None, out=sys.stderr):
+        self.profiler = SamplingProfiler()
+        self.directory = directory or os.getcwd()
+        self.on_change = on_change  # called with True (started) / False
+        self.out = out
+        self.last_path = None
+
+    @classmethod
+    def install_tk(cls, root):
+        """Bind Ctrl+Shift+P on a Tk root; the title shows while sampling."""
+        title = root.title()
+
+        def show(running):
+            root.title(f"{title} [profiling]" if running else title)
+
+        toggle = cls(on_change=show)
+        root.bind("<Control-P>", lambda event: toggle.toggle(), add="+")
+        return toggle
+
+    @classmethod
+    def install_kivy(cls, window):
+        """Bind Ctrl+Shift+P on the Kivy Window."""
+        toggle = cls()
+
+        def on_key_down(window, key, scancode, codepoint, modifiers):
+            if codepoint in ("p", "P") and {"ctrl", "shift"} <= set(modifiers):
+                toggle.toggle()
+                return True
+            return False
+
+        window.bind(on_key_down=on_key_down)
+        return toggle
+
+    def toggle(self):
+        profiler = self.profiler
+        if not profiler.running:
+            profiler.start()
+            print("Profiling: Ctrl+Shift+P again to stop", file=self.out)
+        else:
+            profiler.stop()
+            name = time.strftime("calc-profile-%Y%m%d-%H%M%S.folded")
+            self.last_path = profiler.write(os.path.join(self.directory, name))
+            print(
+                f"Profile: {profiler.samples} samples over {profiler.elapsed:.1f} s "
+                f"written to {self.last_path}",
+                file=self.out,
+            )
+        if self.on_change is not None:
+            self.on_change(profiler.running)
+
+
+# --------------------------------------------------------------------------- #
+#  python sampling_profiler.py top FILE.folded                                #
+# --------------------------------------------------------------------------- #
+def read_folded(path):
+    stacks = Counter()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack:
+                stacks[stack] += int(count)
+    return stacks
+
+
+def top(stacks, limit=TOP, out=sys.stdout):
+    """Functions by samples on top of the stack (self) and anywhere (total)."""
+    own, total = Counter(), Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(";")[1:]  # [0] is the thread
+        if not frames:
+            continue
+        own[frames[-1]] += count
+        for frame in set(frames):
+            total[frame] += count
+    samples = sum(stacks.values()) or 1
+    print(f"{'self':>7}{'total':>8}  function", file=out)
+    for frame, count in own.most_common(limit):
+        print(
+            f"{count / samples:>7.1%}{total[frame] / samples:>8.1%}  {frame}",
+            file=out,
+        )
+
+
+def main(argv):
+    if len(argv) != 2 or argv[0] != "top":
+        print("usage: sampling_profiler.py top FILE.folded", file=sys.stderr)
+        return 2
+    top(read_folded(argv[1]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
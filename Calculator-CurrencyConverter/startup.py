@@ -0,0 +1,65 @@
+import sys
+import time
+
+# --------------------------------------------------------------------------- #
+#  COLD-START HELPERS                                                         #
+# --------------------------------------------------------------------------- #
+# Import this module first: the profile clock starts when it is loaded, so
+# the "imports" phase covers everything the entry point imports after it.
+
+_T0 = time.perf_counter()
+_MODULES0 = len(sys.modules)
+
+
+class StartupProfile:
+    """Wall-clock breakdown of startup, printed with ``--profile-startup``."""
+
+    def __init__(self, enabled=None):
+        if enabled is None:
+            enabled = "--profile-startup" in sys.argv[1:]
+        self.enabled = enabled
+        self.marks = []  # (phase, end time, modules loaded so far)
+        self.reported = False
+
+    def mark(self, phase):
+        """Close the phase that ran since the previous mark."""
+        if self.enabled:
+            self.marks.append((phase, time.perf_counter(), len(sys.modules)))
+
+    def report(self, out=None, budgets=None):
+        """Print the phases; ``budgets`` maps a phase to its limit in total ms."""
+        if not self.enabled or self.reported:
+            return True
+        self.reported = True
+        out = out or sys.stderr
+        print(f"{'phase':<16}{'ms':>9}{'total ms':>10}{'modules':>9}", file=out)
+        start, modules = _T0, _MODULES0
+        for phase, end, loaded in self.marks:
+            print(
+                f"{phase:<16}{(end - start) * 1000:>9.1f}"
+                f"{(end - _T0) * 1000:>10.1f}{loaded - modules:>+9d}",
+                file=out,
+            )
+            start, modules = end, loaded
+        deferred = [m for m in ("numpy", "requests") if _loaded(m)]
+        print(f"heavy modules loaded: {', '.join(deferred) or 'none'}", file=out)
+
+        within = True
+        totals = {phase: (end - _T0) * 1000 for phase, end, _ in self.marks}
+        for phase, budget in (budgets or {}).items():
+            if phase in totals:
+                over = totals[phase] > budget
+                within = within and not over
+                verdict = "OVER BUDGET" if over else "ok"
+                print(
+                    f"{phase}: {totals[phase]:.1f} ms of {budget} ms budget, {verdict}",
+                    file=out,
+                )
+        return within
+
+
+def _loaded(name):
+    """True once a module (lazy or not) has actually executed."""
+    from calccore.lazy import is_loaded  # not before _T0: it is being timed
+
+    return is_loaded(name)
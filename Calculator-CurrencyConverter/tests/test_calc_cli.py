@@ -0,0 +1,79 @@
+import io
+
+import pytest
+
+import calc_cli
+from calc_cli import parse_args, run, run_chunk
+from calccore import RateStore
+from calccore.rate_snapshot import RateTable
+
+LINES = ["2^10+sqrt(16)\n", "\n", "1/0\n", "7 % 3\n"]
+
+
+def test_one_output_line_per_input_line():
+    text, errors = run_chunk("evaluate", LINES)
+    assert text == "1028.0\n\nError\n1\n"
+    assert [index for index, _ in errors] == [2]
+
+
+@pytest.mark.parametrize(
+    "kind, line, output",
+    [
+        ("interest", "1000 5 2", "100.00\t1100.00"),
+        ("interest", "1000, 5, 2, 1", "102.50\t1102.50"),
+        ("emi", "250000 8.5 20", "2169.56"),
+        ("convert", "10 usd eur", "5.00"),
+    ],
+)
+def test_kinds(monkeypatch, kind, line, output):
+    store = RateStore(share=False)
+    store.store("USD", RateTable.from_rates("USD", {"EUR": 0.5}), save=False)
+    monkeypatch.setattr(calc_cli, "_store", store)
+    assert run_chunk(kind, [line]) == (output + "\n", [])
+
+
+@pytest.mark.parametrize("line", ["1000 5", "1000 5 2 12 1", "x 5 2"])
+def test_bad_fields_are_errors(line):
+    text, errors = run_chunk("interest", [line])
+    assert text == "Error\n"
+    assert len(errors) == 1
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_run_reports_failed_lines_by_file_and_number(tmp_path, monkeypatch, jobs):
+    read_chunks = calc_cli.read_chunks
+    monkeypatch.setattr(calc_cli, "read_chunks", lambda paths: read_chunks(paths, 3))
+    first, second = tmp_path / "a.txt", tmp_path / "b.txt"
+    first.write_text("".join(LINES * 3))
+    second.write_text("x\n")
+    out, err = io.StringIO(), io.StringIO()
+    assert len(list(calc_cli.read_chunks([str(first), str(second)]))) == 5
+    assert run("evaluate", [str(first), str(second)], jobs, out=out, err=err) == 4
+    assert out.getvalue() == "1028.0\n\nError\n1\n" * 3 + "Error\n"
+    assert [line.split(": ")[0] for line in err.getvalue().splitlines()] == [
+        f"{first}:3",
+        f"{first}:7",
+        f"{first}:11",
+        f"{second}:1",
+    ]
+
+
+def test_parse_args():
+    args = parse_args(["convert", "a.txt", "--base", "eur", "b.txt", "--jobs", "3"])
+    assert (args.kind, args.paths, args.base, args.jobs) == (
+        "convert",
+        ["a.txt", "b.txt"],
+        "EUR",
+        3,
+    )
+    assert not args.fetch
+
+
+@pytest.mark.parametrize(
+    "argv", [[], ["sum"], ["emi", "--jobs"], ["emi", "--jobs", "two"], ["emi", "-x"]]
+)
+def test_bad_command_lines_exit_2(capsys, argv):
+    with pytest.raises(SystemExit) as exit:
+        parse_args(argv)
+    assert exit.value.code == 2
+    assert "usage: calc_cli.py" in capsys.readouterr().err
@@ -0,0 +1,123 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+import pytest
+
+from calc_service import BATCH_CHUNK, MAX_BATCH, CalcService, RequestError
+from calccore.money import Money, emi
+from calccore.rate_snapshot import RateTable
+
+
+@pytest.fixture
+def service():
+    service = CalcService(refresh=False)
+    table = RateTable.from_rates("USD", {"EUR": 0.5, "GBP": 0.25}, "2026-10-19")
+    service.store.store("USD", table, save=False)
+    yield service
+    service.worker.shutdown()
+
+
+def _call(service, method, path, body=None):
+    data = b"" if body is None else json.dumps(body).encode()
+    return asyncio.run(service.dispatch(method, path, data))
+
+
+def test_evaluate(service):
+    status, payload = _call(
+        service, "POST", "/v1/evaluate", {"expressions": ["2^10", "1/0", 7, "x"]}
+    )
+    assert status == HTTPStatus.OK
+    results = payload["results"]
+    assert results[0] == {"result": "1024"}
+    assert all("error" in result for result in results[1:])
+
+
+def test_interest_and_emi(service):
+    items = [
+        {"principal": "1000", "rate": "5", "years": 2},
+        {"principal": "1000", "rate": "5", "years": 2, "per_year": 1},
+        {"principal": "1000", "rate": "5", "years": 1000},
+        {"principal": "1e10000", "rate": "5", "years": 1},
+        {"rate": "5", "years": 1},
+    ]
+    _, payload = _call(service, "POST", "/v1/interest", {"items": items})
+    results = payload["results"]
+    assert results[0] == {"interest": "100.00", "total": "1100.00"}
+    assert results[1] == {"interest": "102.50", "total": "1102.50"}
+    assert [sorted(result) for result in results[2:]] == [["error"]] * 3
+
+    loans = [{"principal": "250000", "rate": "8.5", "years": 20}]
+    _, payload = _call(service, "POST", "/v1/emi", {"loans": loans})
+    assert payload == {"results": [{"emi": str(emi(Money(25_000_000), "8.5", 20))}]}
+
+
+def test_convert_and_rates(service):
+    conversions = [
+        {"amount": "10", "from": "usd", "to": "EUR"},
+        {"amount": "10", "from": "EUR", "to": "GBP"},
+        {"amount": "10", "from": "USD", "to": "XXX"},
+    ]
+    _, payload = _call(service, "POST", "/v1/convert", {"conversions": conversions})
+    first, second, missing = payload["results"]
+    assert (first["converted"], first["rate"]) == ("5.00", 0.5)
+    assert (second["converted"], second["rate"]) == ("5.00", 0.5)
+    assert "error" in missing
+
+    _, payload = _call(service, "GET", "/v1/rates")
+    assert (payload["base"], payload["date"]) == ("USD", "2026-10-19")
+    assert {"EUR", "GBP", "USD"} <= set(payload["currencies"])
+    _, payload = _call(service, "GET", "/health")
+    assert payload["ok"] and payload["rates"]
+
+
+def test_batches_longer_than_a_chunk_keep_their_order(service):
+    expressions = [f"{n}+1" for n in range(BATCH_CHUNK * 2 + 3)]
+    _, payload = _call(service, "POST", "/v1/evaluate", {"expressions": expressions})
+    assert [r["result"] for r in payload["results"]] == [
+        str(n + 1) for n in range(len(expressions))
+    ]
+
+
+@pytest.mark.parametrize(
+    "method, path, body, status",
+    [
+        ("GET", "/v1/nothing", b"", HTTPStatus.NOT_FOUND),
+        ("GET", "/v1/evaluate", b"", HTTPStatus.METHOD_NOT_ALLOWED),
+        ("POST", "/v1/evaluate", b"{not json", HTTPStatus.BAD_REQUEST),
+        ("POST", "/v1/evaluate", b'{"items": []}', HTTPStatus.BAD_REQUEST),
+        (
+            "POST",
+            "/v1/evaluate",
+            json.dumps({"expressions": ["1"] * (MAX_BATCH + 1)}).encode(),
+            HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+        ),
+    ],
+)
+def test_refused_requests(service, method, path, body, status):
+    with pytest.raises(RequestError) as refused:
+        asyncio.run(service.dispatch(method, path, body))
+    assert refused.value.status == status
+
+
+def test_http_keep_alive_and_pipelining(service):
+    async def exchange():
+        server = await asyncio.start_server(service.serve_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        body = b'{"expressions": ["6*7"]}'
+        request = (
+            b"POST /v1/evaluate HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % len(body)
+            + body
+        )
+        writer.write(request + b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n")
+        data = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return data
+
+    data = asyncio.run(exchange())
+    assert data.count(b"HTTP/1.1 200 OK") == 2
+    assert b'{"results":[{"result":"42"}]}' in data.replace(b" ", b"")
+    assert data.rstrip().endswith(b"}")
@@ -0,0 +1,67 @@
+import pytest
+
+from calccore.evaluator import EvaluationError, LivePreview, calculate, evaluate
+from calccore.expression_buffer import ExpressionBuffer
+
+SUBCLASSES = "(lambda:().__class__.__bases__[0].__subclasses__())()"
+RECURSION = "(lambda:(g:=lambda:g())())()"
+
+
+@pytest.mark.parametrize(
+    "expression, result",
+    [
+        ("2^10+sqrt(16)", "1028.0"),
+        ("-π*2", "-6.283185307179586"),
+        ("ln(1)+log(100)", "2.0"),
+        ("7%3", "1"),
+        ("1/0", "Error"),
+        ("9^9^9^9", "Error"),
+    ],
+)
+def test_arithmetic(expression, result):
+    assert calculate(expression) == result
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        SUBCLASSES,
+        RECURSION,
+        "lambda:1",
+        "[1,2]",
+        "'a'*10",
+        "().__class__",
+        "_pow(2,3)",
+        "sqrt(x=4)",
+        "sqrt(*[4])",
+        "2(3)",
+        "True+1",
+        "1j",
+    ],
+)
+def test_rejects_anything_but_arithmetic(expression):
+    with pytest.raises(EvaluationError):
+        evaluate(expression)
+    assert calculate(expression) == "Error"
+
+
+def test_live_preview_rejects_payloads():
+    preview = LivePreview()
+    assert preview.update(SUBCLASSES) == ""
+    assert preview.update(RECURSION) == ""
+    assert preview.update("2+(3*4") == "= 14"
+
+
+def test_overlong_expression_is_an_error():
+    assert calculate("1" + "+1" * 200_000) == "Error"
+
+
+def test_result_too_long_to_print_is_an_error():
+    # Each power is allowed, but the product has more digits than str() prints
+    expression = "2^4000*2^4000*2^4000*2^4000"
+    assert calculate(expression) == "Error"
+    buffer = ExpressionBuffer()
+    for key in expression:
+        buffer.press(key)
+    buffer.press("=")
+    assert buffer.render() == "Error"
@@ -0,0 +1,252 @@
+import sys
+import types
+
+import pytest
+
+import event_trace
+from event_trace import ADAPTERS, ReplayStats, TraceRecorder, load_trace
+
+# Stand-ins for the front ends: the handler names of CCPFinal and
+# CalculatorCurrencyKivy, each logging what it was asked to do in the same
+# terms, so a replay can be compared with the recorded session.
+
+TABS = {
+    "Simple Interest": ("Principal", "Rate % per year", "Time years"),
+    "Compound Interest": ("Principal", "Rate % per year", "Time years", "Compounds"),
+    "Loan Calculator": ("Loan Amount", "Rate % per year", "Term years"),
+}
+
+
+class TkEntry:
+    def __init__(self):
+        self.value = ""
+
+    def get(self):
+        return self.value
+
+    def delete(self, first, last):
+        self.value = ""
+
+    def insert(self, index, text):
+        self.value = text
+
+
+class KivyInput:
+    def __init__(self):
+        self.text = ""
+
+
+def _panels(entry):
+    return {
+        tab: types.SimpleNamespace(entries={name: entry() for name in names})
+        for tab, names in TABS.items()
+    }
+
+
+def _values(panel, read):
+    return {name: read(entry) for name, entry in panel.entries.items()}
+
+
+def stub_module(name, log):
+    """A module named like front end ``name`` holding its handler classes."""
+    module = types.ModuleType(f"stub_{name}")
+    module.__file__ = f"{name}.py"
+
+    if name == "CCPFinal":
+
+        class CalculatorFrame:
+            def __init__(self):
+                self._panels = _panels(TkEntry)
+
+            def _press(self, char):
+                log.append(("press", char))
+
+            def _switch_mode(self, mode):
+                log.append(("mode", mode))
+
+            def _switch_tab(self, tab):
+                log.append(("tab", tab))
+
+            def _calc_interest(self, calc_type):
+                panel = self._panels[calc_type]
+                log.append(("interest", calc_type, _values(panel, TkEntry.get)))
+
+            def _calc_loan(self):
+                panel = self._panels["Loan Calculator"]
+                log.append(("loan", _values(panel, TkEntry.get)))
+
+        class CurrencyConverterFrame:
+            def __init__(self):
+                self.amount_entry = TkEntry()
+
+            def _set_from(self, currency):
+                log.append(("from", currency))
+                self._update_rates()  # not an event of its own
+
+            def _set_to(self, currency):
+                log.append(("to", currency))
+
+            def _convert(self):
+                log.append(("convert", self.amount_entry.get()))
+
+            def _update_rates(self, show_msg=False):
+                if show_msg:
+                    log.append(("update",))
+
+        class FinancialApp:
+            def __init__(self):
+                self.calculator = CalculatorFrame()
+                self.converter = CurrencyConverterFrame()
+
+        classes = (CalculatorFrame, CurrencyConverterFrame, FinancialApp)
+    else:
+
+        class CalculatorWidget:
+            def __init__(self):
+                self.tab_panels = _panels(KivyInput)
+                self.current_tab = "Simple Interest"
+
+            def press_button(self, char):
+                log.append(("press", char))
+
+            def select_mode(self, mode, dropdown):
+                dropdown.dismiss()
+                log.append(("mode", mode))
+
+            def select_tab(self, tab):
+                self.current_tab = tab
+                log.append(("tab", tab))
+
+            def calculate_interest(self):
+                panel = self.tab_panels[self.current_tab]
+                values = _values(panel, lambda entry: entry.text)
+                log.append(("interest", self.current_tab, values))
+
+            def calculate_loan(self):
+                panel = self.tab_panels["Loan Calculator"]
+                log.append(("loan", _values(panel, lambda entry: entry.text)))
+
+        class CurrencyConverterWidget:
+            def __init__(self):
+                self.amount_input = KivyInput()
+
+            def select_currency(self, currency, is_from, dropdown):
+                dropdown.dismiss()
+                log.append(("from" if is_from else "to", currency))
+
+            def convert_currency(self):
+                log.append(("convert", self.amount_input.text))
+
+            def update_rates(self, show_msg=False):
+                if show_msg:
+                    log.append(("update",))
+
+        class FinancialApp:
+            def __init__(self):
+                self.calculator = CalculatorWidget()
+                self.currency_converter = CurrencyConverterWidget()
+
+        classes = (CalculatorWidget, CurrencyConverterWidget, FinancialApp)
+
+    for cls in classes:
+        cls.__module__ = module.__name__
+        setattr(module, cls.__name__, cls)
+    return module
+
+
+@pytest.fixture
+def front_end(monkeypatch):
+    def make(name):
+        log = []
+        module = stub_module(name, log)
+        monkeypatch.setitem(sys.modules, module.__name__, module)
+        return module.FinancialApp(), log
+
+    return make
+
+
+def _fill(entries, values):
+    for entry, value in zip(entries.values(), values):
+        if hasattr(entry, "text"):
+            entry.text = value
+        else:
+            entry.insert(0, value)
+
+
+def record_tk_session(app, path):
+    recorder = TraceRecorder(app, str(path))
+    calculator, converter = app.calculator, app.converter
+    calculator._press("7")
+    calculator._switch_mode("Financial")
+    calculator._switch_tab("Compound Interest")
+    _fill(calculator._panels["Compound Interest"].entries, ["1000", "5", "3", "12"])
+    calculator._calc_interest("Compound Interest")
+    calculator._switch_tab("Loan Calculator")
+    _fill(calculator._panels["Loan Calculator"].entries, ["250000", "8.5", "20"])
+    calculator._calc_loan()
+    converter._set_from("GBP")
+    converter._set_to("EUR")
+    converter.amount_entry.insert(0, "100")
+    converter._convert()
+    converter._update_rates(show_msg=True)
+    recorder.file.close()
+
+
+def replay_on(app, name, events):
+    adapter = ADAPTERS[name]
+    assert adapter.unsupported(events) == []
+    for event in events:
+        event_trace._play(app, adapter, event, False, ReplayStats())
+
+
+def test_tk_trace_replays_on_kivy(front_end, tmp_path):
+    tk_app, tk_log = front_end("CCPFinal")
+    record_tk_session(tk_app, tmp_path / "session.jsonl")
+    header, events = load_trace(tmp_path / "session.jsonl")
+    assert header["app"] == "CCPFinal"
+    assert [e["event"] for e in events] == [
+        "press",
+        "mode",
+        "tab",
+        "interest",
+        "tab",
+        "loan",
+        "from",
+        "to",
+        "convert",
+        "update",
+    ]
+
+    kivy_app, kivy_log = front_end("CalculatorCurrencyKivy")
+    replay_on(kivy_app, "CalculatorCurrencyKivy", events)
+    assert kivy_log == tk_log
+
+
+def test_kivy_trace_replays_on_tk(front_end, tmp_path):
+    kivy_app, kivy_log = front_end("CalculatorCurrencyKivy")
+    path = tmp_path / "session.jsonl"
+    recorder = TraceRecorder(kivy_app, str(path))
+    calculator, converter = kivy_app.calculator, kivy_app.currency_converter
+    calculator.select_tab("Compound Interest")
+    _fill(calculator.tab_panels["Compound Interest"].entries, ["1000", "5", "3", "4"])
+    calculator.calculate_interest()
+    converter.select_currency("JPY", True, event_trace._ClosedDropDown())
+    converter.select_currency("INR", False, event_trace._ClosedDropDown())
+    converter.update_rates(True)
+    converter.update_rates()  # automatic: not recorded
+    recorder.file.close()
+
+    _, events = load_trace(path)
+    assert events[1]["args"] == ["Compound Interest"]
+    tk_app, tk_log = front_end("CCPFinal")
+    replay_on(tk_app, "CCPFinal", events)
+    assert tk_log == kivy_log
+
+
+def test_modes_kivy_lacks_are_refused():
+    events = [{"event": "mode", "args": ["Matrix"]}, {"event": "currency"}]
+    assert ADAPTERS["CalculatorCurrencyKivy"].unsupported(events) == [
+        "currency events",
+        "the Matrix mode",
+    ]
+    assert ADAPTERS["CCP"].unsupported(events[:1]) == []
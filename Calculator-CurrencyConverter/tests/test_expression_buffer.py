@@ -0,0 +1,67 @@
+import pytest
+
+from calccore.expression_buffer import CARET, ExpressionBuffer
+
+
+def _typed(keys):
+    buffer = ExpressionBuffer()
+    for key in keys:
+        buffer.press(key)
+    return buffer
+
+
+def test_numbers_extend_and_functions_take_their_bracket():
+    buffer = _typed(["1", "2", ".", ".", "5", "+", "sin", "3", ")"])
+    assert buffer.tokens == ["12.5", "+", "sin(", "3", ")"]
+    assert buffer.depth == 0
+    assert _typed([".", "5", "*", "2", "="]).text == "1.0"
+
+
+def test_backspace_removes_whole_tokens():
+    buffer = _typed(["2", "*", "sqrt", "1", "6"])
+    buffer.press("Backspace")
+    assert buffer.text == "2*sqrt(1"
+    buffer.press("Backspace")
+    assert (buffer.text, buffer.depth) == ("2*sqrt(", 1)
+    buffer.press("Backspace")  # the function and its bracket go together
+    assert (buffer.text, buffer.depth) == ("2*", 0)
+
+
+def test_undo_and_redo_replay_edits():
+    buffer = _typed(["1", "2", "+", "3"])
+    buffer.press("Backspace")
+    buffer.press("Backspace")
+    assert buffer.text == "12"
+    assert buffer.press("Undo") and buffer.text == "12+"
+    assert buffer.press("Undo") and buffer.text == "12+3"
+    assert buffer.press("Redo") and buffer.text == "12+"
+    buffer.press("4")  # a new edit drops the redo history
+    assert not buffer.press("Redo")
+    assert buffer.text == "12+4"
+
+
+def test_undo_restores_edits_away_from_the_cursor():
+    buffer = _typed(["1", "+", "2"])
+    buffer.press("Home")
+    buffer.press("Delete")
+    assert buffer.render() == CARET + "+2"
+    buffer.press("End")
+    buffer.press("Undo")
+    assert buffer.text == "1+2"
+    assert buffer.depth == 0
+
+
+@pytest.mark.parametrize(
+    "keys, result",
+    [(["2", "^", "1", "0", "="], "1024"), (["1", "/", "0", "="], "Error")],
+)
+def test_equals_replaces_the_expression(keys, result):
+    buffer = _typed(keys)
+    assert buffer.text == result
+    buffer.press("Undo")
+    assert buffer.text == "".join(keys[:-1])
+
+
+def test_typing_over_an_error_starts_again():
+    buffer = _typed(["1", "/", "0", "=", "7"])
+    assert buffer.text == "7"
@@ -0,0 +1,27 @@
+import sys
+
+from calccore.lazy import is_loaded, lazy_import
+from startup import StartupProfile
+
+
+def test_lazy_module_runs_on_first_use(monkeypatch):
+    monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+    colorsys = lazy_import("colorsys")
+    assert "colorsys" in sys.modules and not is_loaded("colorsys")
+    assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert is_loaded("colorsys")
+    assert type(colorsys.__loader__).__name__ != "_Announcing"
+
+
+def test_absent_modules():
+    assert lazy_import("no_such_module_here") is None
+    assert not is_loaded("no_such_module_here")
+
+
+def test_profile_reports_heavy_modules(monkeypatch, capsys):
+    monkeypatch.delitem(sys.modules, "requests", raising=False)
+    lazy_import("requests")
+    profile = StartupProfile(enabled=True)
+    profile.mark("window")
+    assert profile.report(budgets={"window": 60_000})
+    assert "requests" not in capsys.readouterr().err.split("loaded:")[1]
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from calccore import matrix
+from calccore.matrix import MatrixError, MatrixWorkspace
+
+A = "4 3; 6 3"
+SINGULAR = "1 2; 2 4"
+
+
+def lu_factor(a):
+    """LAPACK getrf in NumPy: a zero pivot is left in U, not raised."""
+    lu, n = np.array(a, dtype=np.float64), len(a)
+    piv = np.zeros(n, dtype=np.int32)
+    for k in range(n):
+        piv[k] = p = k + int(np.argmax(abs(lu[k:, k])))
+        lu[[k, p]] = lu[[p, k]]
+        if lu[k, k] != 0:
+            lu[k + 1 :, k] /= lu[k, k]
+            lu[k + 1 :, k + 1 :] -= np.outer(lu[k + 1 :, k], lu[k, k + 1 :])
+    return lu, piv
+
+
+def lu_solve(factors, b):
+    lu, piv = factors
+    x = np.array(b, dtype=np.float64)
+    for k, p in enumerate(piv):
+        x[[k, p]] = x[[p, k]]
+    lower = np.tril(lu, -1) + np.eye(len(lu))
+    return np.linalg.solve(np.triu(lu), np.linalg.solve(lower, x))
+
+
+@pytest.fixture(params=["scipy", "numpy"])
+def factorizations(request, monkeypatch):
+    """Solve with a stand-in for scipy.linalg, and with NumPy's inverse."""
+    calls = []
+    if request.param == "scipy":
+
+        def counted(a):
+            calls.append(a)
+            return lu_factor(a)
+
+        monkeypatch.setattr(matrix, "_lu_factor", lambda: (counted, lu_solve))
+    else:
+        monkeypatch.setattr(matrix, "_lu_factor", lambda: None)
+        inv = np.linalg.inv
+        monkeypatch.setattr(np.linalg, "inv", lambda a: calls.append(a) or inv(a))
+    return calls
+
+
+def test_solve_reuses_the_factorization(factorizations):
+    workspace = MatrixWorkspace()
+    x = workspace.solve(A, "10; 12")
+    assert np.allclose(x, [[1], [2]])
+    x = workspace.solve(A, "7 14")  # a new B typed as one row
+    assert np.allclose(x, [[3.5], [-7 / 3]])
+    assert len(factorizations) == 1
+
+
+@pytest.mark.parametrize("a", [SINGULAR, "0 0; 0 0", "1 2 0; 3 4 0; 5 6 0"])
+def test_singular_a_is_refused(factorizations, a):
+    with pytest.raises(MatrixError, match="singular"):
+        MatrixWorkspace().solve(a, "1; 2" if a.count(";") == 1 else "1; 2; 3")
+
+
+@pytest.mark.parametrize("a", ["1 nan; 0 1", "inf 0; 0 1"])
+def test_non_finite_a_is_refused(factorizations, a):
+    with pytest.raises(MatrixError, match="inf or nan"):
+        MatrixWorkspace().solve(a, "1; 2")
+    assert factorizations == []
+
+
+def test_stand_in_matches_numpy():
+    a = np.random.default_rng(3).random((6, 6))
+    b = np.arange(6.0).reshape(6, 1)
+    assert np.allclose(lu_solve(lu_factor(a), b), np.linalg.solve(a, b))
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [("", "Enter a matrix"), ("1 2; 3", "Row 2"), ("1 x", "numbers")],
+)
+def test_parse_errors(text, message):
+    with pytest.raises(MatrixError, match=message):
+        matrix.parse_matrix(text)
+
+
+def test_shape_errors():
+    workspace = MatrixWorkspace()
+    with pytest.raises(MatrixError, match="square"):
+        workspace.solve("1 2 3; 4 5 6", "1; 2")
+    with pytest.raises(MatrixError, match="B needs 2 rows"):
+        workspace.solve(A, "1; 2; 3")
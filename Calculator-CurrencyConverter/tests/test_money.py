@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from calccore import money
+from calccore.money import (
+    ROUND_HALF_EVEN,
+    ROUND_HALF_UP,
+    Money,
+    compound_interest,
+    compound_total_many,
+    emi,
+    emi_many,
+    mul_div_many,
+    round_div,
+)
+
+PRINCIPALS = [random.Random(7).randrange(1, 10**9) for _ in range(2000)]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def kernels(request, monkeypatch):
+    """Run a test with the NumPy kernels and with their plain-int fallback."""
+    if request.param == "python":
+        monkeypatch.setattr(money, "np", None)
+    return request.param
+
+
+@pytest.mark.parametrize("rate, years", [("8.5", 20), ("7.25", 3), ("0.01", 30)])
+def test_emi_many_matches_emi(kernels, rate, years):
+    expected = [emi(Money(p), rate, years).minor for p in PRINCIPALS]
+    assert emi_many(PRINCIPALS, rate, years) == expected
+
+
+@pytest.mark.parametrize(
+    "rate, years, per_year", [("7.25", "3", 12), ("5", "30", 365), ("3", "2.5", 1)]
+)
+def test_compound_total_many_matches_compound_interest(kernels, rate, years, per_year):
+    expected = [
+        compound_interest(Money(p), rate, years, per_year)[1].minor for p in PRINCIPALS
+    ]
+    assert compound_total_many(PRINCIPALS, rate, years, per_year) == expected
+
+
+@pytest.mark.parametrize(
+    "rounding, expected",
+    [
+        # 5/2, 7/2, -5/2, -7/2, 6/2
+        (ROUND_HALF_EVEN, [2, 4, -2, -4, 3]),
+        (ROUND_HALF_UP, [3, 4, -3, -4, 3]),
+    ],
+)
+def test_ties(kernels, rounding, expected):
+    values = [5, 7, -5, -7, 6]
+    assert mul_div_many(values, 1, 2, rounding) == expected
+    assert [round_div(v, 2, rounding) for v in values] == expected
+
+
+def test_money_ties_round_to_the_cent():
+    assert str(Money.parse("0.125")) == "0.12"
+    assert str(Money.parse("0.135")) == "0.14"
+    assert str(Money.parse("0.125", rounding=ROUND_HALF_UP)) == "0.13"
+    assert str(Money.parse("-0.125", rounding=ROUND_HALF_UP)) == "-0.13"
+
+
+def test_mul_div_many_returns_a_list(kernels):
+    assert mul_div_many([], 3, 2) == []
+    assert mul_div_many([10**15], 10**15, 1) == [10**30]  # beyond int64
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda: emi_many([100_000], "5", 100_000),
+        lambda: emi_many([100_000], "5", 0),
+        lambda: compound_total_many([100_000], "5", "1", 0),
+        lambda: money.to_scaled("1e10000000", 2),
+        lambda: compound_interest("1000", "5", 1000, 365),
+    ],
+)
+def test_out_of_range_inputs_raise_value_error(call):
+    with pytest.raises(ValueError):
+        call()
@@ -0,0 +1,106 @@
+import pytest
+
+from calccore.programmer import (
+    MAX_BITS,
+    ProgrammerError,
+    all_digits,
+    decimal_string,
+    evaluate,
+    views,
+    wrap,
+)
+
+
+@pytest.mark.parametrize(
+    "value, bits, wrapped",
+    [
+        (127, 8, 127),
+        (128, 8, -128),
+        (255, 8, -1),
+        (256, 8, 0),
+        (-129, 8, 127),
+        (1 << 63, 64, -(1 << 63)),
+        (1 << 100, None, 1 << 100),
+    ],
+)
+def test_wrap(value, bits, wrapped):
+    assert wrap(value, bits) == wrapped
+
+
+@pytest.mark.parametrize(
+    "text, bits, result",
+    [
+        ("127+1", 8, -128),
+        ("-128-1", 8, 127),
+        ("200", 8, -56),  # literals wrap too
+        ("0x7FFF*2", 16, -2),
+        ("1<<31", 32, -(1 << 31)),
+        ("1<<64", 64, 0),
+        ("2**64+5", 64, 5),
+        ("(-3)**3", 8, -27),
+        ("pow(3, 200)", 32, wrap(3**200, 32)),
+        ("~0", 16, -1),
+        ("-1>>70", 64, -1),
+        ("2**64+5", None, 2**64 + 5),
+    ],
+)
+def test_words_wrap_like_c(text, bits, result):
+    assert evaluate(text, bits=bits) == result
+
+
+@pytest.mark.parametrize(
+    "text, result",
+    [
+        ("7/2", 3),
+        ("-7/2", -3),
+        ("7/-2", -3),
+        ("-7/-2", 3),
+        ("-7//2", -3),
+        ("7%3", 1),
+        ("-7%2", -1),
+        ("7%-2", 1),
+        ("-7%-2", -1),
+    ],
+)
+def test_division_truncates_toward_zero(text, result):
+    assert evaluate(text) == result
+    assert evaluate(text, bits=32) == result
+
+
+def test_division_of_the_most_negative_word_wraps():
+    assert evaluate("-128/-1", bits=8) == -128  # overflow wraps, no trap
+
+
+@pytest.mark.parametrize(
+    "text, base, result",
+    [("ff", 16, 255), ("0b1", 16, 0xB1), ("0b101", 10, 5), ("17", 8, 15)],
+)
+def test_input_base(text, base, result):
+    assert evaluate(text, base) == result
+
+
+def test_views_show_the_word_pattern():
+    shown = views(-1, bits=8)
+    assert shown == {"HEX": "FF", "DEC": "-1", "OCT": "377", "BIN": "1111 1111"}
+    assert views(255)["BIN"] == "1111 1111"
+    assert all_digits(-2, 16, bits=16) == "FFFE"
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["1/0", "5%0", "2**-1", "1<<-1", "2**(1<<30)", "1<<(1<<30)", "1.5", "x", ""],
+)
+def test_refused(text):
+    with pytest.raises(ProgrammerError):
+        evaluate(text)
+
+
+def test_limits_only_bind_without_a_word_size():
+    assert evaluate("2**(1<<30)", bits=64) == 0
+    assert evaluate(f"1<<{MAX_BITS - 1}").bit_length() == MAX_BITS
+
+
+def test_decimal_string_matches_str():
+    n = 7**4000  # past the str() fallback, under its digit limit
+    assert decimal_string(n) == str(n)
+    assert decimal_string(-n) == "-" + str(n)
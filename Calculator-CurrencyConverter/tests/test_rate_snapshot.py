@@ -0,0 +1,60 @@
+import pytest
+
+from calccore.rate_snapshot import (
+    BUNDLED_PATH,
+    RateTable,
+    SnapshotError,
+    dumps,
+    load,
+    load_latest,
+    loads,
+    save,
+)
+
+RATES = {"EUR": 0.92, "GBP": 0.79, "JPY": 151.5}
+
+
+def _table():
+    return RateTable.from_rates("USD", RATES, "2026-10-19", timestamp=1_700_000_000.5)
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "rates.snap")
+    save(_table(), path)
+    table = load(path)
+    assert (table.base, table.date) == ("USD", "2026-10-19")
+    assert table.timestamp == 1_700_000_000.5
+    assert dict(table) == {"USD": 1.0, **RATES}
+
+
+def test_rebase():
+    table = _table().rebase("EUR")
+    assert table.base == "EUR"
+    assert table["EUR"] == 1.0
+    assert table["USD"] == pytest.approx(1 / 0.92)
+
+
+@pytest.mark.parametrize("at", [12, 40, -20, -1])  # header, index, values, CRC
+def test_checksum_mismatch_is_rejected(at):
+    data = bytearray(dumps(_table()))
+    data[at] ^= 0x01
+    with pytest.raises(SnapshotError):
+        loads(bytes(data))
+
+
+def test_truncated_is_rejected():
+    with pytest.raises(SnapshotError):
+        loads(dumps(_table())[:-3])
+
+
+def test_load_latest_skips_bad_files(tmp_path):
+    newest, bad = tmp_path / "new.snap", tmp_path / "bad.snap"
+    save(_table(), str(newest))
+    bad.write_bytes(b"not a snapshot")
+    table = load_latest((str(bad), str(tmp_path / "missing.snap"), str(newest)))
+    assert table.timestamp == 1_700_000_000.5
+    assert load_latest((str(bad),)) is None
+
+
+def test_bundled_snapshot_loads():
+    assert "EUR" in load(BUNDLED_PATH)
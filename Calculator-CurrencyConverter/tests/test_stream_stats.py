@@ -0,0 +1,85 @@
+import math
+
+import numpy as np
+import pytest
+
+from calccore.stream_stats import (
+    NumberReader,
+    StatsError,
+    StreamStats,
+    format_summary,
+    parse_numbers,
+    read_numbers,
+)
+
+DATA = np.random.default_rng(5).normal(1000.0, 250.0, 30_000)
+
+
+def _stats(*chunks):
+    stats = StreamStats()
+    for chunk in chunks:
+        stats.add(chunk)
+    return stats
+
+
+def test_merged_matches_one_pass():
+    whole = _stats(DATA)
+    parts = [_stats(part) for part in np.array_split(DATA, [7, 12_000, 12_001])]
+    merged = parts[0].merged(*parts[1:])
+    for name in ("count", "min", "max"):
+        assert getattr(merged.moments, name) == getattr(whole.moments, name)
+    assert merged.moments.mean == pytest.approx(DATA.mean(), rel=1e-12)
+    assert merged.moments.variance == pytest.approx(DATA.var(ddof=1), rel=1e-9)
+
+    histogram = merged.histogram
+    assert (histogram.width, histogram.start) == (
+        whole.histogram.width,
+        whole.histogram.start,
+    )
+    assert histogram.counts.tolist() == whole.histogram.counts.tolist()
+    assert histogram.counts.sum() == len(DATA)
+
+    qs = [0.05, 0.5, 0.95]
+    exact = np.quantile(DATA, qs)
+    assert not merged.sketch.exact
+    assert np.allclose(merged.sketch.quantiles(qs), exact, rtol=0.02)
+
+
+def test_merged_leaves_its_inputs_alone():
+    first, second = _stats(DATA[:100]), _stats(DATA[100:200])
+    merged = first.merged(second)
+    assert (first.count, second.count, merged.count) == (100, 100, 200)
+    assert first.histogram.counts.sum() == 100
+
+
+def test_small_data_has_exact_quantiles():
+    stats = _stats([3, 1], [2]).merged(_stats([5, 4]))
+    assert stats.sketch.exact
+    assert stats.sketch.quantiles([0, 0.5, 1]) == [1.0, 3.0, 5.0]
+
+
+def test_nan_and_inf_are_skipped():
+    stats = _stats([1.0, math.nan, 3.0, math.inf]).merged(_stats([-math.inf]))
+    assert (stats.count, stats.skipped, stats.moments.mean) == (2, 3, 2.0)
+    assert "3 NaN/inf skipped" in format_summary(stats)
+
+
+def test_number_reader_joins_numbers_split_anywhere():
+    text = "12.5, -3e2;7\n 0.25 1e-3"
+    expected = parse_numbers(text).tolist()
+    for cut in range(len(text) + 1):
+        reader = NumberReader()
+        numbers = list(reader.feed(text[:cut])) + list(reader.feed(text[cut:]))
+        assert numbers + list(reader.pending()) == expected
+
+
+def test_read_numbers_in_small_blocks(tmp_path):
+    path = tmp_path / "numbers.txt"
+    path.write_text(" ".join(str(n) for n in range(1000)))
+    blocks = list(read_numbers(str(path), chunk=7))
+    assert np.concatenate(blocks).tolist() == list(range(1000))
+
+
+def test_bad_numbers_are_named():
+    with pytest.raises(StatsError, match="'abc'"):
+        parse_numbers("1 2 abc")
@@ -0,0 +1,519 @@
+import os
+import queue
+import threading
+import time
+import tkinter as tk
+from collections import namedtuple
+from tkinter import filedialog
+
+from calccore.tracing import follow, handoff, span, traced
+
+# --------------------------------------------------------------------------- #
+#  EXTRA CALCULATOR MODES SHARED BY THE TK FRONT ENDS                         #
+# --------------------------------------------------------------------------- #
+# CCP.py and CCPFinal.py list these after Basic, Scientific and Financial and
+# build each one on first use like their own modes.  They only differ in look,
+# which reaches the modes as a ModeKit:
+#
+#   label, entry  Tk option dicts for labels and text fields
+#   button        button(parent, text, command) -> a themed button
+#   small_font    for status lines
+#
+# The work behind a mode runs on a worker thread, one job at a time; a request
+# made while one runs replaces any older waiting one of the same kind, so
+# editing quickly only computes the latest input.  Long jobs show progress
+# through report().
+
+ModeKit = namedtuple("ModeKit", "label entry button small_font")
+
+JOB_POLL_MS = 30  # how often to check for a finished job
+RERUN_DELAY_MS = 300  # typing pause before the last operation is redone
+FIXED_FONT = "TkFixedFont"  # columns of numbers line up
+
+
+class ModeFrame(tk.Frame):
+    """Base for the extra modes: background jobs and shared widgets."""
+
+    def __init__(self, parent, kit):
+        super().__init__(parent, bg=kit.label["bg"])
+        self.kit = kit
+        self._results = queue.Queue()
+        self._running = False
+        self._waiting = {}  # kind -> (job, done) asked for while another ran
+
+    def submit(self, job, done, kind=None):
+        """Run job() on a worker thread, then done(result, error, seconds) here."""
+        if self._running:
+            self._waiting.pop(kind, None)  # the latest one, in request order
+            self._waiting[kind] = (job, done)
+            return
+        self._running = True
+        threading.Thread(
+            target=self._work, args=(job, done, handoff()), daemon=True
+        ).start()
+        self.after(JOB_POLL_MS, self._poll)
+
+    def report(self, callback, *args):
+        """From a job: call callback(*args) on the Tk thread (progress)."""
+        self._results.put((callback, args, False))
+
+    @traced("worker.mode_job")
+    def _work(self, job, done, flow=None):
+        follow(flow)
+        start = time.perf_counter()
+        try:
+            result, error = job(), None
+        except Exception as exc:  # shown in the mode, never lost in a thread
+            result, error = None, exc
+        seconds = time.perf_counter() - start
+        self._results.put((done, (result, error, seconds, handoff()), True))
+
+    def _poll(self):
+        while True:
+            try:
+                callback, args, finished = self._results.get_nowait()
+            except queue.Empty:
+                self.after(JOB_POLL_MS, self._poll)
+                return
+            if finished:
+                break
+            callback(*args)
+        self._running = False
+        *args, flow = args
+        with span("ui.mode_result"):
+            follow(flow)
+            callback(*args)
+        if self._waiting:
+            kind = next(iter(self._waiting))
+            self.submit(*self._waiting.pop(kind), kind)
+
+    # ----------------------------------------------------------------------- #
+    def text_box(self, parent, height, **options):
+        """A multi-line field in the kit's entry look with a fixed font."""
+        entry = self.kit.entry
+        look = {key: entry[key] for key in ("bg", "fg", "bd", "relief") if key in entry}
+        look["insertbackground"] = entry.get("insertbackground", entry["fg"])
+        options = {"font": FIXED_FONT, "wrap": "none", "undo": True, **options}
+        return tk.Text(parent, height=height, **look, **options)
+
+    def status_label(self, parent):
+        return tk.Label(
+            parent,
+            **dict(self.kit.label, font=self.kit.small_font),
+            anchor="w",
+            justify="left",
+            wraplength=420,
+        )
+
+    @staticmethod
+    def show_text(box, text):
+        box.config(state="normal")
+        box.delete("1.0", "end")
+        box.insert("1.0", text)
+        box.config(state="disabled")
+
+
+# --------------------------------------------------------------------------- #
+#  MATRIX                                                                     #
+# --------------------------------------------------------------------------- #
+MATRIX_OPERATIONS = {
+    # button: (MatrixWorkspace method, uses B, description)
+    "A×B": ("multiply", True, "A × B"),
+    "inv": ("inverse", False, "inverse of A"),
+    "det": ("determinant", False, "determinant of A"),
+    "solve": ("solve", True, "x with A x = B"),
+    "eig": ("eigenvalues", False, "eigenvalues of A"),
+}
+
+
+class MatrixMode(ModeFrame):
+    """Matrices A and B typed or pasted one row per line, NumPy results."""
+
+    def __init__(self, parent, kit):
+        super().__init__(parent, kit)
+        from calccore.matrix import MatrixWorkspace
+
+        self.workspace = MatrixWorkspace()  # touched by the worker thread only
+        self.operation = None  # last button pressed, redone after edits
+        self._rerun_job = None
+
+        inputs = tk.Frame(self, bg=self["bg"])
+        inputs.pack(fill="both", expand=True)
+        inputs.grid_columnconfigure((0, 1), weight=1)
+        inputs.grid_rowconfigure(1, weight=1)
+        self.inputs = {}
+        for column, name in enumerate(("A", "B")):
+            tk.Label(inputs, text=name, **kit.label).grid(row=0, column=column)
+            box = self.text_box(inputs, height=7, width=18)
+            box.grid(row=1, column=column, sticky="nsew", padx=4)
+            box.bind("<<Modified>>", lambda event, n=name: self._edited(n), add="+")
+            self.inputs[name] = box
+        self.inputs["A"].insert("1.0", "2 1\n1 3")
+        self.inputs["B"].insert("1.0", "1\n2")
+        for box in self.inputs.values():
+            box.edit_modified(False)
+
+        buttons = tk.Frame(self, bg=self["bg"])
+        buttons.pack(fill="x", pady=6)
+        for column, label in enumerate(MATRIX_OPERATIONS):
+            buttons.grid_columnconfigure(column, weight=1)
+            kit.button(
+                buttons, label, command=lambda op=label: self.calculate(op)
+            ).grid(row=0, column=column, sticky="ew", padx=2)
+
+        self.result = self.text_box(self, height=8, width=40, state="disabled")
+        self.result.pack(fill="both", expand=True)
+        self.status = self.status_label(self)
+        self.status.config(text="One row per line; spaces or commas between entries")
+        self.status.pack(fill="x", pady=(4, 0))
+
+    @traced("ui.matrix", "label")
+    def calculate(self, label):
+        self.operation = label
+        method, uses_b, description = MATRIX_OPERATIONS[label]
+        run = getattr(self.workspace, method)
+        texts = [self.inputs["A"].get("1.0", "end-1c")]
+        if uses_b:
+            texts.append(self.inputs["B"].get("1.0", "end-1c"))
+
+        def job():
+            from calccore.matrix import format_result, shape_text
+
+            value = run(*texts)
+            shape = shape_text(value) if getattr(value, "ndim", 0) else "number"
+            return shape, format_result(value)
+
+        def done(result, error, seconds):
+            if error is not None:
+                self.show_text(self.result, "")
+                self.status.config(text=f"{description}: {error}")
+                return
+            shape, text = result
+            self.show_text(self.result, text)
+            self.status.config(
+                text=f"{description}: {shape} in {seconds * 1000:.1f} ms"
+            )
+
+        self.status.config(text=f"Computing {description}…")
+        self.submit(job, done)
+
+    def _edited(self, name):
+        box = self.inputs[name]
+        if not box.edit_modified():
+            return
+        box.edit_modified(False)  # re-arms <<Modified>>
+        if self.operation is None or (
+            name == "B" and not MATRIX_OPERATIONS[self.operation][1]
+        ):
+            return
+        # Editing only B re-solves with A's factorization kept by the workspace
+        if self._rerun_job is not None:
+            self.after_cancel(self._rerun_job)
+        self._rerun_job = self.after(RERUN_DELAY_MS, self._rerun)
+
+    def _rerun(self):
+        self._rerun_job = None
+        self.calculate(self.operation)
+
+
+# --------------------------------------------------------------------------- #
+#  STATISTICS                                                                 #
+# --------------------------------------------------------------------------- #
+PROGRESS_SECONDS = 0.5  # between progress reports while a file loads
+
+
+class StatisticsMode(ModeFrame):
+    """Numbers typed, pasted or loaded from files, summarized in one pass."""
+
+    def __init__(self, parent, kit):
+        super().__init__(parent, kit)
+        from calccore.stream_stats import StreamStats
+
+        self.files = []  # loaded files, in order
+        self._cancel = threading.Event()  # stops a file that is loading
+        self._refresh_job = None
+        # Worker thread only: the summaries of what has been read so far
+        self._loaded = []
+        self._file_stats = StreamStats()
+        self._consumed = ""  # text in _text_stats: all but a trailing number
+        self._text_stats = StreamStats()
+
+        tk.Label(self, text="Data", **kit.label).pack(anchor="w")
+        self.data = self.text_box(self, height=5, width=48, wrap="word")
+        self.data.pack(fill="x")
+        self.data.bind("<<Modified>>", self._edited, add="+")
+
+        buttons = tk.Frame(self, bg=self["bg"])
+        buttons.pack(fill="x", pady=6)
+        buttons.grid_columnconfigure((0, 1), weight=1)
+        kit.button(buttons, "Load file…", command=self.load_file).grid(
+            row=0, column=0, sticky="ew", padx=2
+        )
+        kit.button(buttons, "Clear", command=self.clear).grid(
+            row=0, column=1, sticky="ew", padx=2
+        )
+
+        self.result = self.text_box(self, height=10, width=48, state="disabled")
+        self.result.pack(fill="both", expand=True)
+        self.status = self.status_label(self)
+        self.status.config(text="Type or paste numbers, or load a text / CSV file")
+        self.status.pack(fill="x", pady=(4, 0))
+
+    def load_file(self):
+        path = filedialog.askopenfilename(
+            parent=self,
+            title="Load numbers",
+            filetypes=[("Text / CSV", "*.txt *.csv *.dat"), ("All files", "*")],
+        )
+        if path:
+            self.files.append(path)
+            self.refresh()
+
+    def clear(self):
+        self._cancel.set()
+        self.files = []
+        self.data.delete("1.0", "end")
+        self.refresh()
+
+    def _edited(self, event):
+        if not self.data.edit_modified():
+            return
+        self.data.edit_modified(False)  # re-arms <<Modified>>
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+        self._refresh_job = self.after(RERUN_DELAY_MS, self.refresh)
+
+    @traced("ui.statistics")
+    def refresh(self):
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+        files, text = tuple(self.files), self.data.get("1.0", "end-1c")
+
+        def job():
+            self._cancel.clear()
+            return self._summarize(files, text)
+
+        def done(result, error, seconds):
+            if error is not None:
+                del self.files[len(self._loaded) :]  # drop a file that failed
+                self.status.config(text=str(error))
+                return
+            summary, count = result
+            self.show_text(self.result, summary)
+            loaded = f" ({len(files)} files)" if len(files) > 1 else ""
+            loaded = f" ({os.path.basename(files[0])})" if len(files) == 1 else loaded
+            self.status.config(
+                text=f"{count:,} values{loaded}, updated in {seconds * 1000:.0f} ms"
+            )
+
+        self.submit(job, done)
+
+    # ----------  worker thread -------------------------------------------- #
+    def _summarize(self, files, text):
+        from calccore.stream_stats import NumberReader, StreamStats, format_summary
+
+        if tuple(self._loaded) != files[: len(self._loaded)]:  # files cleared
+            self._loaded, self._file_stats = [], StreamStats()
+        for path in files[len(self._loaded) :]:
+            self._file_stats = self._file_stats.merged(self._load(path))
+            self._loaded.append(path)
+
+        # Appended text is all that gets read; an edit before the last number
+        # starts the text's statistics over.
+        if not text.startswith(self._consumed):
+            self._consumed, self._text_stats = "", StreamStats()
+        reader = NumberReader()
+        self._text_stats.add(reader.feed(text[len(self._consumed) :]))
+        self._consumed = text[: len(text) - len(reader.tail)]
+
+        stats = self._file_stats.merged(self._text_stats)
+        stats.add(reader.pending())
+        return format_summary(stats), stats.count
+
+    def _load(self, path):
+        from calccore.stream_stats import StatsError, StreamStats, read_numbers
+
+        name = os.path.basename(path)
+        stats = StreamStats()
+        reported = time.perf_counter()
+        try:
+            for values in read_numbers(path, self._cancel.is_set):
+                stats.add(values)
+                if time.perf_counter() - reported > PROGRESS_SECONDS:
+                    reported = time.perf_counter()
+                    self.report(self._loading, name, stats.count)
+        except (OSError, UnicodeDecodeError, StatsError) as exc:
+            raise StatsError(f"{name}: {exc}") from None
+        return stats
+
+    def _loading(self, name, count):
+        self.status.config(text=f"Loading {name}: {count:,} values so far…")
+
+
+# --------------------------------------------------------------------------- #
+#  PROGRAMMER                                                                 #
+# --------------------------------------------------------------------------- #
+OPERATOR_KEYS = {
+    # button: text inserted at the cursor
+    "&": " & ",
+    "|": " | ",
+    "^": " ^ ",
+    "~": "~",
+    "<<": " << ",
+    ">>": " >> ",
+}
+LIVE_DELAY_MS = 80  # typing pause before the views are refreshed
+
+
+class ProgrammerMode(ModeFrame):
+    """Integer expressions shown in hex, decimal, octal and binary at once."""
+
+    def __init__(self, parent, kit):
+        super().__init__(parent, kit)
+        from calccore.programmer import BASES, WORD_SIZES
+
+        self.base = "DEC"  # how typed numbers are read
+        self.bits = 64  # word size, None for arbitrary precision
+        self.value = None  # last result, for Copy
+        self._refresh_job = None
+
+        self.expression = tk.StringVar()
+        self.entry = tk.Entry(self, textvariable=self.expression, **kit.entry)
+        self.entry.pack(fill="x")
+        self.expression.trace_add("write", self._edited)
+
+        rows = [
+            [(name, lambda n=name: self.set_base(n)) for name in BASES],
+            [
+                (str(bits) if bits else "∞", lambda b=bits: self.set_bits(b))
+                for bits in WORD_SIZES
+            ],
+            [(op, lambda o=op: self.insert(OPERATOR_KEYS[o])) for op in OPERATOR_KEYS],
+        ]
+        rows[0].append(("Copy", self.copy))
+        for row in rows:
+            buttons = tk.Frame(self, bg=self["bg"])
+            buttons.pack(fill="x", pady=(6, 0))
+            for column, (label, command) in enumerate(row):
+                buttons.grid_columnconfigure(column, weight=1)
+                kit.button(buttons, label, command=command).grid(
+                    row=0, column=column, sticky="ew", padx=2
+                )
+
+        views = tk.Frame(self, bg=self["bg"])
+        views.pack(fill="both", expand=True, pady=6)
+        views.grid_columnconfigure(1, weight=1)
+        small = dict(kit.label, font=kit.small_font)
+        self.names, self.views = {}, {}
+        for row, name in enumerate(BASES):
+            self.names[name] = tk.Label(views, **small, anchor="nw")
+            self.names[name].grid(row=row, column=0, sticky="nw", padx=(0, 8))
+            self.views[name] = tk.Label(
+                views,
+                **dict(kit.label, font=FIXED_FONT),
+                anchor="w",
+                justify="left",
+                wraplength=340,
+            )
+            self.views[name].grid(row=row, column=1, sticky="ew", pady=1)
+        self.status = self.status_label(self)
+        self.status.pack(fill="x")
+        self._show_base()
+        self.refresh()
+
+    def _show_base(self):
+        for name, label in self.names.items():
+            label.config(text=f"▸{name}" if name == self.base else f" {name}")
+
+    def _word_text(self):
+        return f"{self.bits}-bit words" if self.bits else "arbitrary precision"
+
+    @traced("ui.programmer_base", "name")
+    def set_base(self, name):
+        from calccore.programmer import BASES, convert_literals
+
+        if name == self.base:
+            return
+        text = convert_literals(self.expression.get(), BASES[self.base], BASES[name])
+        self.base = name
+        self._show_base()
+        self.expression.set(text)  # same value, now written in the new base
+
+    @traced("ui.programmer_bits", "bits")
+    def set_bits(self, bits):
+        self.bits = bits
+        self.refresh()
+
+    def insert(self, text):
+        self.entry.insert("insert", text)
+        self.entry.focus_set()
+
+    def _edited(self, *args):
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+        self._refresh_job = self.after(LIVE_DELAY_MS, self.refresh)
+
+    def refresh(self):
+        from calccore.programmer import BASES
+
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+        text, base, bits = self.expression.get(), BASES[self.base], self.bits
+        if not text.strip():
+            self.value = None
+            for label in self.views.values():
+                label.config(text="")
+            self.status.config(text=f"Type an integer expression ({self._word_text()})")
+            return
+
+        def job():
+            from calccore.programmer import evaluate, views
+
+            value = evaluate(text, base, bits)
+            return value, views(value, bits)  # only the digits on screen
+
+        def done(result, error, seconds):
+            if error is not None:
+                self.status.config(text=str(error))
+                return
+            self.value, shown = result
+            for name, label in self.views.items():
+                label.config(text=shown[name])
+            self.status.config(text=f"{self._word_text()}, {seconds * 1000:.1f} ms")
+
+        self.submit(job, done)
+
+    @traced("ui.programmer_copy")
+    def copy(self):
+        """Put every digit of the result in the input base on the clipboard."""
+        from calccore.programmer import BASES
+
+        if self.value is None:
+            return
+        value, name, bits = self.value, self.base, self.bits
+
+        def job():
+            from calccore.programmer import all_digits
+
+            return all_digits(value, BASES[name], bits)
+
+        def done(text, error, seconds):
+            if error is not None:
+                self.status.config(text=str(error))
+                return
+            self.clipboard_clear()
+            self.clipboard_append(text)
+            self.status.config(text=f"Copied {len(text):,} {name} characters")
+
+        self.status.config(text="Converting…")
+        self.submit(job, done, kind="copy")
+
+
+# Mode name -> frame class, in menu order
+EXTRA_MODES = {
+    "Matrix": MatrixMode,
+    "Statistics": StatisticsMode,
+    "Programmer": ProgrammerMode,
+}
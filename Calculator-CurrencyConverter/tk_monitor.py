@@ -0,0 +1,217 @@
+import atexit
+import json
+import sys
+import time
+import tkinter as tk
+
+# --------------------------------------------------------------------------- #
+#  TK EVENT-LOOP MONITOR                                                      #
+# --------------------------------------------------------------------------- #
+# Run an app with --monitor (and optionally --monitor-log=FILE) to see where
+# the UI stalls:
+#
+#   heartbeat   an after() callback every HEARTBEAT_MS; the time between two
+#               beats is the loop's "frame time", anything over the interval
+#               is lag (some handler or redraw held the loop)
+#   callbacks   every Tcl -> Python call (button commands, bindings, after
+#               jobs) is timed per handler while the monitor is installed
+#   overlay     live numbers in the bottom-right corner, F12 hides/shows it
+#   log         JSON lines: slow callbacks, long frames, periodic summaries
+
+HEARTBEAT_MS = 20
+OVERLAY_MS = 500
+SUMMARY_SECONDS = 10
+SLOW_MS = 50  # callbacks / frames at least this long are logged one by one
+
+
+class Histogram:
+    """Counts per power-of-two millisecond bucket: <1, <2, <4 ... <1024, more."""
+
+    BOUNDS = tuple(2**i for i in range(11))
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms):
+        bucket = 0
+        while bucket < len(self.BOUNDS) and ms >= self.BOUNDS[bucket]:
+            bucket += 1
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, p):
+        """Upper bound (ms) of the bucket holding the p-th percentile."""
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for bucket, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                break
+        return float(self.BOUNDS[bucket]) if bucket < len(self.BOUNDS) else self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.mean, 3),
+            "p95_ms": self.percentile(95),
+            "max_ms": round(self.max, 3),
+            "buckets": dict(zip(_BUCKET_NAMES, self.counts)),
+        }
+
+
+_BUCKET_NAMES = [f"<{b}" for b in Histogram.BOUNDS] + ["more"]
+
+
+def callback_name(func):
+    """Readable handler name; lambdas are named after what they call."""
+    name = getattr(func, "__qualname__", None) or repr(func)
+    if getattr(func, "__name__", "") == "<lambda>":
+        owner = name.split(".<locals>")[0]
+        called = func.__code__.co_names
+        name = f"{owner}:{called[-1] if called else 'lambda'}"
+    return name
+
+
+def _after_target(func):
+    """The function an after() job will run (after() wraps it in ``callit``)."""
+    code = getattr(func, "__code__", None)
+    if code is not None and code.co_name == "callit" and "func" in code.co_freevars:
+        return func.__closure__[code.co_freevars.index("func")].cell_contents
+    return func
+
+
+class _TimedCallWrapper(tk.CallWrapper):
+    monitor = None
+
+    def __init__(self, func, subst, widget):
+        super().__init__(func, subst, widget)
+        target = _after_target(func)
+        self.name = callback_name(target)
+        self.own = getattr(target, "__self__", None) is self.monitor
+
+    def __call__(self, *args):
+        if self.own or self.monitor is None:
+            return super().__call__(*args)
+        start = time.perf_counter()
+        try:
+            return super().__call__(*args)
+        finally:
+            self.monitor.record(self.name, (time.perf_counter() - start) * 1000)
+
+
+class TkMonitor:
+    def __init__(self, root, log_path=None, overlay=True):
+        self.root = root
+        self.frames = Histogram()
+        self.callbacks = {}  # handler name -> Histogram
+        self.slowest = ("", 0.0)
+        self.log = open(log_path, "a", encoding="utf-8") if log_path else None
+        self._last_beat = None
+        self._last_summary = time.monotonic()
+
+        # Callbacks registered from now on go through the timing wrapper
+        _TimedCallWrapper.monitor = self
+        tk.CallWrapper = _TimedCallWrapper
+
+        self.overlay = None
+        if overlay:
+            self.overlay = tk.Label(
+                root, text="", bg="black", fg="#7CFC00", font=("Courier", 10)
+            )
+            self.overlay.place(relx=1.0, rely=1.0, anchor="se")
+            root.bind("<F12>", self.toggle_overlay, add="+")
+            root.after(OVERLAY_MS, self.refresh_overlay)
+        root.after(HEARTBEAT_MS, self.beat)
+        atexit.register(self.close)
+
+    @classmethod
+    def from_argv(cls, root, argv=None):
+        """Monitor for ``root`` if --monitor / --monitor-log=FILE was given."""
+        argv = sys.argv[1:] if argv is None else argv
+        log_path = None
+        for arg in argv:
+            if arg.startswith("--monitor-log="):
+                log_path = arg.split("=", 1)[1]
+        if log_path is None and "--monitor" not in argv:
+            return None
+        return cls(root, log_path)
+
+    # ----------------------------------------------------------------------- #
+    def beat(self):
+        now = time.perf_counter()
+        if self._last_beat is not None:
+            frame_ms = (now - self._last_beat) * 1000
+            self.frames.add(frame_ms)
+            if frame_ms >= SLOW_MS:
+                lag_ms = frame_ms - HEARTBEAT_MS
+                self.write("frame", ms=round(frame_ms, 3), lag_ms=round(lag_ms, 3))
+        self._last_beat = now
+        if time.monotonic() - self._last_summary >= SUMMARY_SECONDS:
+            self.summary()
+        self.root.after(HEARTBEAT_MS, self.beat)
+
+    def record(self, name, ms):
+        hist = self.callbacks.get(name)
+        if hist is None:
+            hist = self.callbacks[name] = Histogram()
+        hist.add(ms)
+        if ms > self.slowest[1]:
+            self.slowest = (name, ms)
+        if ms >= SLOW_MS:
+            self.write("callback", name=name, ms=round(ms, 3))
+
+    # ----------------------------------------------------------------------- #
+    def refresh_overlay(self):
+        if self.overlay.winfo_ismapped():
+            name, ms = self.slowest
+            self.overlay.config(
+                text=(
+                    f"frame p95 {self.frames.percentile(95):.0f} ms  "
+                    f"max {self.frames.max:.0f} ms\n"
+                    f"slowest {name.rsplit('.', 1)[-1] or '-'} {ms:.1f} ms"
+                )
+            )
+        self.root.after(OVERLAY_MS, self.refresh_overlay)
+
+    def toggle_overlay(self, event=None):
+        if self.overlay.winfo_ismapped():
+            self.overlay.place_forget()
+        else:
+            self.overlay.place(relx=1.0, rely=1.0, anchor="se")
+
+    def write(self, kind, **fields):
+        if self.log is not None:
+            record = {"t": round(time.time(), 3), "type": kind, **fields}
+            self.log.write(json.dumps(record) + "\n")
+
+    def summary(self):
+        self._last_summary = time.monotonic()
+        slowest = sorted(
+            self.callbacks.items(), key=lambda item: item[1].max, reverse=True
+        )
+        self.write(
+            "summary",
+            frames=self.frames.as_dict(),
+            callbacks={name: hist.as_dict() for name, hist in slowest[:20]},
+        )
+        if self.log is not None:
+            self.log.flush()
+
+    def close(self):
+        if tk.CallWrapper is _TimedCallWrapper and _TimedCallWrapper.monitor is self:
+            _TimedCallWrapper.monitor = None
+        if self.log is not None and not self.log.closed:
+            self.summary()
+            self.log.close()